@@ -1,8 +1,11 @@
 # conviso/clients/client_graphql.py
 import os
+import atexit
+import threading
 import requests
 import time
 import json
+from typing import Optional
 from dotenv import load_dotenv
 import conviso.core.logger as logger
 from conviso.core.auth import get_api_key
@@ -21,19 +24,48 @@ DEFAULT_RETRIES = int(os.getenv("CONVISO_API_RETRIES", "2"))
 POOL_CONNECTIONS = int(os.getenv("CONVISO_API_POOL_CONNECTIONS", "32"))
 POOL_MAXSIZE = int(os.getenv("CONVISO_API_POOL_MAXSIZE", "64"))
 
-SESSION = requests.Session()
-ADAPTER = requests.adapters.HTTPAdapter(
-    pool_connections=POOL_CONNECTIONS,
-    pool_maxsize=POOL_MAXSIZE,
-    max_retries=0,
-)
-SESSION.mount("https://", ADAPTER)
-SESSION.mount("http://", ADAPTER)
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+_STORED_API_KEY: Optional[str] = None
+
+
+def _resolve_api_key() -> Optional[str]:
+    """
+    Return the API key for this process. The environment variable is checked on every
+    call; the .env/credentials file lookup is done once and then reused, so paginated
+    commands don't re-read credential files for each request.
+    """
+    global _STORED_API_KEY
+    env_key = os.getenv("CONVISO_API_KEY")
+    if env_key:
+        return env_key
+    if _STORED_API_KEY is None:
+        _STORED_API_KEY = get_api_key()
+    return _STORED_API_KEY
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                atexit.register(session.close)
+                _SESSION = session
+    return _SESSION
 
 
 def graphql_request(query: str, variables: dict = None, log_request: bool = True, verbose_only: bool = False) -> dict:
     """Perform a GraphQL request with optional logging and timeout."""
-    api_key = get_api_key()
+    api_key = _resolve_api_key()
     if not api_key:
         raise EnvironmentError("⚠️ Missing API key. Run 'conviso auth login' or set CONVISO_API_KEY environment variable")
 
@@ -51,7 +83,7 @@ def graphql_request(query: str, variables: dict = None, log_request: bool = True
     last_exc = None
     for attempt in range(DEFAULT_RETRIES + 1):
         try:
-            response = SESSION.post(API_URL, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT)
+            response = get_session().post(API_URL, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             if "errors" in data:
@@ -86,7 +118,7 @@ def graphql_request_upload(
     file_param: name of the variable for the Upload (e.g., "file").
     file_path: path to the file to upload.
     """
-    api_key = get_api_key()
+    api_key = _resolve_api_key()
     if not api_key:
         raise EnvironmentError("⚠️ Missing API key. Run 'conviso auth login' or set CONVISO_API_KEY environment variable")
 
@@ -104,7 +136,7 @@ def graphql_request_upload(
 
     with open(file_path, "rb") as f:
         files = {"0": f}
-        response = SESSION.post(
+        response = get_session().post(
             API_URL,
             data={"operations": json.dumps(operations), "map": json.dumps(map_part)},
             files=files,
@@ -133,7 +165,7 @@ def graphql_request_upload_many(
     file_params: list of tuples in the form (variable_path, file_path),
     for example [("input.archives.0", "/tmp/a.txt"), ("input.archives.1", "/tmp/b.txt")].
     """
-    api_key = get_api_key()
+    api_key = _resolve_api_key()
     if not api_key:
         raise EnvironmentError("⚠️ Missing API key. Run 'conviso auth login' or set CONVISO_API_KEY environment variable")
 
@@ -158,7 +190,7 @@ def graphql_request_upload_many(
             file_handles.append(file_handle)
             files[str(index)] = file_handle
 
-        response = SESSION.post(
+        response = get_session().post(
             API_URL,
             data={"operations": json.dumps(operations), "map": json.dumps(map_part)},
             files=files,
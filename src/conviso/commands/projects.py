@@ -6,21 +6,288 @@ Manages project operations (list, create, update, delete) via Conviso GraphQL AP
 Now standardized to use the new core/output_manager for unified output handling.
 """
 
-import math
+import itertools
+import re
 import time
+from functools import lru_cache
 import typer
-from typing import Optional, List
+from typing import Any, Optional, List, Tuple
 from datetime import datetime, timezone
 from conviso.core.notifier import info, success, error, summary, warning, timed_summary
 from conviso.clients.client_graphql import graphql_request
-from conviso.core.concurrency import parallel_map
+from conviso.core.concurrency import parallel_map, parallel_imap, prefetch_pages
 from conviso.core.validators import validate_choice
 from conviso.schemas.projects_schema import schema, project_type_schema
 from conviso.schemas.project_requirements_activities_schema import schema as project_requirements_schema
-from conviso.core.output_manager import export_data
+from conviso.core.output_manager import export_data, export_data_stream, output_field_keys
 
 app = typer.Typer(help="Manage projects via Conviso GraphQL API.")
 PROJECT_STATUS_ALLOWED = {"PLANNED", "ANALYSIS", "PAUSED", "DONE", "DISCONTINUED"}
+DELETE_BATCH_SIZE = 200
+# 'key=value' filter token; key and value come back already stripped
+_FILTER_RE = re.compile(r"\s*([^=]*?)\s*=\s*(.*?)\s*", re.DOTALL)
+
+
+def _minify_query(text: str) -> str:
+    """Collapse a GraphQL document onto one line so requests carry no indentation bytes."""
+    return " ".join(text.split())
+
+
+_PROJECT_TYPES_QUERY = _minify_query("""
+query ProjectTypes($page: Int, $limit: Int, $params: ProjectTypeSearch) {
+  projectTypes(page: $page, limit: $limit, params: $params) {
+    collection {
+      id
+      label
+      code
+      description
+      defaultDuration
+    }
+    metadata { totalCount totalPages }
+  }
+}
+""")
+
+_PROJECT_REQUIREMENTS_QUERY = _minify_query("""
+query ProjectRequirements($id: ID!, $historyPerPage: Int!) {
+  project(id: $id) {
+    id
+    label
+    projectRequirements {
+      id
+      label
+      checklist {
+        id
+        label
+      }
+      activities {
+        id
+        title
+        status
+        startedAt
+        finishedAt
+        evidences { filename }
+        history(pagination: { page: 1, perPage: $historyPerPage }) {
+          collection {
+            id
+            createdAt
+            actionType
+            portalUser { email name }
+            evidences { filename }
+          }
+        }
+      }
+    }
+  }
+}
+""")
+
+_CREATE_PROJECT_MUTATION = _minify_query("""
+mutation CreateProject($input: CreateProjectInput!) {
+  createProject(input: $input) {
+    project {
+      id
+      pid
+      label
+      goal
+      scope
+      createdAt
+      startDate
+      endDate
+      estimatedHours
+      projectType { id label }
+      allocatedAnalyst {
+        portalUser { email }
+      }
+    }
+  }
+}
+""")
+
+_UPDATE_PROJECT_MUTATION = _minify_query("""
+mutation UpdateProject($input: UpdateProjectInput!) {
+  updateProject(input: $input) {
+    project {
+      id
+      label
+      goal
+      scope
+      startDate
+      endDate
+      estimatedHours
+      projectType { id label }
+      tags { name }
+      assets { id name }
+    }
+  }
+}
+""")
+
+_UPDATE_PROJECT_STATUS_MUTATION = _minify_query("""
+mutation UpdateProjectStatus($input: UpdateProjectStatusInput!) {
+  updateProjectStatus(input: $input) {
+    errors
+    project {
+      id
+      label
+      status
+    }
+  }
+}
+""")
+
+_BULK_DELETE_PROJECTS_MUTATION = _minify_query("""
+mutation BulkDeleteProject($input: BulkDeleteProjectInput!) {
+  bulkDeleteProjects(input: $input) {
+    clientMutationId
+  }
+}
+""")
+
+# Verification only needs IDs to tell deleted from remaining projects
+_VERIFY_PROJECTS_QUERY = _minify_query("""
+query projects(
+  $page: Int
+  $limit: Int
+  $params: ProjectSearch!
+) {
+  projects(page: $page, limit: $limit, params: $params) {
+    collection { id }
+  }
+}
+""")
+
+
+@lru_cache(maxsize=None)
+def _list_projects_query(selection: Tuple[str, ...]) -> str:
+    """Build the minified projects list query for a collection selection (one build per column set)."""
+    return _minify_query(f"""
+query projects(
+  $page: Int
+  $limit: Int
+  $params: ProjectSearch
+  $sortBy: String
+  $descending: Boolean
+) {{
+  projects(
+    page: $page
+    limit: $limit
+    params: $params
+    sortBy: $sortBy
+    descending: $descending
+  ) {{
+    collection {{ {" ".join(selection)} }}
+    metadata {{ totalCount totalPages }}
+  }}
+}}
+""")
+
+
+@lru_cache(maxsize=None)
+def _project_associations_query(selection: Tuple[str, ...]) -> str:
+    """Build the minified query that fetches a project's current associations before a merge."""
+    return _minify_query(f"""
+query Project($id: ID!, $companyId: ID!) {{
+  project(id: $id, companyId: $companyId) {{
+    id
+    {" ".join(selection)}
+  }}
+}}
+""")
+
+
+def _compact(**fields) -> dict:
+    """Build a mutation input dict, dropping keys whose value is None."""
+    return {k: v for k, v in fields.items() if v is not None}
+
+
+def _csv_strs(value: Optional[str]) -> Optional[List[str]]:
+    """Split comma-separated strings into a trimmed list (None when the option was not given)."""
+    if value is None:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def _csv_ints(value: Optional[str], kind: str = "ID") -> Optional[List[int]]:
+    """Parse comma-separated IDs into ints, warning about and skipping invalid entries."""
+    if value is None:
+        return None
+    parsed: List[int] = []
+    for raw in value.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            parsed.append(int(raw))
+        except ValueError:
+            warning(f"Ignoring invalid {kind} ID: {raw}")
+    return parsed
+
+
+def _nget(obj: Optional[dict], key: str, default: Any = ""):
+    """dict.get on a possibly-null nested object without allocating a throwaway {}."""
+    return default if obj is None else obj.get(key, default)
+
+
+@lru_cache(maxsize=4096)
+def _iso_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parse an ISO-8601 timestamp into UTC epoch seconds; cached since history rows repeat values."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _iter_attachment_names(evidences: List, history_rows: List):
+    """Yield evidence filenames from an activity and its history entries, in order."""
+    for ev in evidences:
+        if ev and ev.get("filename"):
+            yield ev["filename"]
+    for h in history_rows:
+        for ev in h.get("evidences") or ():
+            if ev and ev.get("filename"):
+                yield ev["filename"]
+
+
+def _cast_ids(raw_ids: List, kind: str) -> List[int]:
+    """Cast API IDs to ints in one pass, warning per element only when some are not numeric."""
+    ids = [raw for raw in raw_ids if raw is not None]
+    try:
+        return list(map(int, ids))
+    except ValueError:
+        parsed: List[int] = []
+        for raw in ids:
+            try:
+                parsed.append(int(raw))
+            except ValueError:
+                warning(f"{kind} ID '{raw}' is not numeric; skipping.")
+        return parsed
+
+
+def _parse_project_filters(values: Optional[List[str]]) -> List[Tuple[str, Any]]:
+    """
+    Typer callback for --filter: resolve 'field=value' pairs into ProjectSearch params
+    once at argument-parse time. The client-side assignee filter is kept under 'assignee'.
+    Returns (key, value) pairs since Typer re-iterates the value for list options.
+    """
+    params = {}
+    for f in values or []:
+        match = _FILTER_RE.fullmatch(f)
+        if not match:
+            warning(f"[WARN] Invalid filter syntax: {f} (expected key=value)")
+            continue
+        key, value = match.groups()
+        if key.lower() == "assignee":
+            params["assignee"] = value.lower()
+            continue
+        gql_key = schema.resolve_filter_key(key)
+        params[gql_key] = schema.cast_filter_value(gql_key, value)
+    return list(params.items())
 
 
 # ---------------------- TYPES COMMAND ---------------------- #
@@ -40,20 +307,6 @@ def list_project_types(
     params = {}
     if search:
         params["labelCont"] = search.strip()
-    query = """
-    query ProjectTypes($page: Int, $limit: Int, $params: ProjectTypeSearch) {
-      projectTypes(page: $page, limit: $limit, params: $params) {
-        collection {
-          id
-          label
-          code
-          description
-          defaultDuration
-        }
-        metadata { totalCount totalPages }
-      }
-    }
-    """
 
     variables = {
         "page": page,
@@ -68,7 +321,7 @@ def list_project_types(
         def _fetch_page(page_num: int):
             vars_page = dict(variables)
             vars_page["page"] = page_num
-            data_page = graphql_request(query, vars_page, log_request=True, verbose_only=all_pages)
+            data_page = graphql_request(_PROJECT_TYPES_QUERY, vars_page, log_request=True, verbose_only=all_pages)
             project_types_page = data_page["projectTypes"]
             collection_page = project_types_page.get("collection") or []
             metadata_page = project_types_page.get("metadata") or {}
@@ -136,11 +389,14 @@ def list_project_types(
 @app.command("list")
 def list_projects(
     company_id: int = typer.Option(..., "--company-id", "-c", help="Company ID (required)"),
+    # Typer parses --filter from this annotation; the callback then replaces the raw strings,
+    # so inside the command filters is the resolved List[Tuple[str, Any]] of ProjectSearch params
     filters: Optional[List[str]] = typer.Option(
         None,
         "--filter",
         "-F",
         help="Apply filters in 'field=value' format. Supports aliases (e.g., id=123, name=foo, status=DONE, assignee=user@company.com).",
+        callback=_parse_project_filters,
     ),
     sort_by: Optional[str] = typer.Option(
         None,
@@ -151,7 +407,7 @@ def list_projects(
     descending: bool = typer.Option(False, "--desc", help="Sort in descending order."),
     page: int = typer.Option(1, "--page", "-p", help="Page number."),
     limit: int = typer.Option(50, "--limit", "-l", help="Items per page."),
-    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, json, csv."),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, json, ndjson, csv."),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file (for JSON or CSV export)."),
     all_pages: bool = typer.Option(False, "--all", help="Fetch all pages."),
 ):
@@ -159,23 +415,10 @@ def list_projects(
     info(f"Listing projects for company {company_id} (page {page}, limit {limit})...")
     started_at = time.perf_counter()
 
-    # Build search parameters
-    params = {"scopeIdEq": company_id}
-    assignee_filter = None
-    if filters:
-        for f in filters:
-            if "=" not in f:
-                warning(f"[WARN] Invalid filter syntax: {f} (expected key=value)")
-                continue
-            key, value = f.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            if key.lower() == "assignee":
-                assignee_filter = value.lower()
-                continue
-            gql_key = schema.resolve_filter_key(key)
-            casted = schema.cast_filter_value(gql_key, value)
-            params[gql_key] = casted
+    # Filters were already resolved by _parse_project_filters during argument parsing
+    filter_params = dict(filters or {})
+    assignee_filter = filter_params.pop("assignee", None)
+    params = {"scopeIdEq": company_id, **filter_params}
 
     variables = {
         "page": page,
@@ -185,95 +428,51 @@ def list_projects(
         "descending": descending,
     }
 
-    query = """
-    query projects(
-      $page: Int
-      $limit: Int
-      $params: ProjectSearch
-      $sortBy: String
-      $descending: Boolean
-    ) {
-      projects(
-        page: $page
-        limit: $limit
-        params: $params
-        sortBy: $sortBy
-        descending: $descending
-      ) {
-        collection {
-          id
-          label
-          status
-          createdAt
-          startDate
-          endDate
-          estimatedHours
-          environmentCompromised
-          projectType { label }
-          tags { name }
-          allocatedAnalyst {
-            portalUser { name email }
-          }
-          assets { id name }
-          requirementsProgress { done total }
-        }
-        metadata { totalCount totalPages }
-      }
-    }
-    """
+    # Request only what the rendered columns (and the client-side assignee filter) need
+    selection = schema.fields_for_columns(output_field_keys(schema))
+    if assignee_filter:
+        selection.append("allocatedAnalyst { portalUser { name email } }")
+    query = _list_projects_query(tuple(selection))
 
     try:
         fetch_all = all_pages or bool(assignee_filter)
-        current_page = page
-        rows = []
         total_pages = None
         total_count = 0
-        def _append_rows_from_collection(collection):
-            nonlocal rows
-            for p in collection:
-                assignees = []
-                for alloc in p.get("allocatedAnalyst") or []:
-                    portal_user = (alloc or {}).get("portalUser") or {}
-                    email = (portal_user.get("email") or "").strip()
-                    name = (portal_user.get("name") or "").strip()
-                    if email:
-                        assignees.append(email)
-                    elif name:
-                        assignees.append(name)
 
+        def _rows_from_collection(collection):
+            join = ", ".join
+            for p in collection:
+                get = p.get
                 if assignee_filter:
-                    haystack = " ".join(assignees).lower()
-                    if assignee_filter not in haystack:
+                    assignees = []
+                    for alloc in get("allocatedAnalyst") or ():
+                        portal_user = _nget(alloc, "portalUser", None) or {}
+                        email = (portal_user.get("email") or "").strip()
+                        name = (portal_user.get("name") or "").strip()
+                        if email:
+                            assignees.append(email)
+                        elif name:
+                            assignees.append(name)
+                    if assignee_filter not in " ".join(assignees).lower():
                         continue
 
-                done = (p.get("requirementsProgress") or {}).get("done", 0)
-                total = (p.get("requirementsProgress") or {}).get("total", 0)
-                requirements = f"{done}/{total}"
-
-                tags_list = p.get("tags") or []
-                tags_str = ", ".join(t.get("name", "") for t in tags_list if t and t.get("name"))
-
-                assets_list = []
-                for a in p.get("assets") or []:
-                    name = a.get("name")
-                    aid = a.get("id")
-                    if name:
-                        assets_list.append(name)
-                    elif aid:
-                        assets_list.append(str(aid))
-
-                rows.append({
-                    "id": p.get("id") or "",
-                    "label": p.get("label") or "",
-                    "projectType.label": (p.get("projectType") or {}).get("label", ""),
-                    "status": p.get("status") or "",
-                    "requirements": requirements,
-                    "assets": ", ".join(assets_list),
-                    "createdAt": p.get("createdAt") or "",
-                    "startDate": p.get("startDate") or "",
-                    "endDate": p.get("endDate") or "",
-                    "tags": tags_str,
-                })
+                progress = get("requirementsProgress")
+                yield {
+                    "id": get("id") or "",
+                    "label": get("label") or "",
+                    "projectType.label": _nget(get("projectType"), "label"),
+                    "status": get("status") or "",
+                    "requirements": f"{_nget(progress, 'done', 0)}/{_nget(progress, 'total', 0)}",
+                    "assets": join([
+                        a.get("name") or str(a["id"])
+                        for a in get("assets") or ()
+                        if a.get("name") or a.get("id")
+                    ]),
+                    "createdAt": get("createdAt") or "",
+                    "startDate": get("startDate") or "",
+                    "endDate": get("endDate") or "",
+                    "tags": join([t["name"] for t in get("tags") or () if t and t.get("name")]),
+                }
 
         def _fetch_page(page_num: int):
             vars_page = dict(variables)
@@ -284,71 +483,65 @@ def list_projects(
             metadata_page = projects_page.get("metadata") or {}
             return page_num, collection_page, metadata_page
 
-        page_num, collection, metadata = _fetch_page(current_page)
+        _, collection, metadata = _fetch_page(page)
         total_pages = metadata.get("totalPages")
         total_count = metadata.get("totalCount", total_count)
 
-        if not collection:
-            typer.echo("⚠️  No projects found.")
-            raise typer.Exit()
-
-        _append_rows_from_collection(collection)
-
-        if fetch_all:
-            if total_pages is not None and current_page < total_pages:
-                page_numbers = list(range(current_page + 1, total_pages + 1))
-                page_results = parallel_map(_fetch_page, page_numbers)
-                for _, page_collection, _ in sorted(page_results, key=lambda x: x[0]):
-                    if page_collection:
-                        _append_rows_from_collection(page_collection)
-            else:
-                # Metadata missing: keep sequential pagination fallback
-                while True:
-                    current_page += 1
-                    _, page_collection, page_metadata = _fetch_page(current_page)
-                    if not page_collection:
-                        break
-                    _append_rows_from_collection(page_collection)
-                    total_pages = page_metadata.get("totalPages")
-                    if total_pages is not None and current_page >= total_pages:
-                        break
-
-        if not rows:
+        def _iter_rows():
+            """Yield rows page by page so JSON/CSV output can start before the last page arrives."""
+            yield from _rows_from_collection(collection)
+            if not fetch_all or not collection:
+                return
+            if total_pages is not None:
+                for _, page_collection, _ in parallel_imap(_fetch_page, range(page + 1, total_pages + 1)):
+                    yield from _rows_from_collection(page_collection)
+                return
+            # Metadata missing: prefetch pages in concurrent windows until an empty/last page
+            def _is_last(result) -> bool:
+                page_num, page_collection, page_metadata = result
+                last_page = page_metadata.get("totalPages")
+                return not page_collection or (last_page is not None and page_num >= last_page)
+
+            for _, page_collection, _ in prefetch_pages(_fetch_page, page + 1, _is_last):
+                yield from _rows_from_collection(page_collection)
+
+        rows_iter = _iter_rows()
+        first_row = next(rows_iter, None)
+        if first_row is None:
             typer.echo("⚠️  No projects found.")
             raise typer.Exit()
 
         if fetch_all:
             disp_page, disp_total_pages = 1, 1
-            total = len(rows)
-            start, end = (1, total) if total > 0 else (0, 0)
         else:
             disp_page = page
-            disp_total_pages = total_pages or '?'
-            total = total_count or len(rows)
-            effective_limit = max(limit, 1)
-            start = (page - 1) * effective_limit + 1 if total > 0 else 0
-            end = min(page * effective_limit, total)
+            disp_total_pages = total_pages if total_pages is not None else '?'
 
-        export_data(
-            rows,
+        row_count = export_data_stream(
+            itertools.chain((first_row,), rows_iter),
             schema=schema,
             fmt=fmt,
             output=output,
             title=f"Projects (Company {company_id}) - Page {disp_page}/{disp_total_pages}",
         )
 
-        if fmt != "json":
-            if not fetch_all and disp_total_pages != '?':
-                total_pages_calc = disp_total_pages
-            elif fetch_all:
-                total_pages_calc = 1
+        if fmt not in ("json", "ndjson"):
+            if fetch_all:
+                total = row_count
+                start, end = 1, total
             else:
-                total_pages_calc = math.ceil(total / max(limit, 1))
+                total = total_count or row_count
+                effective_limit = max(limit, 1)
+                start = (page - 1) * effective_limit + 1
+                end = min(page * effective_limit, total)
+                # Same page count as the title; derive one only when metadata.totalPages is missing
+                if total_pages is None:
+                    disp_total_pages = -(-total // effective_limit)
 
             elapsed = time.perf_counter() - started_at
             timed_summary(
                 f"Showing {start}-{end} of {total} "
-                f"(page {disp_page}/{total_pages_calc})",
+                f"(page {disp_page}/{disp_total_pages})",
                 elapsed,
             )
 
@@ -400,7 +593,13 @@ def list_project_requirements(
         "--attachment-name",
         help="Filter by attached filename (contains, case-insensitive).",
     ),
-    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, json, csv."),
+    history_limit: int = typer.Option(
+        200,
+        "--history-limit",
+        min=1,
+        help="Max history entries fetched per activity. Lower it to shrink responses on busy projects.",
+    ),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, json, ndjson, csv."),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file (for JSON or CSV export)."),
 ):
     """List project requirements and activities with attachment/history filters."""
@@ -408,14 +607,6 @@ def list_project_requirements(
 
     allowed_status = {"IN_PROGRESS", "DONE", "NOT_APPLICABLE", "NOT_STARTED", "NOT_ACCORDING"}
 
-    def _norm(value: Optional[str]) -> str:
-        if not value:
-            return ""
-        chars = []
-        for ch in value.lower():
-            chars.append(ch if ch.isalnum() else " ")
-        return " ".join("".join(chars).split())
-
     def _parse_dt(value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
         if not value:
             return None
@@ -435,17 +626,6 @@ def list_project_requirements(
             warning(f"Ignoring invalid date/datetime filter: {value}")
             return None
 
-    def _safe_parse_iso(value: Optional[str]) -> Optional[datetime]:
-        if not value:
-            return None
-        try:
-            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=timezone.utc)
-            return parsed.astimezone(timezone.utc)
-        except Exception:
-            return None
-
     try:
         status_filter = validate_choice(status, allowed_status, "--status")
     except ValueError as exc:
@@ -457,96 +637,65 @@ def list_project_requirements(
     history_start_dt = _parse_dt(history_start, end_of_day=False)
     history_end_dt = _parse_dt(history_end, end_of_day=True)
     has_history_filters = bool(history_email_filter or history_start_dt or history_end_dt)
+    # Compare history timestamps as epoch seconds rather than datetime objects
+    history_start_ts = history_start_dt.timestamp() if history_start_dt else None
+    history_end_ts = history_end_dt.timestamp() if history_end_dt else None
+    has_date_filters = history_start_ts is not None or history_end_ts is not None
 
-    query = """
-    query ProjectRequirements($id: ID!) {
-      project(id: $id) {
-        id
-        label
-        projectRequirements {
-          id
-          label
-          checklist {
-            id
-            label
-          }
-          activities {
-            id
-            title
-            status
-            startedAt
-            finishedAt
-            evidences { filename }
-            history(pagination: { page: 1, perPage: 200 }) {
-              collection {
-                id
-                createdAt
-                actionType
-                portalUser { email name }
-                evidences { filename }
-              }
-            }
-          }
-        }
-      }
-    }
-    """
 
     try:
-        data = graphql_request(query, {"id": str(project_id)})
+        data = graphql_request(_PROJECT_REQUIREMENTS_QUERY, {"id": str(project_id), "historyPerPage": history_limit})
         project = data.get("project")
         if not project:
             typer.echo("⚠️  Project not found.")
             raise typer.Exit()
 
+        # Derived history columns are only built when they will be rendered (see --columns)
+        rendered_keys = set(output_field_keys(project_requirements_schema))
+        render_history_emails = "historyEmails" in rendered_keys
+        render_history_last_at = "historyLastAt" in rendered_keys
+
         rows = []
         for project_requirement in project.get("projectRequirements") or []:
             project_requirement_id = project_requirement.get("id")
             if requirement_id is not None:
                 try:
-                    if int(project_requirement_id) != int(requirement_id):
+                    if int(project_requirement_id) != requirement_id:
                         continue
                 except Exception:
                     continue
             for activity in project_requirement.get("activities") or []:
+                # Cheapest rejection first: status needs no attachment/history walk
                 activity_status = (activity.get("status") or "").upper()
+                if status_filter and activity_status != status_filter:
+                    continue
+
                 activity_evidences = activity.get("evidences") or []
                 history_rows = ((activity.get("history") or {}).get("collection") or [])
 
-                attachment_names = []
-                for ev in activity_evidences:
-                    filename = (ev or {}).get("filename")
-                    if filename:
-                        attachment_names.append(filename)
-                for h in history_rows:
-                    for ev in (h.get("evidences") or []):
-                        filename = (ev or {}).get("filename")
-                        if filename:
-                            attachment_names.append(filename)
-                seen_names = set()
-                attachment_names = [n for n in attachment_names if not (n in seen_names or seen_names.add(n))]
+                # dict.fromkeys dedupes in first-seen order in a single pass
+                attachment_names = list(dict.fromkeys(_iter_attachment_names(activity_evidences, history_rows)))
                 has_attachments = bool(attachment_names)
 
                 if attachment_name_filter:
                     if not any(attachment_name_filter in name.lower() for name in attachment_names):
                         continue
 
-                if status_filter and activity_status != status_filter:
-                    continue
                 if history_attachments and not has_attachments:
                     continue
 
                 matched_history = []
-                for h in history_rows:
+                for h in history_rows if has_history_filters else ():
                     h_email = ((h.get("portalUser") or {}).get("email") or "").lower()
-                    h_created_at = _safe_parse_iso(h.get("createdAt"))
 
                     if history_email_filter and history_email_filter not in h_email:
                         continue
-                    if history_start_dt and (h_created_at is None or h_created_at < history_start_dt):
-                        continue
-                    if history_end_dt and (h_created_at is None or h_created_at > history_end_dt):
-                        continue
+                    if has_date_filters:
+                        h_created_ts = _iso_timestamp(h.get("createdAt"))
+                        if history_start_ts is not None and (h_created_ts is None or h_created_ts < history_start_ts):
+                            continue
+                        if history_end_ts is not None and (h_created_ts is None or h_created_ts > history_end_ts):
+                            continue
                     matched_history.append(h)
 
                 if has_history_filters and not matched_history:
@@ -554,11 +703,16 @@ def list_project_requirements(
 
                 history_for_output = matched_history if has_history_filters else history_rows
                 history_emails = []
-                for h in history_for_output:
-                    email = (h.get("portalUser") or {}).get("email") or ""
-                    if email and email not in history_emails:
-                        history_emails.append(email)
-                history_dates = [h.get("createdAt") for h in history_for_output if h.get("createdAt")]
+                if render_history_emails:
+                    # Ordered dedupe via dict keys instead of a per-email list scan
+                    history_emails = list(dict.fromkeys([
+                        email
+                        for h in history_for_output
+                        if (email := _nget(h.get("portalUser"), "email", None))
+                    ]))
+                history_last_at = ""
+                if render_history_last_at:
+                    history_last_at = max((h["createdAt"] for h in history_for_output if h.get("createdAt")), default="")
 
                 rows.append({
                     "projectId": project.get("id") or "",
@@ -572,7 +726,7 @@ def list_project_requirements(
                     "attachments": ", ".join(attachment_names),
                     "historyEvents": str(len(history_for_output)),
                     "historyEmails": ", ".join(history_emails),
-                    "historyLastAt": max(history_dates) if history_dates else "",
+                    "historyLastAt": history_last_at,
                     "startedAt": activity.get("startedAt") or "",
                     "finishedAt": activity.get("finishedAt") or "",
                 })
@@ -589,8 +743,9 @@ def list_project_requirements(
             title=f"Project {project.get('id')} - Requirements Activities",
         )
 
-        unique_requirements = len({r["requirementId"] for r in rows if r.get("requirementId")})
-        summary(f"{len(rows)} activit(ies) listed across {unique_requirements} requirement(s).")
+        if fmt != "ndjson":
+            unique_requirements = len({r["requirementId"] for r in rows if r.get("requirementId")})
+            summary(f"{len(rows)} activit(ies) listed across {unique_requirements} requirement(s).")
 
     except typer.Exit:
         raise
@@ -623,91 +778,32 @@ def create_project(
     """Create a new project in the specified company. Use `projects types` to discover valid type IDs."""
     info(f"Creating project '{label}' in company {company_id}...")
 
-    def _split_assets(value: Optional[str]) -> Optional[List[int]]:
-        """Parse comma-separated asset IDs into a list of ints."""
-        if value is None:
-            return None
-        parsed = []
-        for raw in value.split(","):
-            raw = raw.strip()
-            if not raw:
-                continue
-            try:
-                parsed.append(int(raw))
-            except ValueError:
-                warning(f"Ignoring invalid asset ID: {raw}")
-        return parsed
-
-    def _split_requirements(value: Optional[str]) -> Optional[List[int]]:
-        """Parse comma-separated requirement IDs into a list of ints."""
-        if value is None:
-            return None
-        parsed = []
-        for raw in value.split(","):
-            raw = raw.strip()
-            if not raw:
-                continue
-            try:
-                parsed.append(int(raw))
-            except ValueError:
-                warning(f"Ignoring invalid requirement ID: {raw}")
-        return parsed
-
-    def _split_csv_str(value: Optional[str]) -> Optional[List[str]]:
-        """Split comma-separated strings into a trimmed list."""
-        if value is None:
-            return None
-        parsed = [raw.strip() for raw in value.split(",") if raw.strip()]
-        return parsed or None
-
-    mutation = """
-    mutation CreateProject($input: CreateProjectInput!) {
-      createProject(input: $input) {
-        project {
-          id
-          pid
-          label
-          goal
-          scope
-          createdAt
-          startDate
-          endDate
-          estimatedHours
-          projectType { id label }
-          allocatedAnalyst {
-            portalUser { email }
-          }
-        }
-      }
-    }
-    """
 
-    assets_ids = _split_assets(assets)
-    playbooks_ids = _split_requirements(requirements)
-    assignee_emails = _split_csv_str(assignees)
+    assets_ids = _csv_ints(assets, "asset")
+    playbooks_ids = _csv_ints(requirements, "requirement")
+    assignee_emails = _csv_strs(assignees) or None
 
     if not assets_ids:
         error("Project creation requires at least one asset. Use --assets <id>[,<id>...] or run 'python -m conviso.app assets list --company-id <ID>' to find valid asset IDs.")
         raise typer.Exit(code=1)
 
-    input_data = {
-        "companyId": company_id,
-        "label": label,
-        "goal": goal,
-        "scope": scope,
-        "typeId": type_id,
-        "startDate": start_date,
-        "endDate": end_date,
-        "estimatedHours": estimated_hours,
-        "tags": tags.split(",") if tags else None,
-        "allocatedPortalUserEmails": assignee_emails,
-        "assetsIds": assets_ids if assets_ids else None,
-        "playbooksIds": playbooks_ids if playbooks_ids else None,
-    }
-    input_data = {k: v for k, v in input_data.items() if v is not None}
+    input_data = _compact(
+        companyId=company_id,
+        label=label,
+        goal=goal,
+        scope=scope,
+        typeId=type_id,
+        startDate=start_date,
+        endDate=end_date,
+        estimatedHours=estimated_hours,
+        tags=tags.split(",") if tags else None,
+        allocatedPortalUserEmails=assignee_emails,
+        assetsIds=assets_ids or None,
+        playbooksIds=playbooks_ids or None,
+    )
 
     try:
-        data = graphql_request(mutation, {"input": input_data})
+        data = graphql_request(_CREATE_PROJECT_MUTATION, {"input": input_data})
         project = data["createProject"]["project"]
         success(f"Project created successfully: ID {project['id']} - {project['label']}")
     except Exception as e:
@@ -746,134 +842,67 @@ def update_project(
     """Update an existing project."""
     info(f"✏️ Updating project ID {project_id} in company {company_id}...")
 
-    mutation = """
-    mutation UpdateProject($input: UpdateProjectInput!) {
-      updateProject(input: $input) {
-        project {
-          id
-          label
-          goal
-          scope
-          startDate
-          endDate
-          estimatedHours
-          projectType { id label }
-          tags { name }
-          assets { id name }
-        }
-      }
-    }
-    """
-
-    def _split_csv_str(value: Optional[str]) -> Optional[List[str]]:
-        """Split comma-separated strings into list, trimming blanks."""
-        if value is None:
-            return None
-        return [v.strip() for v in value.split(",") if v.strip()]
-
-    def _split_csv_ids(value: Optional[str]) -> Optional[List[int]]:
-        """Split comma-separated asset IDs into list of ints."""
-        if value is None:
-            return None
-        items: List[int] = []
-        for raw in value.split(","):
-            raw = raw.strip()
-            if not raw:
-                continue
-            try:
-                items.append(int(raw))
-            except ValueError:
-                warning(f"Ignoring invalid asset ID: {raw}")
-        return items
 
     # Pre-parse direct replacements
-    direct_tags = _split_csv_str(tags)
-    direct_assets = _split_csv_ids(assets)
-    direct_playbooks = _split_csv_ids(requirements)
+    direct_tags = _csv_strs(tags)
+    direct_assets = _csv_ints(assets, "asset")
+    direct_playbooks = _csv_ints(requirements, "requirement")
 
-    # Determine if we need to fetch current associations for merge-style operations
-    needs_merge_tags = any([add_tags, remove_tags, clear_tags]) and direct_tags is None
-    needs_merge_assets = any([add_assets, remove_assets, clear_assets]) and direct_assets is None
+    # Current associations are only needed to add to / remove from them; --clear-* and
+    # explicit replacement lists already define the final value without a fetch.
+    needs_merge_tags = bool(add_tags or remove_tags) and direct_tags is None and not clear_tags
+    needs_merge_assets = bool(add_assets or remove_assets) and direct_assets is None and not clear_assets
 
     current_tags: List[str] = []
     current_assets: List[int] = []
-    current_playbooks: List[int] = []
 
-    if needs_merge_tags or needs_merge_assets:
+    # Only request the associations that are actually being merged
+    selection = []
+    if needs_merge_tags:
+        selection.append("tags { name }")
+    if needs_merge_assets:
+        selection.append("assets { id }")
+
+    if selection:
         info("Fetching current tags/assets for merge...")
-        fetch_query = """
-        query Project($id: ID!, $companyId: ID!) {
-          project(id: $id, companyId: $companyId) {
-            id
-            tags { name }
-            assets { id }
-            playbooks { id }
-          }
-        }
-        """
+        fetch_query = _project_associations_query(tuple(selection))
         try:
             fetched = graphql_request(fetch_query, {"id": project_id, "companyId": company_id})
             project = fetched.get("project") or {}
-            current_tags = [t.get("name") for t in project.get("tags") or [] if t.get("name")]
-            # Some APIs return IDs as strings; cast defensively
-            for a in project.get("assets") or []:
-                aid = a.get("id")
-                if aid is None:
-                    continue
-                try:
-                    current_assets.append(int(aid))
-                except ValueError:
-                    warning(f"Asset ID '{aid}' is not numeric; skipping.")
-            for pb in project.get("playbooks") or []:
-                pid = pb.get("id")
-                if pid is None:
-                    continue
-                try:
-                    current_playbooks.append(int(pid))
-                except ValueError:
-                    warning(f"Requirement ID '{pid}' is not numeric; skipping.")
+            if needs_merge_tags:
+                current_tags = [t.get("name") for t in project.get("tags") or [] if t.get("name")]
+            if needs_merge_assets:
+                # Some APIs return IDs as strings; cast defensively
+                current_assets = _cast_ids([a.get("id") for a in project.get("assets") or []], "Asset")
         except Exception as fetch_err:
             error(f"Could not fetch current tags/assets: {fetch_err}")
             return
 
-    def _unique_preserve(seq):
-        """Remove duplicates while preserving order."""
-        seen = set()
-        result = []
-        for item in seq:
-            key = item
-            if key in seen:
-                continue
-            seen.add(key)
-            result.append(item)
-        return result
-
     # Start with explicit replacements when provided; otherwise use fetched values
     merged_tags = direct_tags if direct_tags is not None else list(current_tags)
     merged_assets = direct_assets if direct_assets is not None else list(current_assets)
-    merged_playbooks = direct_playbooks if direct_playbooks is not None else list(current_playbooks)
 
     # Apply merge operations for tags
-    add_tags_list = _split_csv_str(add_tags) or []
-    remove_tags_list = _split_csv_str(remove_tags) or []
+    add_tags_list = _csv_strs(add_tags) or []
+    remove_tags_list = _csv_strs(remove_tags) or []
     if clear_tags:
         merged_tags = []
     if add_tags_list:
-        merged_tags = _unique_preserve([*merged_tags, *add_tags_list])
+        merged_tags = list(dict.fromkeys([*merged_tags, *add_tags_list]))
     if remove_tags_list:
-        merged_tags = [t for t in merged_tags if t not in remove_tags_list]
+        remove_tags_set = frozenset(remove_tags_list)
+        merged_tags = [t for t in merged_tags if t not in remove_tags_set]
 
     # Apply merge operations for assets
-    add_assets_list = _split_csv_ids(add_assets) or []
-    remove_assets_list = _split_csv_ids(remove_assets) or []
+    add_assets_list = _csv_ints(add_assets, "asset") or []
+    remove_assets_list = _csv_ints(remove_assets, "asset") or []
     if clear_assets:
         merged_assets = []
     if add_assets_list:
-        merged_assets = _unique_preserve([*merged_assets, *add_assets_list])
+        merged_assets = list(dict.fromkeys([*merged_assets, *add_assets_list]))
     if remove_assets_list:
-        merged_assets = [a for a in merged_assets if a not in remove_assets_list]
-
-    include_playbooks = direct_playbooks is not None
+        remove_assets_set = frozenset(remove_assets_list)
+        merged_assets = [a for a in merged_assets if a not in remove_assets_set]
 
     include_tags = (
         direct_tags is not None
@@ -890,24 +919,23 @@ def update_project(
         or needs_merge_assets
     )
 
-    input_data = {
-        "id": project_id,
-        "companyId": company_id,
-        "label": label,
-        "goal": goal,
-        "scope": scope,
-        "typeId": type_id,
-        "startDate": start_date,
-        "endDate": end_date,
-        "estimatedHours": estimated_hours,
-        "tags": merged_tags if include_tags else None,
-        "assetsIds": merged_assets if include_assets else None,
-        "playbooksIds": merged_playbooks if include_playbooks else None,
-    }
-    input_data = {k: v for k, v in input_data.items() if v is not None}
+    input_data = _compact(
+        id=project_id,
+        companyId=company_id,
+        label=label,
+        goal=goal,
+        scope=scope,
+        typeId=type_id,
+        startDate=start_date,
+        endDate=end_date,
+        estimatedHours=estimated_hours,
+        tags=merged_tags if include_tags else None,
+        assetsIds=merged_assets if include_assets else None,
+        playbooksIds=direct_playbooks,
+    )
 
     try:
-        data = graphql_request(mutation, {"input": input_data})
+        data = graphql_request(_UPDATE_PROJECT_MUTATION, {"input": input_data})
         project = data["updateProject"]["project"]
         success(f"Project updated successfully: ID {project['id']} - {project['label']}")
     except Exception as e:
@@ -934,28 +962,16 @@ def update_project_status(
 
     info(f"Updating status for project ID {project_id} to {normalized_status}...")
 
-    mutation = """
-    mutation UpdateProjectStatus($input: UpdateProjectStatusInput!) {
-      updateProjectStatus(input: $input) {
-        errors
-        project {
-          id
-          label
-          status
-        }
-      }
-    }
-    """
 
     try:
         data = graphql_request(
-            mutation,
+            _UPDATE_PROJECT_STATUS_MUTATION,
             {"input": {"id": project_id, "projectStatus": normalized_status}},
         )
         result = data["updateProjectStatus"]
         errors = result.get("errors") or []
         if errors:
-            raise RuntimeError("; ".join(str(err) for err in errors))
+            raise RuntimeError("; ".join([str(err) for err in errors]))
         project = result["project"]
         success(
             f"Project status updated successfully: ID {project['id']} - "
@@ -972,8 +988,13 @@ def delete_projects(
     company_id: int = typer.Option(..., "--company-id", "-c", help="Company ID."),
     ids: str = typer.Option(..., "--ids", "-i", "-ids", help="Comma-separated list of project IDs (accepts single ID)."),
     force: bool = typer.Option(False, "--force", help="Skip confirmation prompt."),
+    verify: Optional[bool] = typer.Option(
+        None,
+        "--verify/--no-verify",
+        help="Query which IDs still exist after deleting. Defaults to --verify, or --no-verify when --force is set.",
+    ),
 ):
-    """Delete one or more projects by ID, then verify by querying which IDs still exist."""
+    """Delete one or more projects by ID, optionally verifying by querying which IDs still exist."""
     project_ids = [int(x.strip()) for x in ids.split(",") if x.strip()]
     info(f"Deleting {len(project_ids)} project(s) from company {company_id}...")
 
@@ -983,64 +1004,70 @@ def delete_projects(
             info("Aborted.")
             raise typer.Exit()
 
-    mutation = """
-    mutation BulkDeleteProject($input: BulkDeleteProjectInput!) {
-      bulkDeleteProjects(input: $input) {
-        clientMutationId
-      }
-    }
-    """
-    variables = {"input": {"companyId": company_id, "ids": project_ids}}
-
-    try:
-        data = graphql_request(mutation, variables)
-        # If API returned errors, graphql_request will raise.
-        info(f"Delete request sent for {len(project_ids)} project(s). Verifying...")
-
-    except Exception as e:
-        msg = str(e)
-        if "Record not found" in msg:
-            for pid in project_ids:
-                info(f"Project {pid} was not found (likely already deleted).")
-            summary(f"Summary: 0 deleted, {len(project_ids)} skipped (already removed).")
-            return
-        else:
-            error(f"Error deleting project(s): {e}")
-            summary(f"Summary: 0 deleted, {len(project_ids)} failed.")
-            return
-
-    # Optional verification
-    verify_query = """
-    query projects(
-      $page: Int
-      $limit: Int
-      $params: ProjectSearch!
-    ) {
-      projects(page: $page, limit: $limit, params: $params) {
-        collection { id label }
-      }
-    }
-    """
-    verify_vars = {
-        "page": 1,
-        "limit": len(project_ids),
-        "params": {"scopeIdEq": str(company_id), "idIn": [str(pid) for pid in project_ids]},
-    }
+    if verify is None:
+        verify = not force
 
-    try:
-        data = graphql_request(verify_query, verify_vars)
+    def _delete_batch(batch: List[int]) -> dict:
+        """Delete one batch of IDs and, when verifying, query which of them still exist."""
+        try:
+            # If API returned errors, graphql_request will raise.
+            graphql_request(_BULK_DELETE_PROJECTS_MUTATION, {"input": {"companyId": company_id, "ids": batch}})
+        except Exception as e:
+            if "Record not found" in str(e):
+                return {"skipped": batch}
+            return {"failed": batch, "error": f"Error deleting project(s): {e}"}
+        if not verify:
+            return {"unverified": batch}
+        verify_vars = {
+            "page": 1,
+            "limit": len(batch),
+            "params": {"scopeIdEq": str(company_id), "idIn": [str(pid) for pid in batch]},
+        }
+        try:
+            # Verification must observe the mutation, so it follows it on the same pooled connection
+            data = graphql_request(_VERIFY_PROJECTS_QUERY, verify_vars)
+        except Exception as e:
+            return {"unverified": batch, "verify_error": f"Deletion verification failed: {e}"}
         remaining = (data.get("projects") or {}).get("collection") or []
-        remaining_ids = {int(p["id"]) for p in remaining if p.get("id")}
-        deleted_ids = [pid for pid in project_ids if pid not in remaining_ids]
-        failed_ids = [pid for pid in project_ids if pid in remaining_ids]
+        remaining_ids = set(map(int, (p["id"] for p in remaining if p.get("id"))))
+        return {
+            "deleted": [pid for pid in batch if pid not in remaining_ids],
+            "still_present": [pid for pid in batch if pid in remaining_ids],
+        }
 
-        for pid in deleted_ids:
+    # Large --ids lists are split to stay within API query complexity limits
+    batches = [project_ids[i:i + DELETE_BATCH_SIZE] for i in range(0, len(project_ids), DELETE_BATCH_SIZE)]
+    if verify:
+        info(f"Sending delete request(s) in {len(batches)} batch(es), then verifying...")
+    results = parallel_map(_delete_batch, batches)
+
+    deleted = failed = skipped = unverified = 0
+    verify_failed = False
+    for result in results:
+        for pid in result.get("skipped", []):
+            info(f"Project {pid} was not found (likely already deleted).")
+        if result.get("error"):
+            error(result["error"])
+        if result.get("verify_error"):
+            error(result["verify_error"])
+            verify_failed = True
+        for pid in result.get("deleted", []):
             success(f"Deleted project ID {pid}")
-        for pid in failed_ids:
+        for pid in result.get("still_present", []):
             error(f"Failed to delete project ID {pid} (still present)")
-        summary(f"Summary: {len(deleted_ids)} deleted, {len(failed_ids)} failed.")
-
-    except Exception as e:
-        error(f"Deletion verification failed: {e}")
+        deleted += len(result.get("deleted", []))
+        failed += len(result.get("failed", [])) + len(result.get("still_present", []))
+        skipped += len(result.get("skipped", []))
+        unverified += len(result.get("unverified", []))
+
+    if unverified and not verify_failed:
+        success(f"Delete request accepted for {unverified} project(s).")
+    parts = [f"{deleted + unverified} deleted" + (f" ({unverified} not verified)" if unverified else "")]
+    parts.append(f"{failed} failed")
+    if skipped:
+        parts.append(f"{skipped} skipped (already removed)")
+    summary(f"Summary: {', '.join(parts)}.")
+
+    if verify_failed:
         summary("Deletion attempted, but verification failed. Try listing the IDs again.")
         raise typer.Exit(code=1)
@@ -7,17 +7,392 @@ List and import SBOM components.
 
 import typer
 import time
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from conviso.core.notifier import info, error, summary, success, timed_summary
 from conviso.core.validators import validate_choice
 from conviso.clients.client_graphql import graphql_request, graphql_request_upload
+from conviso.core.concurrency import parallel_map, parallel_imap, prefetch_pages
+from conviso.core import jsonutil
 from conviso.core.output_manager import export_data
+from conviso.core.auth import get_config_dir
 from conviso.schemas.sbom_schema import schema as sbom_schema
-import requests
 import json
-import uuid
+import mmap
+import os
+import sqlite3
+import sys
+from functools import lru_cache
+from operator import itemgetter
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ijson
+except Exception:  # pragma: no cover - optional; large SBOM files are then loaded whole
+    ijson = None
 
 app = typer.Typer(help="List and import SBOM components.")
+OSV_QUERYBATCH_URL = "https://api.osv.dev/v1/querybatch"
+# Queries per OSV querybatch request; the API accepts up to 1000
+OSV_BATCH_SIZE = 500
+OSV_POOL_MAXSIZE = 16
+CYCLONEDX_BUFFER_SIZE = 64 * 1024
+# SBOM files above this size are parsed incrementally when ijson is installed
+SBOM_STREAM_THRESHOLD = 32 * 1024 * 1024
+# OSV results are reused from the local cache for this long (seconds)
+OSV_CACHE_TTL = 24 * 60 * 60
+OSV_CACHE_FILE = "osv-cache.sqlite"
+_SEVERITY_ORDER = ("CRITICAL", "HIGH", "MEDIUM", "LOW", "NOTIFICATION")
+_SEVERITY_SET = frozenset(_SEVERITY_ORDER)
+# Component fields read per row (GraphQL returns every selected field, so itemgetter rarely misses)
+_LIST_FIELDS = ("id", "name", "version", "technology", "license", "packageManager", "issuesBySeverity")
+_CHECK_FIELDS = ("name", "version", "packageManager", "license")
+_get_list_fields = itemgetter(*_LIST_FIELDS)
+_get_check_fields = itemgetter(*_CHECK_FIELDS)
+_EMPTY: dict = {}
+# Package manager -> OSV ecosystem
+_ECOSYSTEM_MAP = {
+    "npm": "npm",
+    "yarn": "npm",
+    "pnpm": "npm",
+    "pypi": "PyPI",
+    "pip": "PyPI",
+    "maven": "Maven",
+    "gradle": "Maven",
+    "nuget": "NuGet",
+    "go": "Go",
+    "golang": "Go",
+    "cargo": "crates.io",
+    "rust": "crates.io",
+    "composer": "Packagist",
+    "packagist": "Packagist",
+}
+
+# ---------------------------------------------------------------------------
+# GraphQL queries
+# ---------------------------------------------------------------------------
+
+_SBOM_LIST_QUERY = """
+query SbomComponents($companyId: ID!, $search: SbomComponentSearchInput, $page: Int, $limit: Int) {
+  sbomComponents(companyId: $companyId, search: $search, page: $page, limit: $limit) {
+    collection {
+      id
+      name
+      asset { id name }
+      technology
+      license
+      packageManager
+      version
+      issuesBySeverity
+    }
+    metadata { currentPage limitValue totalCount totalPages }
+  }
+}
+"""
+
+_SBOM_IMPORT_MUTATION = """
+mutation ImportSbom($input: ImportSbomInput!) {
+  importSbom(input: $input) {
+    __typename
+  }
+}
+"""
+
+_SBOM_CHECK_QUERY = """
+query SbomComponents($companyId: ID!, $search: SbomComponentSearchInput, $page: Int, $limit: Int) {
+  sbomComponents(companyId: $companyId, search: $search, page: $page, limit: $limit) {
+    collection {
+      name
+      version
+      packageManager
+      license
+    }
+    metadata { currentPage limitValue totalCount totalPages }
+  }
+}
+"""
+
+
+@lru_cache(maxsize=1)
+def _osv_session() -> requests.Session:
+    """Keep-alive session for OSV; querybatch is idempotent, so transient errors are retried with backoff."""
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=OSV_POOL_MAXSIZE, max_retries=retry))
+    return session
+
+
+def _parse_csv(value: str) -> list:
+    """Split a comma-separated option into trimmed, non-empty values."""
+    return [item for item in (part.strip() for part in value.split(",")) if item]
+
+
+def _parse_int_csv(value: str) -> list:
+    """Parse comma-separated integers; int() already ignores surrounding whitespace. Raises ValueError."""
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def _cyclonedx_component(row: dict) -> dict:
+    """Map a list row to a CycloneDX component."""
+    comp = {
+        "type": "application",
+        "name": row.get("name") or "unknown",
+        "version": row.get("version") or "unknown",
+    }
+    if row.get("license"):
+        comp["licenses"] = [{"license": {"id": row["license"]}}]
+    props = []
+    if row.get("packageManager"):
+        props.append({"name": "packageManager", "value": row["packageManager"]})
+    if row.get("asset"):
+        props.append({"name": "asset", "value": str(row["asset"])})
+    if row.get("assetId"):
+        props.append({"name": "assetId", "value": str(row["assetId"])})
+    if row.get("issuesBySeverity"):
+        props.append({"name": "vulnsBySeverity", "value": row["issuesBySeverity"]})
+    if props:
+        comp["properties"] = props
+    return comp
+
+
+def _new_serial_number() -> str:
+    """Return a random (version 4) UUID URN for a CycloneDX serialNumber, built at emit time."""
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.hex()
+    return f"urn:uuid:{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _iter_cyclonedx_chunks(header: dict, components: Iterable[dict]) -> Iterator[bytes]:
+    """
+    Yield an indented CycloneDX document piece by piece, encoding one component at a time.
+    The bytes match encoding {**header, "components": [...]} in one go.
+    """
+    # The encoded header ends with b"\n}"; reopen it to append the components array
+    yield jsonutil.dumps(header, indent=True)[:-2] + b',\n  "components": '
+    first = True
+    for comp in components:
+        yield (b"[\n    " if first else b",\n    ") + jsonutil.dumps(comp, indent=True).replace(b"\n", b"\n    ")
+        first = False
+    yield b"[]\n}" if first else b"\n  ]\n}"
+
+
+def _write_chunks(chunks: Iterable[bytes], output: Optional[str] = None):
+    """Write encoded chunks to output, or to stdout followed by a newline."""
+    if output:
+        with open(output, "wb", buffering=CYCLONEDX_BUFFER_SIZE) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return
+    raw = getattr(sys.stdout, "buffer", None)
+    if raw is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk.decode("utf-8"))
+        sys.stdout.write("\n")
+        return
+    sys.stdout.flush()
+    for chunk in chunks:
+        raw.write(chunk)
+    raw.write(b"\n")
+    raw.flush()
+
+
+def _iter_sbom_file_components(path: str):
+    """Yield CycloneDX components from a JSON file, streaming large files with ijson when available."""
+    if ijson is not None and os.path.getsize(path) > SBOM_STREAM_THRESHOLD:
+        with open(path, "rb") as fh:
+            yield from ijson.items(fh, "components.item")
+        return
+    with open(path, "rb") as fh:
+        data = _load_json_file(fh)
+    yield from data.get("components") or []
+
+
+def _load_json_file(fh) -> dict:
+    """Decode a JSON file; the bytes are parsed straight from a read-only mmap when possible."""
+    try:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        pass  # empty files, pipes and other unmappable streams are read normally
+    else:
+        with mm:
+            view = memoryview(mm)
+            try:
+                return jsonutil.loads(view)
+            finally:
+                view.release()
+    return jsonutil.loads(fh.read())
+
+
+# Dedup key for OSV lookups; check-vulns rows always carry these fields
+_osv_key = itemgetter("purl", "ecosystem", "name", "version")
+
+
+def _osv_query(purl: Optional[str], ecosystem: Optional[str], name: Optional[str], version: Optional[str]) -> dict:
+    """Build one querybatch entry for a distinct (purl, ecosystem, name, version) key."""
+    pkg = {"purl": purl} if purl else {}
+    if ecosystem and ecosystem.upper() != "UNKNOWN":
+        pkg["ecosystem"] = ecosystem
+    pkg["name"] = name
+    return {"package": pkg, "version": version or ""}
+
+
+def _osv_cache_key(query: dict) -> str:
+    """Stable cache key for one OSV query (package + version)."""
+    return json.dumps(query, sort_keys=True, separators=(",", ":"))
+
+
+def _open_osv_cache() -> Optional[sqlite3.Connection]:
+    """Open the local OSV result cache, or return None when it cannot be used."""
+    try:
+        conn = sqlite3.connect(str(get_config_dir() / OSV_CACHE_FILE))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS osv_results "
+            "(key TEXT PRIMARY KEY, fetched_at INTEGER NOT NULL, result TEXT NOT NULL)"
+        )
+        return conn
+    except Exception:
+        return None
+
+
+def _osv_cache_lookup(conn: sqlite3.Connection, keys: list) -> dict:
+    """Return {key: result} for cached entries younger than OSV_CACHE_TTL."""
+    cutoff = int(time.time()) - OSV_CACHE_TTL
+    found = {}
+    # Stay well under SQLite's bound-parameter limit
+    for i in range(0, len(keys), OSV_BATCH_SIZE):
+        batch = keys[i:i + OSV_BATCH_SIZE]
+        placeholders = ",".join("?" * len(batch))
+        cursor = conn.execute(
+            f"SELECT key, result FROM osv_results WHERE fetched_at > ? AND key IN ({placeholders})",
+            [cutoff, *batch],
+        )
+        for key, result in cursor:
+            found[key] = jsonutil.loads(result)
+    return found
+
+
+def _osv_cache_store(conn: sqlite3.Connection, entries: list):
+    """Persist (key, result) pairs fetched from OSV."""
+    now = int(time.time())
+    conn.executemany(
+        "INSERT OR REPLACE INTO osv_results (key, fetched_at, result) VALUES (?, ?, ?)",
+        [(key, now, json.dumps(result, separators=(",", ":"))) for key, result in entries],
+    )
+    conn.commit()
+
+
+def _format_issues_by_severity(issues_val) -> str:
+    # Accept dict or JSON-like string
+    if isinstance(issues_val, str):
+        try:
+            issues_val = jsonutil.loads(issues_val)
+        except Exception:
+            pass
+    if isinstance(issues_val, dict):
+        # Normalize keys to upper; nested dicts with a count are unwrapped
+        normalized = {
+            str(k).upper(): v.get("count") if isinstance(v, dict) and "count" in v else v
+            for k, v in issues_val.items()
+        }
+        present = [sev for sev in _SEVERITY_ORDER if sev in normalized]
+        parts = []
+        for sev in present:
+            try:
+                val = int(normalized[sev])
+            except Exception:
+                val = normalized[sev]
+            # show only severities with count > 0 to keep compact; show zeros if all zero
+            if val not in (None, "", 0):
+                parts.append(f"{sev}:{val}")
+        if not parts:
+            parts = [f"{sev}:{normalized[sev]}" for sev in present]
+        # include any unexpected keys
+        parts.extend(f"{k}:{v}" for k, v in normalized.items() if k not in _SEVERITY_SET)
+        return ", ".join(parts) if parts else "-"
+    return str(issues_val) if issues_val not in (None, "", {}) else "-"
+
+
+def _fields(comp: dict, getter, names: tuple) -> tuple:
+    """Read several component fields in one C-level call; falls back to .get when a key is absent."""
+    try:
+        return getter(comp)
+    except KeyError:
+        return tuple(map(comp.get, names))
+
+
+def _sbom_row(comp: dict) -> dict:
+    """Flatten one sbomComponents item into an output row."""
+    comp_id, name, version, technology, license_id, package_manager, issues = _fields(comp, _get_list_fields, _LIST_FIELDS)
+    asset = comp.get("asset") or _EMPTY
+    return {
+        "id": comp_id,
+        "name": name,
+        "version": version,
+        "technology": technology,
+        "license": license_id,
+        "packageManager": package_manager,
+        # Components without findings skip the formatter entirely
+        "issuesBySeverity": _format_issues_by_severity(issues) if issues else "-",
+        "asset": asset.get("name"),
+        "assetId": asset.get("id"),
+    }
+
+
+def _check_row(comp: dict) -> dict:
+    """Build a check-vulns row from an API component (the API does not expose purls)."""
+    name, version, package_manager, license_id = _fields(comp, _get_check_fields, _CHECK_FIELDS)
+    return {
+        "name": name,
+        "version": version,
+        "purl": None,
+        "ecosystem": _map_ecosystem(package_manager, None),
+        "license": license_id,
+    }
+
+
+def _iter_sbom_pages(query: str, variables: dict, start_page: int, fetch_all: bool, per_page: int):
+    """
+    Yield (collection, metadata) for start_page and, with fetch_all, each following page in order.
+    Once the first page reveals totalPages the remaining pages are fetched concurrently.
+    """
+    def _fetch_page(page_num: int):
+        # Pages are fetched from several threads, so each gets a shallow copy rather than
+        # sharing one dict whose page slot is mutated in place
+        data = graphql_request(query, {**variables, "page": page_num}, log_request=True, verbose_only=True)
+        sbom = data["sbomComponents"]
+        return page_num, sbom.get("collection") or [], sbom.get("metadata") or {}
+
+    _, collection, metadata = _fetch_page(start_page)
+    yield collection, metadata
+    if not fetch_all or not collection or len(collection) < per_page:
+        return
+
+    total_pages = metadata.get("totalPages")
+    if total_pages is not None:
+        for _, page_collection, page_metadata in parallel_imap(_fetch_page, range(start_page + 1, total_pages + 1)):
+            if not page_collection:
+                return
+            yield page_collection, page_metadata
+        return
+
+    # Metadata missing: prefetch pages in concurrent windows until an empty/short page
+    def _is_last(result) -> bool:
+        page_num, page_collection, page_metadata = result
+        last_page = page_metadata.get("totalPages")
+        return len(page_collection) < per_page or (last_page is not None and page_num >= last_page)
+
+    for _, page_collection, page_metadata in prefetch_pages(_fetch_page, start_page + 1, _is_last):
+        if page_collection:
+            yield page_collection, page_metadata
 
 
 @app.command("list")
@@ -39,23 +414,6 @@ def list_sbom(
     List SBOM components for a company.
     """
     started_at = time.perf_counter()
-    query = """
-    query SbomComponents($companyId: ID!, $search: SbomComponentSearchInput, $page: Int, $limit: Int) {
-      sbomComponents(companyId: $companyId, search: $search, page: $page, limit: $limit) {
-        collection {
-          id
-          name
-          asset { id name }
-          technology
-          license
-          packageManager
-          version
-          issuesBySeverity
-        }
-        metadata { currentPage limitValue totalCount totalPages }
-      }
-    }
-    """
     search = {}
     if name:
         search["name"] = name
@@ -63,12 +421,12 @@ def list_sbom(
         search["vulnerableOnly"] = True
     if asset_ids:
         try:
-            search["assetIds"] = [int(x.strip()) for x in asset_ids.split(",") if x.strip()]
+            search["assetIds"] = _parse_int_csv(asset_ids)
         except Exception:
             error("Invalid --asset-ids; provide comma-separated integers.")
             raise typer.Exit(code=1)
     if tags:
-        search["tags"] = [t.strip() for t in tags.split(",") if t.strip()]
+        search["tags"] = _parse_csv(tags)
     if sort_by:
         search["sortBy"] = sort_by
     if order:
@@ -78,136 +436,40 @@ def list_sbom(
             error(str(exc))
             raise typer.Exit(code=1)
 
+    # Built once; _iter_sbom_pages fills in the page number per request
     variables = {
         "companyId": str(company_id),
         "search": search or None,
-        "page": page,
         "limit": per_page,
     }
 
     try:
-        def _format_issues_by_severity(issues_val):
-            # Accept dict or JSON-like string
-            import json
-            if isinstance(issues_val, str):
-                try:
-                    issues_val = json.loads(issues_val)
-                except Exception:
-                    pass
-            if isinstance(issues_val, dict):
-                order = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "NOTIFICATION"]
-                parts = []
-                # Normalize keys to upper
-                normalized = {}
-                for k, v in issues_val.items():
-                    key_up = str(k).upper()
-                    # If nested dict with count, extract
-                    if isinstance(v, dict) and "count" in v:
-                        normalized[key_up] = v.get("count")
-                    else:
-                        normalized[key_up] = v
-                for sev in order:
-                    if sev in normalized:
-                        try:
-                            val = int(normalized.get(sev))
-                        except Exception:
-                            val = normalized.get(sev)
-                        # show only severities with count > 0 to keep compact; show zeros if all zero
-                        if val not in (None, "", 0):
-                            parts.append(f"{sev}:{val}")
-                if not parts and normalized:
-                    # If all zeros, show explicit zeros
-                    for sev in order:
-                        if sev in normalized:
-                            parts.append(f"{sev}:{normalized.get(sev)}")
-                # include any unexpected keys
-                for k, v in normalized.items():
-                    if k not in order:
-                        parts.append(f"{k}:{v}")
-                return ", ".join(parts) if parts else "-"
-            return str(issues_val) if issues_val not in (None, "", {}) else "-"
-
-        fetch_all = all_pages
-        current_page = page
         rows = []
         total_count = 0
         total_pages = None
 
-        while True:
-            variables["page"] = current_page
-            data = graphql_request(query, variables, log_request=True, verbose_only=True)
-            sbom = data["sbomComponents"]
-            collection = sbom.get("collection") or []
-            metadata = sbom.get("metadata") or {}
-            total_pages = metadata.get("totalPages")
-            total_count = metadata.get("totalCount", total_count)
-
-            if not collection:
-                if current_page == page:
+        for page_num, (collection, metadata) in enumerate(_iter_sbom_pages(_SBOM_LIST_QUERY, variables, page, all_pages, per_page)):
+            if page_num == 0:
+                total_pages = metadata.get("totalPages")
+                total_count = metadata.get("totalCount", total_count)
+                if not collection:
                     typer.echo("⚠️  No SBOM components found.")
                     raise typer.Exit()
-                break
-
-            for comp in collection:
-                issues = comp.get("issuesBySeverity") or {}
-                issues_str = _format_issues_by_severity(issues)
-                asset = comp.get("asset") or {}
-                rows.append({
-                    "id": comp.get("id"),
-                    "name": comp.get("name"),
-                    "version": comp.get("version"),
-                    "technology": comp.get("technology"),
-                    "license": comp.get("license"),
-                    "packageManager": comp.get("packageManager"),
-                    "issuesBySeverity": issues_str,
-                    "asset": asset.get("name"),
-                    "assetId": asset.get("id"),
-                })
-
-            if not fetch_all:
-                break
-            if total_pages is not None and current_page >= total_pages:
-                break
-            if len(collection) < per_page:
-                break
-            current_page += 1
+
+            rows.extend(map(_sbom_row, collection))
 
         fmt_lower = fmt.lower()
         if fmt_lower == "cyclonedx":
-            bom = {
+            header = {
                 "bomFormat": "CycloneDX",
                 "specVersion": "1.5",
                 "version": 1,
-                "serialNumber": f"urn:uuid:{uuid.uuid4()}",
-                "components": [],
+                "serialNumber": _new_serial_number(),
             }
-            for r in rows:
-                comp = {
-                    "type": "application",
-                    "name": r.get("name") or "unknown",
-                    "version": r.get("version") or "unknown",
-                }
-                if r.get("license"):
-                    comp["licenses"] = [{"license": {"id": r["license"]}}]
-                props = []
-                if r.get("packageManager"):
-                    props.append({"name": "packageManager", "value": r["packageManager"]})
-                if r.get("asset"):
-                    props.append({"name": "asset", "value": str(r["asset"])})
-                if r.get("assetId"):
-                    props.append({"name": "assetId", "value": str(r["assetId"])})
-                if r.get("issuesBySeverity"):
-                    props.append({"name": "vulnsBySeverity", "value": r["issuesBySeverity"]})
-                if props:
-                    comp["properties"] = props
-                bom["components"].append(comp)
-            payload = json.dumps(bom, indent=2)
+            # Components are built and encoded one at a time while writing
+            _write_chunks(_iter_cyclonedx_chunks(header, map(_cyclonedx_component, rows)), output)
             if output:
-                with open(output, "w", encoding="utf-8") as f:
-                    f.write(payload)
                 summary(f"CycloneDX exported to {output}")
-            else:
-                print(payload)
             elapsed = time.perf_counter() - started_at
             timed_summary(f"{len(rows)} component(s) listed out of {total_count or len(rows)}", elapsed)
         else:
@@ -234,13 +496,6 @@ def import_sbom(
     """
     Import an SBOM file for the given company.
     """
-    mutation = """
-    mutation ImportSbom($input: ImportSbomInput!) {
-      importSbom(input: $input) {
-        __typename
-      }
-    }
-    """
     variables = {
         "input": {
             "companyId": str(company_id),
@@ -250,7 +505,7 @@ def import_sbom(
     }
     try:
         data = graphql_request_upload(
-            mutation,
+            _SBOM_IMPORT_MUTATION,
             variables=variables,
             file_param="input.file",
             file_path=file,
@@ -276,23 +531,7 @@ def _map_ecosystem(package_manager: Optional[str], purl: Optional[str]) -> str:
         except Exception:
             pass
     pm = (package_manager or "").lower()
-    mapping = {
-        "npm": "npm",
-        "yarn": "npm",
-        "pnpm": "npm",
-        "pypi": "PyPI",
-        "pip": "PyPI",
-        "maven": "Maven",
-        "gradle": "Maven",
-        "nuget": "NuGet",
-        "go": "Go",
-        "golang": "Go",
-        "cargo": "crates.io",
-        "rust": "crates.io",
-        "composer": "Packagist",
-        "packagist": "Packagist",
-    }
-    return mapping.get(pm, pm or "UNKNOWN")
+    return _ECOSYSTEM_MAP.get(pm, pm or "UNKNOWN")
 
 
 @app.command("check-vulns", help="Check SBOM components against OSV (online) using list or a local SBOM file.")
@@ -306,6 +545,7 @@ def check_vulns(
     all_pages: bool = typer.Option(True, "--all", help="Fetch all pages when using API source."),
     fmt: str = typer.Option("table", "--format", "-f", help="Output format: table|json (default table)."),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file (json)."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Query OSV for every package, ignoring the local result cache."),
 ):
     """
     If --file is provided, reads components from a CycloneDX JSON file.
@@ -318,10 +558,7 @@ def check_vulns(
     rows = []
     if file:
         try:
-            with open(file, encoding="utf-8") as fh:
-                data = json.load(fh)
-            comps = data.get("components") or []
-            for comp in comps:
+            for comp in _iter_sbom_file_components(file):
                 name = comp.get("name")
                 version = comp.get("version")
                 purl = comp.get("purl")
@@ -341,62 +578,22 @@ def check_vulns(
             raise typer.Exit(code=1)
     else:
         # Fetch via API
-        query = """
-        query SbomComponents($companyId: ID!, $search: SbomComponentSearchInput, $page: Int, $limit: Int) {
-          sbomComponents(companyId: $companyId, search: $search, page: $page, limit: $limit) {
-            collection {
-              name
-              version
-              packageManager
-              license
-            }
-            metadata { currentPage limitValue totalCount totalPages }
-          }
-        }
-        """
         search = {}
         if vulnerable_only:
             search["vulnerableOnly"] = True
         if asset_ids:
             try:
-                search["assetIds"] = [int(x.strip()) for x in asset_ids.split(",") if x.strip()]
+                search["assetIds"] = _parse_int_csv(asset_ids)
             except Exception:
                 error("Invalid --asset-ids; provide comma-separated integers.")
                 raise typer.Exit(code=1)
         if tags:
-            search["tags"] = [t.strip() for t in tags.split(",") if t.strip()]
-        variables = {"companyId": str(company_id), "search": search or None, "page": 1, "limit": per_page}
+            search["tags"] = _parse_csv(tags)
+        variables = {"companyId": str(company_id), "search": search or None, "limit": per_page}
 
         try:
-            fetch_all = all_pages
-            current_page = 1
-            while True:
-                variables["page"] = current_page
-                data = graphql_request(query, variables, log_request=True, verbose_only=True)
-                sbom = data["sbomComponents"]
-                collection = sbom.get("collection") or []
-                metadata = sbom.get("metadata") or {}
-                total_pages = metadata.get("totalPages")
-                if not collection:
-                    break
-                for comp in collection:
-                    pm = comp.get("packageManager")
-                    purl = None  # API não expõe purl; fallback only
-                    ecosystem = _map_ecosystem(pm, purl)
-                    rows.append({
-                        "name": comp.get("name"),
-                        "version": comp.get("version"),
-                        "purl": purl,
-                        "ecosystem": ecosystem,
-                        "license": comp.get("license"),
-                    })
-                if not fetch_all:
-                    break
-                if total_pages is not None and current_page >= total_pages:
-                    break
-                if len(collection) < per_page:
-                    break
-                current_page += 1
+            for collection, _ in _iter_sbom_pages(_SBOM_CHECK_QUERY, variables, 1, all_pages, per_page):
+                rows.extend(map(_check_row, collection))
         except Exception as exc:
             error(f"Error fetching SBOM: {exc}")
             raise typer.Exit(code=1)
@@ -405,51 +602,77 @@ def check_vulns(
         info("No components to check.")
         raise typer.Exit()
 
-    # Build OSV batch queries
-    queries = []
-    for comp in rows:
-        name = comp.get("purl") or comp.get("name")
-        version = comp.get("version") or ""
-        ecosystem = comp.get("ecosystem") or ""
-        pkg = {}
-        if comp.get("purl"):
-            pkg["purl"] = comp["purl"]
-        if ecosystem and ecosystem.upper() != "UNKNOWN":
-            pkg["ecosystem"] = ecosystem
-            pkg["name"] = comp.get("name")
-        else:
-            pkg["name"] = comp.get("name")
-        queries.append({"package": pkg, "version": version})
+    # Build OSV batch queries, one per distinct package; rows sharing a package reuse its result
+    query_index = {}
+    row_queries = [query_index.setdefault(key, len(query_index)) for key in map(_osv_key, rows)]
+    queries = [_osv_query(*key) for key in query_index]
 
-    try:
-        resp = requests.post(
-            "https://api.osv.dev/v1/querybatch",
-            json={"queries": queries},
+    session = _osv_session()
+
+    def _post_chunk(chunk):
+        resp = session.post(
+            OSV_QUERYBATCH_URL,
+            data=jsonutil.dumps({"queries": chunk}),
+            headers={"Content-Type": "application/json"},
             timeout=30,
         )
         resp.raise_for_status()
-        data = resp.json()
+        results = jsonutil.loads(resp.content).get("results") or []
+        # Keep results aligned with queries even if a chunk comes back short
+        return results + [None] * (len(chunk) - len(results))
+
+    results = [None] * len(queries)
+    cache = None if no_cache else _open_osv_cache()
+    cache_keys = [_osv_cache_key(q) for q in queries]
+    if cache is not None:
+        try:
+            cached = _osv_cache_lookup(cache, cache_keys)
+        except Exception:
+            cached = {}
+        for idx, key in enumerate(cache_keys):
+            results[idx] = cached.get(key)
+    to_fetch = [idx for idx, res in enumerate(results) if res is None]
+
+    # Smaller batches bound request size and overlap round-trips on the pooled session
+    pending = [queries[idx] for idx in to_fetch]
+    chunks = [pending[i:i + OSV_BATCH_SIZE] for i in range(0, len(pending), OSV_BATCH_SIZE)]
+    try:
+        fetched = [res for chunk_results in parallel_map(_post_chunk, chunks) for res in chunk_results]
     except Exception as exc:
         error(f"OSV query failed: {exc}")
         raise typer.Exit(code=1)
+    for idx, res in zip(to_fetch, fetched):
+        results[idx] = res
+
+    if cache is not None:
+        try:
+            _osv_cache_store(cache, [(cache_keys[idx], res) for idx, res in zip(to_fetch, fetched) if res is not None])
+        except Exception:
+            pass  # the cache is best-effort; a read-only or locked file must not fail the check
+        finally:
+            cache.close()
 
-    results = data.get("results") or []
-    out_rows = []
-    for comp, res in zip(rows, results):
-        vulns = res.get("vulns") or []
-        vuln_ids = [v.get("id") for v in vulns if v.get("id")]
-        out_rows.append({
-            "name": comp.get("name"),
-            "version": comp.get("version"),
-            "ecosystem": comp.get("ecosystem"),
-            "purl": comp.get("purl"),
-            "vulnCount": len(vuln_ids),
-            "vulnIds": ", ".join(vuln_ids),
-        })
+    # Summarize each distinct package's vulnerabilities once, then fan the summary out to its rows
+    vuln_ids_by_query = [
+        [v["id"] for v in (res or _EMPTY).get("vulns") or () if v.get("id")]
+        for res in results
+    ]
+    summaries = [(len(ids), ", ".join(ids)) for ids in vuln_ids_by_query]
+    out_rows = [
+        {
+            "name": name,
+            "version": version,
+            "ecosystem": ecosystem,
+            "purl": purl,
+            "vulnCount": summaries[idx][0],
+            "vulnIds": summaries[idx][1],
+        }
+        for (purl, ecosystem, name, version), idx in zip(map(_osv_key, rows), row_queries)
+    ]
 
     fmt_lower = fmt.lower()
     if fmt_lower == "json":
-        payload = json.dumps(out_rows, indent=2)
+        payload = jsonutil.dumps(out_rows, indent=True).decode("utf-8")
         if output:
             with open(output, "w", encoding="utf-8") as f:
                 f.write(payload)
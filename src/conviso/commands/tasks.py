@@ -12,16 +12,22 @@ import html as html_lib
 import hashlib
 import os
 import re
+import shlex
+import shutil
 import subprocess
+import tempfile
 import time
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 import typer
 
 from conviso.clients.client_graphql import graphql_request
-from conviso.core.concurrency import parallel_map
+from conviso.core.concurrency import parallel_imap, parallel_map, resolve_workers
+from conviso.core import jsonutil
 from conviso.core.notifier import error, info, summary, warning, success, timed_summary
 
 try:
@@ -29,6 +35,14 @@ try:
 except Exception:  # pragma: no cover - optional runtime dependency
     yaml = None
 
+# libyaml-backed loader when PyYAML was built with it; same safe tag set as yaml.safe_load
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
+try:
+    from lxml import etree as lxml_etree
+except Exception:  # pragma: no cover - optional speedup; stdlib ElementTree is used otherwise
+    lxml_etree = None
+
 app = typer.Typer(help="Execute YAML tasks defined in requirement activities.")
 approvals_app = typer.Typer(help="Manage approved task commands.")
 app.add_typer(approvals_app, name="approvals")
@@ -37,32 +51,303 @@ TASK_PREFIX_DEFAULT = "TASK"
 _ASSET_LOOKUP_WARNED = False
 APPROVALS_DIR = os.path.join(os.path.expanduser("~"), ".config", "conviso")
 APPROVALS_FILE = os.path.join(APPROVALS_DIR, "approved_tasks.json")
+_APPROVALS_CACHE: Optional[Tuple[Tuple[int, int], Dict[str, Dict[str, Any]]]] = None
+# Shared fallback for read-only `(d.get(k) or _EMPTY).get(...)` chains; never mutate it
+_EMPTY: Dict[str, Any] = {}
+
+# Patterns used while cleaning activity descriptions and normalizing YAML/asset keys
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_BLOCK_TAG_RE = re.compile(r"</?(div|p|li|tr|h\d)(\s+[^>]*)?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_BLANK_LINES_RE = re.compile(r"\n{2,}")
+_STEPS_HEADER_RE = re.compile(r"^\s*steps\s*:\s*$")
+_NON_SPACE_START_RE = re.compile(r"^\S")
+_URL_SCHEME_RE = re.compile(r"^https?://", re.IGNORECASE)
+# http(s)://host[:port] or scheme-less host[:port], followed by a path/query/fragment or the
+# end; any other scheme or shape goes through urlsplit
+_PLAIN_TARGET_HOST_RE = re.compile(
+    r"(?:https?://|(?!.*://))([\w.-]+)(?::\d*)?(?=[/?#]|\Z)",
+    re.ASCII | re.IGNORECASE | re.DOTALL,
+)
+# Characters that need /bin/sh (pipes, redirects, expansions, globs, comments, escapes)
+_SHELL_SYNTAX_RE = re.compile(r"[|&;<>()$`\\*?\[\]{}~!#\n]")
+# Set to 1/true to always run task commands through /bin/sh
+TASK_SHELL_ENV = "CONVISO_TASKS_USE_SHELL"
+# nmap XML is fed to the pull parser in slices so finished hosts can be freed early
+NMAP_XML_CHUNK_SIZE = 64 * 1024
+# Read buffer for scanner output files parsed from parse.source=file
+PARSE_READ_BUFFER_SIZE = 64 * 1024
+# Write buffer for the asset/target lists exported to files for task commands
+EXPORT_WRITE_BUFFER_SIZE = 64 * 1024
+
+
+# ---------------------------------------------------------------------------
+# GraphQL queries
+# ---------------------------------------------------------------------------
+
+_PROJECT_PLAYBOOKS_QUERY = """
+query Project($id: ID!, $companyId: ID!) {
+  project(id: $id, companyId: $companyId) {
+    id
+    playbooks { id }
+  }
+}
+"""
 
+_UPDATE_PROJECT_PLAYBOOKS_MUTATION = """
+mutation UpdateProject($input: UpdateProjectInput!) {
+  updateProject(input: $input) {
+    project { id label }
+  }
+}
+"""
 
-def _load_approved_commands() -> Dict[str, Dict[str, Any]]:
+_ASSETS_QUERY = """
+query Assets($companyId: ID!, $limit: Int, $page: Int, $search: AssetsSearch) {
+  assets(companyId: $companyId, limit: $limit, page: $page, search: $search) {
+    collection { id name }
+    metadata { totalPages }
+  }
+}
+"""
+
+_PROJECT_ASSETS_QUERY = """
+query ProjectAssets($id: ID!, $companyId: ID!) {
+  project(id: $id, companyId: $companyId) {
+    id
+    assets { id name }
+  }
+}
+"""
+
+_PROJECT_ASSETS_NO_COMPANY_QUERY = """
+query ProjectAssets($id: ID!) {
+  project(id: $id) {
+    id
+    assets { id name }
+  }
+}
+"""
+
+_PROJECT_SCOPE_URLS_QUERY = """
+query ProjectTargets($id: ID!) {
+  project(id: $id) {
+    id
+    projectScopeUrls { url }
+  }
+}
+"""
+
+# Fallbacks for projects without projectScopeUrls, tried in order
+_PROJECT_TARGET_FIELD_QUERIES = {
+    field: f"""
+query ProjectTargets($id: ID!) {{
+  project(id: $id) {{
+    id
+    {field}
+  }}
+}}
+"""
+    for field in ("targetUrls", "targetHosts", "targetUrlsOrHosts")
+}
+
+_CREATE_ASSET_MUTATION = """
+mutation CreateAsset($input: CreateAssetInput!) {
+  createAsset(input: $input) { asset { id name } }
+}
+"""
+
+_UPDATE_ASSET_MUTATION = """
+mutation UpdateAsset($input: UpdateAssetInput!) {
+  updateAsset(input: $input) { asset { id name } }
+}
+"""
+
+_CREATE_DAST_MUTATION = """
+mutation CreateDast($input: CreateDastFindingInput!) {
+  createDastFinding(input: $input) { issue { id title } }
+}
+"""
+
+_CREATE_WEB_MUTATION = """
+mutation CreateWeb($input: CreateWebVulnerabilityInput!) {
+  createWebVulnerability(input: $input) { issue { id title } }
+}
+"""
+
+_CREATE_NETWORK_MUTATION = """
+mutation CreateNetwork($input: CreateNetworkVulnerabilityInput!) {
+  createNetworkVulnerability(input: $input) { issue { id title } }
+}
+"""
+
+_CREATE_SOURCE_MUTATION = """
+mutation CreateSource($input: CreateSourceCodeVulnerabilityInput!) {
+  createSourceCodeVulnerability(input: $input) { issue { id title } }
+}
+"""
+
+_CREATE_OR_UPDATE_REQUIREMENT_MUTATION = """
+mutation CreateOrUpdateRequirement($input: RequirementInput!) {
+  createOrUpdateRequirement(input: $input) {
+    requirement { id label }
+  }
+}
+"""
+
+_REQUIREMENT_QUERY = """
+query Requirement($companyId: ID!, $id: ID!) {
+  requirement(companyId: $companyId, id: $id) {
+    id
+    label
+    description
+    global
+    check {
+      id
+      label
+      description
+      reference
+      item
+      category
+      actionPlan
+      sort
+    }
+  }
+}
+"""
+
+_PROJECT_REQUIREMENTS_QUERY = """
+query ProjectRequirements($id: ID!) {
+  project(id: $id) {
+    id
+    label
+    projectRequirements {
+      id
+      label
+      activities { id title description }
+    }
+  }
+}
+"""
+
+
+def _command_argv(cmd: str) -> Optional[List[str]]:
+    """
+    Return argv for commands that use no shell syntax, or None when /bin/sh is needed.
+    Exec'ing directly lets CPython spawn via vfork/posix_spawn without an extra shell process.
+    """
+    if os.name != "posix" or os.getenv(TASK_SHELL_ENV, "").lower() in {"1", "true", "yes", "y"}:
+        return None
+    if _SHELL_SYNTAX_RE.search(cmd):
+        return None
+    try:
+        argv = shlex.split(cmd)
+    except ValueError:
+        return None
+    # Shell builtins, VAR=value prefixes and missing programs keep the shell's behavior
+    if not argv or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
+
+def _read_all(stream: Iterable[str]) -> str:
+    return "".join(stream)
+
+
+def _run_command(cmd: str, consume: Callable[[Iterable[str]], Any] = _read_all) -> Tuple[int, str, Any]:
+    """
+    Run a step command, handing its stdout to consume() while the process is still running.
+    Returns (returncode, stderr, consume's result). stderr is spooled to a temp file so a
+    chatty scanner cannot fill its pipe and stall while stdout is being read.
+    If consume() fails (e.g. truncated XML from a crashed scanner), the error is raised only
+    when the command succeeded; otherwise the caller reports the failed command instead.
+    """
+    argv = _command_argv(cmd)
+    consume_error: Optional[Exception] = None
+    output = None
+    with tempfile.TemporaryFile() as err:
+        with subprocess.Popen(
+            argv if argv is not None else cmd,
+            shell=argv is None,
+            stdout=subprocess.PIPE,
+            stderr=err,
+            text=True,
+        ) as proc:
+            try:
+                output = consume(proc.stdout)
+            except Exception as exc:
+                consume_error = exc
+            # Drain whatever consume() left so the command is not killed by SIGPIPE
+            for _ in proc.stdout:
+                pass
+            returncode = proc.wait()
+        err.seek(0)
+        stderr = err.read().decode(errors="replace")
+    if consume_error is not None and returncode == 0:
+        raise consume_error
+    return returncode, stderr, output
+
+
+def _approvals_file_stamp() -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(APPROVALS_FILE)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cached_approvals() -> Dict[str, Dict[str, Any]]:
+    """Return the parsed approvals file, re-read only when its mtime/size change; never mutate it."""
+    global _APPROVALS_CACHE
+    stamp = _approvals_file_stamp()
+    if stamp is None:
+        _APPROVALS_CACHE = None
+        return _EMPTY
+    if _APPROVALS_CACHE is not None and _APPROVALS_CACHE[0] == stamp:
+        return _APPROVALS_CACHE[1]
     try:
         with open(APPROVALS_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
         if isinstance(data, dict):
+            _APPROVALS_CACHE = (stamp, data)
             return data
     except Exception:
         pass
-    return {}
+    return _EMPTY
+
+
+def _load_approved_commands() -> Dict[str, Dict[str, Any]]:
+    # Callers get a copy they may mutate
+    return dict(_cached_approvals())
 
 
 def _save_approved_commands(data: Dict[str, Dict[str, Any]]):
+    global _APPROVALS_CACHE
     os.makedirs(APPROVALS_DIR, exist_ok=True)
-    with open(APPROVALS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, sort_keys=True)
+    encoded = jsonutil.dumps(data, indent=True, sort_keys=True)
+    # Write-then-rename: a reader that stats the file mid-save still sees the old, complete
+    # contents, so every (mtime, size) stamp the cache keys on belongs to a whole file
+    fd, tmp_path = tempfile.mkstemp(dir=APPROVALS_DIR, prefix=".approved_tasks-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(encoded)
+        os.replace(tmp_path, APPROVALS_FILE)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    stamp = _approvals_file_stamp()
+    _APPROVALS_CACHE = (stamp, dict(data)) if stamp is not None else None
 
 
+@lru_cache(maxsize=1024)
 def _command_key(cmd: str) -> str:
-    return hashlib.sha256(cmd.encode("utf-8")).hexdigest()
+    # Local lookup key, not a security boundary; keep SHA-256 so existing approvals files stay valid
+    return hashlib.sha256(cmd.encode("utf-8"), usedforsecurity=False).hexdigest()
 
 
 def _is_command_approved(cmd: str) -> bool:
-    approvals = _load_approved_commands()
-    return _command_key(cmd) in approvals
+    # Membership test on the cached dict; no per-step copy of every approval
+    return _command_key(cmd) in _cached_approvals()
 
 
 def _approve_command(cmd: str):
@@ -94,9 +379,11 @@ def list_approvals():
 @approvals_app.command("clear")
 def clear_approvals():
     """Clear locally approved task commands."""
+    global _APPROVALS_CACHE
     if os.path.exists(APPROVALS_FILE):
         try:
             os.remove(APPROVALS_FILE)
+            _APPROVALS_CACHE = None
             info("Approved commands cleared.")
             return
         except Exception as exc:
@@ -130,22 +417,27 @@ def _clean_description(desc: str) -> str:
         return ""
     text = desc
     # Normalize common HTML block/line break tags into newlines (handles attributes too)
-    text = re.sub(r"(?i)<br\s*/?>", "\n", text)
-    text = re.sub(r"(?i)</?(div|p|li|tr|h\d)(\s+[^>]*)?>", "\n", text)
+    text = _BR_RE.sub("\n", text)
+    text = _BLOCK_TAG_RE.sub("\n", text)
     # Strip all other tags
-    text = re.sub(r"<[^>]+>", "", text)
+    text = _TAG_RE.sub("", text)
     text = html_lib.unescape(text)
+    # str.replace scans with memchr and returns the same object when there is no NBSP;
+    # str.translate does a table lookup per character and is far slower
     text = text.replace("\u00a0", " ")
     # Collapse multiple blank lines
-    text = re.sub(r"\n{2,}", "\n", text)
+    text = _BLANK_LINES_RE.sub("\n", text)
     return text.strip()
 
 
 def _normalize_yaml_steps(text: str) -> str:
+    # Every header _STEPS_HEADER_RE accepts contains the literal word, so one substring scan rules most text out
+    if "steps" not in text:
+        return text
     lines = text.splitlines()
     step_idx = None
     for i, line in enumerate(lines):
-        if re.match(r"^\s*steps\s*:\s*$", line):
+        if _STEPS_HEADER_RE.match(line):
             step_idx = i
             break
     if step_idx is None:
@@ -156,7 +448,7 @@ def _normalize_yaml_steps(text: str) -> str:
         line = lines[i]
         if not line.strip():
             continue
-        if re.match(r"^\S", line):
+        if _NON_SPACE_START_RE.match(line):
             if line.startswith("- "):
                 lines[i] = "  " + line
             else:
@@ -166,19 +458,30 @@ def _normalize_yaml_steps(text: str) -> str:
         if line.lstrip().startswith("- "):
             if not line.startswith("  "):
                 lines[i] = "  " + line.lstrip()
-        elif re.match(r"^\S", line) and in_steps:
+        elif _NON_SPACE_START_RE.match(line) and in_steps:
             lines[i] = "  " + line
     return "\n".join(lines)
 
 
+def _prefix_matcher(prefix: str) -> Callable[[str], bool]:
+    """Return a label test for `prefix`, trimming and lower-casing the prefix once."""
+    base = prefix.strip().rstrip(":").rstrip("-").strip()
+    size = len(base)
+    base_lower = base.lower()
+
+    def _matches(label: str) -> bool:
+        if not label or not base:
+            return False
+        # The separator after the prefix is optional, so a case-insensitive startswith is the whole test
+        return label.strip()[:size].lower() == base_lower
+
+    return _matches
+
+
 def _matches_prefix(label: str, prefix: str) -> bool:
     if not label:
         return False
-    base = prefix.strip().rstrip(":").rstrip("-").strip()
-    if not base:
-        return False
-    pattern = rf"^{re.escape(base)}(?:\s*[:\-]\s*)?.*"
-    return re.match(pattern, label.strip(), flags=re.IGNORECASE) is not None
+    return _prefix_matcher(prefix)(label)
 
 
 def _build_requirement_label(prefix: str, label: str) -> str:
@@ -191,15 +494,7 @@ def _build_requirement_label(prefix: str, label: str) -> str:
 
 
 def _attach_requirement_to_project(company_id: int, project_id: int, requirement_id: int):
-    fetch_query = """
-    query Project($id: ID!, $companyId: ID!) {
-      project(id: $id, companyId: $companyId) {
-        id
-        playbooks { id }
-      }
-    }
-    """
-    data = graphql_request(fetch_query, {"id": project_id, "companyId": company_id})
+    data = graphql_request(_PROJECT_PLAYBOOKS_QUERY, {"id": project_id, "companyId": company_id})
     project = data.get("project") or {}
     current_playbooks: List[int] = []
     for pb in project.get("playbooks") or []:
@@ -216,53 +511,61 @@ def _attach_requirement_to_project(company_id: int, project_id: int, requirement
         return
 
     merged = [*current_playbooks, requirement_id]
-    mutation = """
-    mutation UpdateProject($input: UpdateProjectInput!) {
-      updateProject(input: $input) {
-        project { id label }
-      }
-    }
-    """
-    graphql_request(mutation, {"input": {"id": project_id, "companyId": company_id, "playbooksIds": merged}})
+    graphql_request(_UPDATE_PROJECT_PLAYBOOKS_MUTATION, {"input": {"id": project_id, "companyId": company_id, "playbooksIds": merged}})
     success(f"Requirement {requirement_id} attached to project {project_id}.")
 
 
+# Requirement activity fields accepted by createOrUpdateRequirement's activities input
+_ACTIVITY_INPUT_FIELDS = frozenset({"id", "label", "description", "reference", "item", "category", "actionPlan"})
+
+
 def _normalize_activity_for_input(activity: Dict[str, Any]) -> Dict[str, Any]:
-    allowed = {"id", "label", "description", "reference", "item", "category", "actionPlan"}
-    return {k: v for k, v in activity.items() if k in allowed and v is not None}
+    return {k: v for k, v in activity.items() if k in _ACTIVITY_INPUT_FIELDS and v is not None}
 
 
-def _validate_task_yaml(desc: str) -> Dict[str, Any]:
+def _yaml_load(text: str) -> Any:
+    return yaml.load(text, Loader=_YAML_LOADER)
+
+
+@lru_cache(maxsize=256)
+def _parse_task_desc(desc: str) -> Tuple[str, Any, Optional[str]]:
+    """
+    Clean and parse an activity description, returning (cleaned, data, load_error).
+    Templated tasks repeat the same description across activities, so each text is parsed once
+    per process; callers must treat `data` as read-only.
+    """
     cleaned = _clean_description(desc)
     if not cleaned:
-        return {"ok": False, "reason": "empty_description"}
+        return cleaned, None, None
+    load_error = None
     try:
-        data = yaml.safe_load(cleaned)
-    except Exception:
-        data = None
-    if not isinstance(data, dict):
-        normalized = _normalize_yaml_steps(cleaned)
-        if normalized != cleaned:
-            try:
-                data = yaml.safe_load(normalized)
-            except Exception:
-                data = None
-        if not isinstance(data, dict):
-            return {"ok": False, "reason": "invalid_yaml"}
+        data = _yaml_load(cleaned)
+    except Exception as exc:
+        data, load_error = None, str(exc)
+    if isinstance(data, dict) and isinstance(data.get("steps"), list):
+        return cleaned, data, load_error
+    # The step-indent fix is tried at most once and kept only when it yields a mapping
+    normalized = _normalize_yaml_steps(cleaned)
+    if normalized != cleaned:
+        try:
+            reparsed = _yaml_load(normalized)
+        except Exception as exc:
+            reparsed = None
+            load_error = load_error or str(exc)
+        if isinstance(reparsed, dict):
+            return cleaned, reparsed, None
+    return cleaned, data, load_error
+
+
+def _validate_task_yaml(desc: str) -> Dict[str, Any]:
+    cleaned, data, _ = _parse_task_desc(desc)
+    if not cleaned:
+        return {"ok": False, "reason": "empty_description"}
     if not isinstance(data, dict):
-        return {"ok": False, "reason": "not_a_mapping"}
+        return {"ok": False, "reason": "invalid_yaml"}
     steps = data.get("steps")
     if not isinstance(steps, list):
-        normalized = _normalize_yaml_steps(cleaned)
-        if normalized != cleaned:
-            try:
-                data = yaml.safe_load(normalized)
-            except Exception:
-                data = None
-            if isinstance(data, dict):
-                steps = data.get("steps")
-        if not isinstance(steps, list):
-            return {"ok": False, "reason": "missing_steps"}
+        return {"ok": False, "reason": "missing_steps"}
     if len(steps) != 1:
         return {"ok": False, "reason": f"steps={len(steps)}"}
     return {
@@ -273,8 +576,13 @@ def _validate_task_yaml(desc: str) -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=1024)
+def _path_parts(path: str) -> tuple:
+    return tuple(path.split("."))
+
+
 def _get_path_value(path: str, record: Dict[str, Any], context: Dict[str, Any]) -> Optional[Any]:
-    def _walk(obj: Any, parts: List[str]) -> Optional[Any]:
+    def _walk(obj: Any, parts: tuple) -> Optional[Any]:
         cur = obj
         for p in parts:
             if isinstance(cur, dict) and p in cur:
@@ -283,79 +591,197 @@ def _get_path_value(path: str, record: Dict[str, Any], context: Dict[str, Any])
                 return None
         return cur
 
-    parts = path.split(".")
+    parts = _path_parts(path)
     val = _walk(record, parts)
     if val is not None:
         return val
     return _walk(context, parts)
 
 
+@lru_cache(maxsize=4096)
+def _normalize_asset_text(text: str) -> str:
+    s = _URL_SCHEME_RE.sub("", text.strip())
+    return s.split("/", 1)[0]
+
+
 def _normalize_asset_key(value: Any) -> str:
     if value is None:
         return ""
-    s = str(value).strip()
-    s = re.sub(r"^https?://", "", s, flags=re.IGNORECASE)
-    s = s.split("/", 1)[0]
-    return s
+    return _normalize_asset_text(str(value))
+
+
+# Sentinel for by_name probes, where a cached id may legitimately be falsy
+_MISSING = object()
+
+
+def _cached_asset_id(assets_by_name: Dict[str, Any], raw_name: str) -> Any:
+    """Return the id cached under the raw or normalized name, or _MISSING."""
+    found = assets_by_name.get(raw_name, _MISSING)
+    if found is _MISSING:
+        found = assets_by_name.get(_normalize_asset_key(raw_name), _MISSING)
+    return found
 
 
 _TEMPLATE_RE = re.compile(r"\$\{([^}]+)\}")
 
 
-def _render_string(value: str, record: Dict[str, Any], context: Dict[str, Any]) -> str:
-    def _replace(match: re.Match) -> str:
+_BY_NAME_PREFIX = "assets.by_name:"
+
+
+@lru_cache(maxsize=1024)
+def _compile_template(value: str) -> Tuple[Tuple[Tuple[str, str, Optional[str]], ...], str]:
+    """
+    Split a template once into (literal, key, by_name_field) triples plus the trailing literal.
+    by_name_field is the record path of an ${assets.by_name:<path>} lookup, None for plain keys.
+    """
+    pairs = []
+    pos = 0
+    for match in _TEMPLATE_RE.finditer(value):
         key = match.group(1).strip()
-        if key.startswith("assets.by_name:"):
-            field = key.split(":", 1)[1]
-            lookup_key = _get_path_value(field, record, context)
-            if lookup_key is None:
-                return ""
-            assets_by_name = (context.get("assets") or {}).get("by_name") or {}
-            normalized = _normalize_asset_key(lookup_key)
-            found = assets_by_name.get(str(lookup_key), assets_by_name.get(normalized, ""))
-            return str(found) if found is not None else ""
-        val = _get_path_value(key, record, context)
-        return "" if val is None else str(val)
-
-    return _TEMPLATE_RE.sub(_replace, value)
-
-
-def _render_value(value: Any, record: Dict[str, Any], context: Dict[str, Any]) -> Any:
+        field = key[len(_BY_NAME_PREFIX):] if key.startswith(_BY_NAME_PREFIX) else None
+        pairs.append((value[pos:match.start()], key, field))
+        pos = match.end()
+    return tuple(pairs), value[pos:]
+
+
+def _resolve_template_key(key: str, by_name_field: Optional[str], record: Dict[str, Any], context: Dict[str, Any]) -> str:
+    if by_name_field is not None:
+        lookup_key = _get_path_value(by_name_field, record, context)
+        if lookup_key is None:
+            return ""
+        # by_name already holds raw and normalized names; only normalize on a raw miss
+        assets_by_name = (context.get("assets") or _EMPTY).get("by_name") or _EMPTY
+        found = _cached_asset_id(assets_by_name, str(lookup_key))
+        if found is _MISSING or found is None:
+            return ""
+        return str(found)
+    val = _get_path_value(key, record, context)
+    return "" if val is None else str(val)
+
+
+def _render_string(
+    value: str,
+    record: Dict[str, Any],
+    context: Dict[str, Any],
+    cache: Optional[Dict[str, str]] = None,
+) -> str:
+    """Substitute ${path} placeholders; `cache` memoizes resolved keys for one record/context pair."""
+    if "${" not in value:
+        return value
+
+    pairs, tail = _compile_template(value)
+    parts: List[str] = []
+    for literal, key, by_name_field in pairs:
+        if cache is None:
+            resolved = _resolve_template_key(key, by_name_field, record, context)
+        else:
+            resolved = cache.get(key)
+            if resolved is None:
+                resolved = cache[key] = _resolve_template_key(key, by_name_field, record, context)
+        parts.append(literal)
+        parts.append(resolved)
+    parts.append(tail)
+    return "".join(parts)
+
+
+def _render_value(
+    value: Any,
+    record: Dict[str, Any],
+    context: Dict[str, Any],
+    cache: Optional[Dict[str, str]] = None,
+) -> Any:
     if isinstance(value, str):
-        return _render_string(value, record, context)
+        return _render_string(value, record, context, cache)
     if isinstance(value, list):
-        return [_render_value(v, record, context) for v in value]
+        return [_render_value(v, record, context, cache) for v in value]
     if isinstance(value, dict):
-        return {k: _render_value(v, record, context) for k, v in value.items()}
+        return {k: _render_value(v, record, context, cache) for k, v in value.items()}
     return value
 
 
-def _parse_nmap_xml(xml_text: str) -> List[Dict[str, Any]]:
+def _nmap_host_record(host) -> Optional[Dict[str, Any]]:
+    status = host.find("status")
+    if status is not None and status.get("state") != "up":
+        return None
+    address = None
+    first_addr = None
+    for addr in host.iterfind("address"):
+        if first_addr is None:
+            first_addr = addr
+        if addr.get("addrtype") in ("ipv4", "ipv6"):
+            address = addr.get("addr")
+            break
+    if address is None and first_addr is not None:
+        address = first_addr.get("addr")
+    hostname = None
+    h = host.find("hostnames/hostname")
+    if h is not None:
+        hostname = h.get("name")
+    return {
+        "host": {
+            "address": address,
+            "hostname": hostname,
+        }
+    }
+
+
+def _xml_chunks(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Yield pieces of XML text: NMAP_XML_CHUNK_SIZE slices of a string or of a stream such as
+    a pipe, or the items of any other iterable (e.g. lines read from a file).
+    """
+    if isinstance(source, str):
+        for offset in range(0, len(source), NMAP_XML_CHUNK_SIZE):
+            yield source[offset:offset + NMAP_XML_CHUNK_SIZE]
+        return
+    read = getattr(source, "read", None)
+    if read is None:
+        yield from source
+        return
+    yield from iter(lambda: read(NMAP_XML_CHUNK_SIZE), "")
+
+
+def _iter_nmap_hosts(source: Union[str, Iterable[str]]):
+    """Yield <host> elements as they finish parsing, freeing each one after use."""
+    if lxml_etree is not None:
+        # nmap writes UTF-8 XML; lxml parses the encoded bytes incrementally in C
+        parser = lxml_etree.XMLPullParser(events=("end",), tag="host")
+        for chunk in _xml_chunks(source):
+            parser.feed(chunk.encode("utf-8"))
+            for _, host in parser.read_events():
+                yield host
+                host.clear()
+                while host.getprevious() is not None:
+                    del host.getparent()[0]
+        parser.close()
+        return
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    depth = 0
+    for chunk in _xml_chunks(source):
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            # Only direct children of the root, as root.findall("host") did
+            if depth == 1 and elem.tag == "host":
+                yield elem
+                root.remove(elem)
+    parser.close()
+
+
+def _parse_nmap_xml(source: Union[str, Iterable[str]]) -> List[Dict[str, Any]]:
+    """Parse nmap XML from text or a stream; only one <host> subtree is kept in memory at a time."""
     results = []
-    root = ET.fromstring(xml_text)
-    for host in root.findall("host"):
-        status = host.find("status")
-        if status is not None and status.get("state") != "up":
-            continue
-        address = None
-        for addr in host.findall("address"):
-            if addr.get("addrtype") in ("ipv4", "ipv6"):
-                address = addr.get("addr")
-                break
-        if address is None:
-            addr = host.find("address")
-            if addr is not None:
-                address = addr.get("addr")
-        hostname = None
-        h = host.find("hostnames/hostname")
-        if h is not None:
-            hostname = h.get("name")
-        results.append({
-            "host": {
-                "address": address,
-                "hostname": hostname,
-            }
-        })
+    for host in _iter_nmap_hosts(source):
+        record = _nmap_host_record(host)
+        if record is not None:
+            results.append(record)
     return results
 
 
@@ -371,57 +797,102 @@ def _extract_http_method(request: Optional[str]) -> Optional[str]:
     return parts[0].upper()
 
 
-def _infer_scheme_port(url: Optional[str], scheme: Optional[str], port: Optional[Any]) -> Dict[str, Optional[Any]]:
+def _infer_scheme_port(url: Optional[str], scheme: Optional[str], port: Optional[Any]) -> Tuple[Optional[str], Optional[Any]]:
+    """Return (scheme, port), filling whichever is missing from the URL or the scheme's default port."""
     resolved_scheme = (scheme or "").lower() or None
     resolved_port = port
     if url:
         try:
             if "://" in url:
-                parsed = urlparse(url)
+                parsed = urlsplit(url)
                 if not resolved_scheme and parsed.scheme in ("http", "https"):
                     resolved_scheme = parsed.scheme.lower()
                 if resolved_port in (None, "") and parsed.port:
                     resolved_port = parsed.port
             else:
-                parsed = urlparse(f"http://{url}")
+                parsed = urlsplit(f"http://{url}")
                 if resolved_port in (None, "") and parsed.port:
                     resolved_port = parsed.port
         except Exception:
             pass
     if resolved_port in (None, "") and resolved_scheme in ("http", "https"):
         resolved_port = 443 if resolved_scheme == "https" else 80
-    return {"scheme": resolved_scheme, "port": resolved_port}
+    return resolved_scheme, resolved_port
+
+
+# Scanner finding types that map to NETWORK vulnerabilities
+_NETWORK_FINDING_TYPES = frozenset({"dns", "ssl", "tcp", "udp", "network"})
+# CreateDastFindingInput does not accept status/companyId on some backends
+_DAST_UNSUPPORTED_KEYS = frozenset({"status", "companyId"})
+# Fields shared by every vulns.create input, and the ones each type requires
+_COMMON_VULN_FIELDS = (
+    "assetId", "title", "description", "solution", "impactLevel", "probabilityLevel",
+    "severity", "status", "category", "projectId", "companyId",
+)
+_DAST_REQUIRED = ("assetId", "title", "description", "solution", "impactLevel", "probabilityLevel", "severity",
+                  "method", "scheme", "url", "port", "request", "response")
+_WEB_REQUIRED = ("assetId", "title", "description", "severity",
+                 "method", "scheme", "url", "port", "request", "response")
+_NETWORK_REQUIRED = ("assetId", "title", "description", "solution", "impactLevel", "probabilityLevel", "severity",
+                     "address", "protocol", "port", "attackVector")
+# NETWORK fields checked before a finding is queued; the rest are filled by _fill_issue_defaults
+_NETWORK_PLAN_REQUIRED = ("assetId", "title", "description", "severity", "address", "protocol", "port", "attackVector")
+_SOURCE_REQUIRED = ("assetId", "title", "description", "solution", "impactLevel", "probabilityLevel", "severity",
+                    "fileName", "vulnerableLine", "firstLine", "codeSnippet")
+# Input fields accepted by createAsset/updateAsset when built from task payloads
+_ASSET_CREATE_FIELDS = ("name", "description", "businessImpact", "dataClassification", "assetsTagList", "integrations",
+                        "environmentCompromised", "exploitability")
+_ASSET_UPDATE_FIELDS = ("id", "assetId") + _ASSET_CREATE_FIELDS
+_HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD", "TRACE", "CONNECT"})
+# Scanner severities the API names differently; anything else is sent upper-cased as-is
+_SEVERITY_ALIASES = {"INFO": "NOTIFICATION", "INFORMATIONAL": "NOTIFICATION"}
+
 
 def _classify_vuln_type(payload: Dict[str, Any], record: Dict[str, Any]) -> str:
     explicit = (payload.get("type") or payload.get("vtype") or "").upper()
     if explicit and explicit != "DAST":
         return explicit
-    finding_type = (record.get("finding") or {}).get("type")
+    finding_type = (record.get("finding") or _EMPTY).get("type")
     finding_type = (str(finding_type).lower() if finding_type else "")
-    if finding_type in {"dns", "ssl", "tcp", "udp", "network"}:
+    if finding_type in _NETWORK_FINDING_TYPES:
         return "NETWORK"
-    raw_req = (record.get("raw") or {}).get("request")
+    raw_req = (record.get("raw") or _EMPTY).get("request")
     if isinstance(raw_req, str) and raw_req.lstrip().startswith(";;"):
         return "NETWORK"
     return "WEB"
 
 
-def _parse_nuclei_json_lines(text: str) -> List[Dict[str, Any]]:
+def _text_lines(text: str) -> Iterator[str]:
+    """
+    Yield the "\n"-separated lines of in-memory text one at a time.
+    Unlike splitlines() no list of every line is built; io.StringIO would copy the text into a wider buffer.
+    """
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            if start < len(text):
+                yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _parse_nuclei_json_lines(text: Union[str, Iterable[str]]) -> List[Dict[str, Any]]:
     results = []
-    for line in text.splitlines():
+    lines = _text_lines(text) if isinstance(text, str) else text
+    for line in lines:
         line = line.strip()
         if not line:
             continue
         try:
-            raw = json.loads(line)
+            raw = jsonutil.loads(line)
         except json.JSONDecodeError:
             continue
         info_obj = raw.get("info") or {}
         url = raw.get("url") or raw.get("matched-at")
         method = raw.get("method") or _extract_http_method(raw.get("request"))
-        inferred = _infer_scheme_port(url, raw.get("scheme"), raw.get("port"))
-        scheme = inferred.get("scheme")
-        port = inferred.get("port")
+        scheme, port = _infer_scheme_port(url, raw.get("scheme"), raw.get("port"))
         if url and "://" not in url and scheme in ("http", "https"):
             url = f"{scheme}://{url}"
         remediation = info_obj.get("remediation")
@@ -458,14 +929,15 @@ def _parse_nuclei_json_lines(text: str) -> List[Dict[str, Any]]:
     return results
 
 
-def _parse_scan_json_lines(text: str) -> List[Dict[str, Any]]:
+def _parse_scan_json_lines(text: Union[str, Iterable[str]]) -> List[Dict[str, Any]]:
     results = []
-    for line in text.splitlines():
+    lines = _text_lines(text) if isinstance(text, str) else text
+    for line in lines:
         line = line.strip()
         if not line:
             continue
         try:
-            raw = json.loads(line)
+            raw = jsonutil.loads(line)
         except json.JSONDecodeError:
             continue
         if not isinstance(raw, dict):
@@ -485,35 +957,49 @@ def _parse_scan_json_lines(text: str) -> List[Dict[str, Any]]:
     return results
 
 
-def _read_parse_source(parse_cfg: Dict[str, Any], stdout: str) -> str:
+# parse.format -> parser; each accepts text, a stream, or an iterable of lines
+_PARSERS: Dict[str, Callable[[Union[str, Iterable[str]]], List[Dict[str, Any]]]] = {
+    "nmap-xml": _parse_nmap_xml,
+    "nuclei-json-lines": _parse_nuclei_json_lines,
+    "scan-json-lines": _parse_scan_json_lines,
+}
+
+
+def _parses_stdout(parse_cfg: Dict[str, Any]) -> bool:
+    return (parse_cfg.get("source") or "stdout").lower() == "stdout"
+
+
+def _parse_source_file(parse_cfg: Dict[str, Any]) -> Optional[str]:
+    """Return parse.file when parse.source=file, None for stdout."""
     source = (parse_cfg.get("source") or "stdout").lower()
     if source == "stdout":
-        return stdout
+        return None
     if source == "file":
         file_path = parse_cfg.get("file")
         if not file_path:
             raise ValueError("parse.source=file requires parse.file")
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        return file_path
     raise ValueError(f"Unsupported parse.source: {source}")
 
 
+def _iter_parse_lines(parse_cfg: Dict[str, Any], stdout: str) -> Iterator[str]:
+    """Yield scanner output lines; files are streamed so the whole output is never held as one string."""
+    file_path = _parse_source_file(parse_cfg)
+    if file_path is None:
+        yield from _text_lines(stdout)
+        return
+    with open(file_path, "r", encoding="utf-8", buffering=PARSE_READ_BUFFER_SIZE) as f:
+        yield from f
+
+
 def _fetch_assets(company_id: int, tags: Optional[str] = None) -> List[Dict[str, Any]]:
-    query = """
-    query Assets($companyId: ID!, $limit: Int, $page: Int, $search: AssetsSearch) {
-      assets(companyId: $companyId, limit: $limit, page: $page, search: $search) {
-        collection { id name }
-        metadata { totalPages }
-      }
-    }
-    """
     page = 1
     limit = 50
     all_assets = []
     search = {"tags": [t.strip() for t in tags.split(",") if t.strip()]} if tags else None
 
     def _fetch_page(p: int) -> tuple[int, List[Dict[str, Any]], int]:
-        data = graphql_request(query, {"companyId": company_id, "limit": limit, "page": p, "search": search})
+        data = graphql_request(_ASSETS_QUERY, {"companyId": company_id, "limit": limit, "page": p, "search": search})
         assets_data = data.get("assets") or {}
         collection = assets_data.get("collection") or []
         meta = assets_data.get("metadata") or {}
@@ -531,28 +1017,12 @@ def _fetch_assets(company_id: int, tags: Optional[str] = None) -> List[Dict[str,
 
 
 def _fetch_project_assets(company_id: int, project_id: int) -> List[Dict[str, Any]]:
-    query_with_company = """
-    query ProjectAssets($id: ID!, $companyId: ID!) {
-      project(id: $id, companyId: $companyId) {
-        id
-        assets { id name }
-      }
-    }
-    """
-    query_no_company = """
-    query ProjectAssets($id: ID!) {
-      project(id: $id) {
-        id
-        assets { id name }
-      }
-    }
-    """
     try:
-        data = graphql_request(query_with_company, {"id": project_id, "companyId": company_id}, log_request=False)
+        data = graphql_request(_PROJECT_ASSETS_QUERY, {"id": project_id, "companyId": company_id}, log_request=False)
     except Exception as exc:
         msg = str(exc)
         if "argument 'companyId'" in msg or "argumentNotAccepted" in msg:
-            data = graphql_request(query_no_company, {"id": project_id}, log_request=False)
+            data = graphql_request(_PROJECT_ASSETS_NO_COMPANY_QUERY, {"id": project_id}, log_request=False)
         else:
             raise
     project = data.get("project") or {}
@@ -561,16 +1031,8 @@ def _fetch_project_assets(company_id: int, project_id: int) -> List[Dict[str, An
 
 def _fetch_project_targets(company_id: int, project_id: int) -> List[str]:
     # Primary: projectScopeUrls { url }
-    query_scope_urls = """
-    query ProjectTargets($id: ID!) {
-      project(id: $id) {
-        id
-        projectScopeUrls { url }
-      }
-    }
-    """
     try:
-        data = graphql_request(query_scope_urls, {"id": project_id}, log_request=False)
+        data = graphql_request(_PROJECT_SCOPE_URLS_QUERY, {"id": project_id}, log_request=False)
         project = data.get("project") or {}
         scope_urls = project.get("projectScopeUrls") or []
         targets = []
@@ -585,16 +1047,7 @@ def _fetch_project_targets(company_id: int, project_id: int) -> List[str]:
         pass
 
     # Fallback: try a few likely field names
-    candidates = ["targetUrls", "targetHosts", "targetUrlsOrHosts"]
-    for field in candidates:
-        query = f"""
-        query ProjectTargets($id: ID!) {{
-          project(id: $id) {{
-            id
-            {field}
-          }}
-        }}
-        """
+    for field, query in _PROJECT_TARGET_FIELD_QUERIES.items():
         try:
             data = graphql_request(query, {"id": project_id}, log_request=False)
         except Exception as exc:
@@ -621,6 +1074,72 @@ def _fetch_project_targets(company_id: int, project_id: int) -> List[str]:
     return []
 
 
+def _fetch_project_asset_names(company_id: int, project_id: int) -> List[str]:
+    return [str(a.get("name")) for a in _fetch_project_assets(company_id, project_id) if a.get("name")]
+
+
+def _fetch_step_inputs(
+    company_id: int,
+    project_id: int,
+    inputs: Dict[str, Any],
+    cache: Optional[Dict[Tuple[str, Any], Any]] = None,
+) -> Tuple[Optional[List[Dict[str, Any]]], Optional[List[str]]]:
+    """
+    Resolve a step's inputs.assets and inputs.targets as (assets, targets); None when not requested.
+    The two lookups are independent API calls, so a step that needs both waits for one round-trip.
+    With a cache dict, results are reused by later steps asking for the same assets query or
+    targets source; the caller clears it when a step changes assets.
+    """
+    fetches: Dict[Tuple[str, Any], Callable[[], Any]] = {}
+    if "assets" in inputs:
+        tags = ((inputs.get("assets") or _EMPTY).get("query") or _EMPTY).get("tags")
+        fetches[("assets", tags)] = lambda: _fetch_assets(company_id, tags=tags)
+    if "targets" in inputs:
+        source = ((inputs.get("targets") or _EMPTY).get("source") or "").lower()
+        if source in {"project.assets", "assets"}:
+            fetches[("targets", "assets")] = lambda: _fetch_project_asset_names(company_id, project_id)
+        elif source in {"project.target_urls", "project.targets", "target_urls", "targets"}:
+            fetches[("targets", "target_urls")] = lambda: _fetch_project_targets(company_id, project_id)
+        else:
+            warning("inputs.targets.source must be 'project.assets' or 'project.target_urls'.")
+            fetches[("targets", None)] = list
+    if cache is None:
+        cache = {}
+    missing = [key for key in fetches if key not in cache]
+    cache.update(zip(missing, parallel_map(lambda key: fetches[key](), missing)))
+    results = {kind: cache[(kind, arg)] for kind, arg in fetches}
+    return results.get("assets"), results.get("targets")
+
+
+def _export_lines(file_path: str, values: Iterable[Any]) -> None:
+    """Write one value per line to a step's export file, creating its directory if needed."""
+    try:
+        f = open(file_path, "w", encoding="utf-8", buffering=EXPORT_WRITE_BUFFER_SIZE)
+    except FileNotFoundError:
+        # Only a missing directory costs the makedirs walk; repeated exports go straight to open()
+        dir_path = os.path.dirname(file_path)
+        if not dir_path:
+            raise
+        os.makedirs(dir_path, exist_ok=True)
+        f = open(file_path, "w", encoding="utf-8", buffering=EXPORT_WRITE_BUFFER_SIZE)
+    with f:
+        f.writelines(f"{value}\n" for value in values)
+
+
+def _target_host(target: str) -> Optional[str]:
+    # Plain [http(s)://]host[:port][/...] targets skip urlsplit; same result as parsed.hostname
+    match = _PLAIN_TARGET_HOST_RE.match(target)
+    if match:
+        return match.group(1).lower()
+    if "://" not in target:
+        target = f"http://{target}"
+    try:
+        parsed = urlsplit(target)
+        return parsed.hostname or _normalize_asset_key(target)
+    except Exception:
+        return _normalize_asset_key(target)
+
+
 def _targets_to_hosts(targets: List[str]) -> List[str]:
     hosts = []
     for t in targets:
@@ -629,29 +1148,19 @@ def _targets_to_hosts(targets: List[str]) -> List[str]:
         s = str(t).strip()
         if not s:
             continue
-        if "://" not in s:
-            s = f"http://{s}"
-        try:
-            parsed = urlparse(s)
-            host = parsed.hostname or _normalize_asset_key(s)
-        except Exception:
-            host = _normalize_asset_key(s)
+        host = _target_host(s)
         if host:
             hosts.append(host)
     return hosts
 
+
 def _create_asset(company_id: int, payload: Dict[str, Any], apply: bool) -> Optional[int]:
     if not apply:
         return None
-    mutation = """
-    mutation CreateAsset($input: CreateAssetInput!) {
-      createAsset(input: $input) { asset { id name } }
-    }
-    """
     input_data = dict(payload)
     input_data["companyId"] = int(company_id)
-    data = graphql_request(mutation, {"input": input_data})
-    asset = (data.get("createAsset") or {}).get("asset") or {}
+    data = graphql_request(_CREATE_ASSET_MUTATION, {"input": input_data})
+    asset = (data.get("createAsset") or _EMPTY).get("asset") or _EMPTY
     asset_id = asset.get("id")
     asset_name = asset.get("name")
     if asset_id:
@@ -667,15 +1176,10 @@ def _create_asset(company_id: int, payload: Dict[str, Any], apply: bool) -> Opti
 def _update_asset(company_id: int, payload: Dict[str, Any], apply: bool) -> Optional[int]:
     if not apply:
         return None
-    mutation = """
-    mutation UpdateAsset($input: UpdateAssetInput!) {
-      updateAsset(input: $input) { asset { id name } }
-    }
-    """
     input_data = dict(payload)
     input_data["companyId"] = int(company_id)
-    data = graphql_request(mutation, {"input": input_data})
-    asset = (data.get("updateAsset") or {}).get("asset") or {}
+    data = graphql_request(_UPDATE_ASSET_MUTATION, {"input": input_data})
+    asset = (data.get("updateAsset") or _EMPTY).get("asset") or _EMPTY
     asset_id = asset.get("id")
     asset_name = asset.get("name")
     if asset_id:
@@ -691,31 +1195,33 @@ def _update_asset(company_id: int, payload: Dict[str, Any], apply: bool) -> Opti
 def _find_asset_by_name(company_id: int, name: str) -> Optional[int]:
     if not name:
         return None
-    query = """
-    query Assets($companyId: ID!, $limit: Int, $page: Int, $search: AssetsSearch) {
-      assets(companyId: $companyId, limit: $limit, page: $page, search: $search) {
-        collection { id name }
-        metadata { totalPages }
-      }
-    }
-    """
-    page = 1
     limit = 50
     search = {"name": name}
+
+    def _fetch_page(p: int) -> Dict[str, Any]:
+        data = graphql_request(_ASSETS_QUERY, {"companyId": company_id, "limit": limit, "page": p, "search": search}, log_request=False)
+        return data.get("assets") or {}
+
+    def _match(assets_data: Dict[str, Any]) -> Tuple[bool, Optional[int]]:
+        for a in assets_data.get("collection") or []:
+            if (a.get("name") or "").strip() == name:
+                try:
+                    return True, int(a.get("id"))
+                except Exception:
+                    return True, None
+        return False, None
+
     try:
-        while True:
-            data = graphql_request(query, {"companyId": company_id, "limit": limit, "page": page, "search": search}, log_request=False)
-            assets = (data.get("assets") or {}).get("collection") or []
-            for a in assets:
-                if (a.get("name") or "").strip() == name:
-                    try:
-                        return int(a.get("id"))
-                    except Exception:
-                        return None
-            meta = (data.get("assets") or {}).get("metadata") or {}
-            if page >= (meta.get("totalPages") or 1):
-                break
-            page += 1
+        first = _fetch_page(1)
+        found, asset_id = _match(first)
+        if found:
+            return asset_id
+        total_pages = int((first.get("metadata") or _EMPTY).get("totalPages") or 1)
+        # Remaining pages are fetched concurrently but checked in page order, so the first match still wins
+        for assets_data in parallel_imap(_fetch_page, range(2, total_pages + 1)):
+            found, asset_id = _match(assets_data)
+            if found:
+                return asset_id
     except Exception as exc:
         global _ASSET_LOOKUP_WARNED
         if not _ASSET_LOOKUP_WARNED:
@@ -725,6 +1231,16 @@ def _find_asset_by_name(company_id: int, name: str) -> Optional[int]:
     return None
 
 
+def _non_empty_fields(source: Dict[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
+    """Pick the keys whose value is neither None nor ""; each key is looked up once."""
+    picked = {}
+    for key in keys:
+        value = source.get(key)
+        if value not in (None, ""):
+            picked[key] = value
+    return picked
+
+
 def _create_vulnerability(payload: Dict[str, Any], apply: bool):
     if not apply:
         return
@@ -732,35 +1248,16 @@ def _create_vulnerability(payload: Dict[str, Any], apply: bool):
     if not vtype:
         raise ValueError("vulns.create requires 'type'")
 
-    common = {
-        "assetId": payload.get("assetId"),
-        "title": payload.get("title"),
-        "description": payload.get("description"),
-        "solution": payload.get("solution"),
-        "impactLevel": payload.get("impactLevel"),
-        "probabilityLevel": payload.get("probabilityLevel"),
-        "severity": payload.get("severity"),
-        "status": payload.get("status"),
-        "category": payload.get("category"),
-        "projectId": payload.get("projectId"),
-        "companyId": payload.get("companyId"),
-    }
-    common = {k: v for k, v in common.items() if v not in (None, "")}
+    # Built once per call; branches drop unsupported keys from this local dict in place
+    common = _non_empty_fields(payload, _COMMON_VULN_FIELDS)
 
     if vtype == "DAST":
-        required = ["assetId", "title", "description", "solution", "impactLevel", "probabilityLevel", "severity",
-                    "method", "scheme", "url", "port", "request", "response"]
-        for r in required:
+        for r in _DAST_REQUIRED:
             if payload.get(r) in (None, ""):
                 raise ValueError(f"DAST requires {r}")
-        mutation = """
-        mutation CreateDast($input: CreateDastFindingInput!) {
-          createDastFinding(input: $input) { issue { id title } }
-        }
-        """
-        # CreateDastFindingInput does not accept status/companyId on some backends
-        common = {k: v for k, v in common.items() if k not in {"status", "companyId"}}
-        data = graphql_request(mutation, {"input": {
+        for key in _DAST_UNSUPPORTED_KEYS:
+            common.pop(key, None)
+        data = graphql_request(_CREATE_DAST_MUTATION, {"input": {
             **common,
             "method": str(payload.get("method")).upper(),
             "scheme": str(payload.get("scheme")).upper(),
@@ -771,23 +1268,16 @@ def _create_vulnerability(payload: Dict[str, Any], apply: bool):
             "parameters": payload.get("parameters"),
             "reference": payload.get("reference"),
         }})
-        issue = ((data.get("createDastFinding") or {}).get("issue") or {})
+        issue = ((data.get("createDastFinding") or _EMPTY).get("issue") or _EMPTY)
         success(f"Created DAST vulnerability '{issue.get('title')}' (ID {issue.get('id')})")
         return
 
     if vtype == "WEB":
-        required = ["assetId", "title", "description", "severity",
-                    "method", "scheme", "url", "port", "request", "response"]
-        for r in required:
+        for r in _WEB_REQUIRED:
             if payload.get(r) in (None, ""):
                 raise ValueError(f"WEB requires {r}")
-        mutation = """
-        mutation CreateWeb($input: CreateWebVulnerabilityInput!) {
-          createWebVulnerability(input: $input) { issue { id title } }
-        }
-        """
-        common = {k: v for k, v in common.items() if k != "companyId"}
-        data = graphql_request(mutation, {"input": {
+        common.pop("companyId", None)
+        data = graphql_request(_CREATE_WEB_MUTATION, {"input": {
             **common,
             "method": str(payload.get("method")).upper(),
             "scheme": str(payload.get("scheme")).upper(),
@@ -800,23 +1290,16 @@ def _create_vulnerability(payload: Dict[str, Any], apply: bool):
             "stepsToReproduce": payload.get("stepsToReproduce") or payload.get("description"),
             "parameters": payload.get("parameters"),
         }})
-        issue = ((data.get("createWebVulnerability") or {}).get("issue") or {})
+        issue = ((data.get("createWebVulnerability") or _EMPTY).get("issue") or _EMPTY)
         success(f"Created WEB vulnerability '{issue.get('title')}' (ID {issue.get('id')})")
         return
 
     if vtype == "NETWORK":
-        required = ["assetId", "title", "description", "solution", "impactLevel", "probabilityLevel", "severity",
-                    "address", "protocol", "port", "attackVector"]
-        for r in required:
+        for r in _NETWORK_REQUIRED:
             if payload.get(r) in (None, ""):
                 raise ValueError(f"NETWORK requires {r}")
-        mutation = """
-        mutation CreateNetwork($input: CreateNetworkVulnerabilityInput!) {
-          createNetworkVulnerability(input: $input) { issue { id title } }
-        }
-        """
-        common = {k: v for k, v in common.items() if k != "companyId"}
-        data = graphql_request(mutation, {"input": {
+        common.pop("companyId", None)
+        data = graphql_request(_CREATE_NETWORK_MUTATION, {"input": {
             **common,
             "address": payload.get("address"),
             "protocol": payload.get("protocol"),
@@ -826,22 +1309,15 @@ def _create_vulnerability(payload: Dict[str, Any], apply: bool):
             "impactDescription": payload.get("impactDescription") or payload.get("description"),
             "stepsToReproduce": payload.get("stepsToReproduce") or payload.get("description"),
         }})
-        issue = ((data.get("createNetworkVulnerability") or {}).get("issue") or {})
+        issue = ((data.get("createNetworkVulnerability") or _EMPTY).get("issue") or _EMPTY)
         success(f"Created NETWORK vulnerability '{issue.get('title')}' (ID {issue.get('id')})")
         return
 
     if vtype == "SOURCE":
-        required = ["assetId", "title", "description", "solution", "impactLevel", "probabilityLevel", "severity",
-                    "fileName", "vulnerableLine", "firstLine", "codeSnippet"]
-        for r in required:
+        for r in _SOURCE_REQUIRED:
             if payload.get(r) in (None, ""):
                 raise ValueError(f"SOURCE requires {r}")
-        mutation = """
-        mutation CreateSource($input: CreateSourceCodeVulnerabilityInput!) {
-          createSourceCodeVulnerability(input: $input) { issue { id title } }
-        }
-        """
-        data = graphql_request(mutation, {"input": {
+        data = graphql_request(_CREATE_SOURCE_MUTATION, {"input": {
             **common,
             "fileName": payload.get("fileName"),
             "vulnerableLine": int(payload.get("vulnerableLine")),
@@ -856,323 +1332,486 @@ def _create_vulnerability(payload: Dict[str, Any], apply: bool):
             "commitRef": payload.get("commitRef"),
             "deployId": payload.get("deployId"),
         }})
-        issue = ((data.get("createSourceCodeVulnerability") or {}).get("issue") or {})
+        issue = ((data.get("createSourceCodeVulnerability") or _EMPTY).get("issue") or _EMPTY)
         success(f"Created SOURCE vulnerability '{issue.get('title')}' (ID {issue.get('id')})")
         return
 
     raise ValueError(f"Unsupported vulnerability type: {vtype}")
 
 
-def _actions_from_parsed(actions: List[Dict[str, Any]], items: List[Dict[str, Any]], context: Dict[str, Any]) -> List[Dict[str, Any]]:
-    planned = []
+def _create_vulnerabilities_batch(payloads: List[Dict[str, Any]], apply: bool, workers: Optional[int] = None):
+    """
+    Send vulns.create mutations concurrently. As soon as one fails, findings not yet sent are
+    cancelled (in-flight ones finish) and the first failure in payload order is re-raised.
+    """
+    if not apply or not payloads:
+        return
+    # Deliberately one mutation per finding rather than an aliased multi-field document (as bulk
+    # import does): graphql_request raises on any field error and drops the partial data, so one
+    # rejected finding would hide which siblings were created, and a per-item retry would duplicate them.
+    max_workers = resolve_workers(workers)
+    if max_workers <= 1:
+        for payload in payloads:
+            _create_vulnerability(payload, apply)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_create_vulnerability, payload, apply) for payload in payloads]
+        wait(futures, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            future.cancel()
+    for future in futures:
+        if not future.cancelled() and future.exception() is not None:
+            raise future.exception()
+
+
+def _update_assets_batch(
+    company_id: int,
+    payloads: List[Dict[str, Any]],
+    apply: bool,
+    workers: Optional[int] = None,
+) -> List[Optional[int]]:
+    """
+    Send updateAsset mutations and return the updated IDs in payload order.
+    Different assets are updated concurrently; updates to the same asset (e.g. one per scan line
+    for a host) are sent one after another in plan order, so the last one still wins.
+    """
+    if not apply or not payloads:
+        return []
+    by_asset: Dict[Any, List[int]] = {}
+    for index, payload in enumerate(payloads):
+        by_asset.setdefault(payload.get("id"), []).append(index)
+
+    def _send(indexes: List[int]) -> List[Tuple[int, Optional[int]]]:
+        return [(index, _update_asset(company_id, payloads[index], apply)) for index in indexes]
+
+    updated: List[Optional[int]] = [None] * len(payloads)
+    for results in parallel_map(_send, by_asset.values(), workers=workers):
+        for index, asset_id in results:
+            updated[index] = asset_id
+    return updated
+
+
+def _fill_issue_defaults(payload: Dict[str, Any]):
+    """Fill the narrative and risk fields WEB/NETWORK inputs require, reading title/description once."""
+    title = payload.get("title")
+    narrative = payload.get("description") or title
+    if payload.get("solution") in (None, ""):
+        payload["solution"] = narrative or "See description"
+    if payload.get("impactLevel") in (None, ""):
+        payload["impactLevel"] = "LOW"
+    if payload.get("probabilityLevel") in (None, ""):
+        payload["probabilityLevel"] = "LOW"
+    if payload.get("summary") in (None, ""):
+        payload["summary"] = title or "-"
+    if payload.get("impactDescription") in (None, ""):
+        payload["impactDescription"] = narrative or "-"
+    if payload.get("stepsToReproduce") in (None, ""):
+        payload["stepsToReproduce"] = narrative or "-"
+
+
+def _as_int_id(value: Any) -> Any:
+    """Return all-digit string IDs as int; anything else (including " 12" or "+1") is kept as-is."""
+    # Decimal characters are exactly the digits int() parses; isdigit() also admits "²", which int() rejects
+    if isinstance(value, str) and value.isdecimal():
+        return int(value)
+    return value
+
+
+def _coerce_asset_fields(fields: Dict[str, Any]):
+    """Coerce CSV lists, enum casing and booleans in an asset payload in place, reading each field once."""
+    tags = fields.get("assetsTagList")
+    if isinstance(tags, str):
+        fields["assetsTagList"] = [t.strip() for t in tags.split(",") if t.strip()]
+    integrations = fields.get("integrations")
+    if isinstance(integrations, str):
+        fields["integrations"] = [t.strip() for t in integrations.split(",") if t.strip()]
+    business_impact = fields.get("businessImpact")
+    if isinstance(business_impact, str):
+        fields["businessImpact"] = business_impact.upper()
+    exploitability = fields.get("exploitability")
+    if isinstance(exploitability, str):
+        fields["exploitability"] = exploitability.upper()
+    compromised = fields.get("environmentCompromised")
+    if isinstance(compromised, str):
+        fields["environmentCompromised"] = compromised.lower() == "true"
+
+
+def _index_asset_name(by_name: Dict[str, Any], name: Any, asset_id: Any):
+    """Store asset_id under the raw name and, when it differs, the normalized host key."""
+    raw_name = str(name)
+    by_name[raw_name] = asset_id
+    normalized_name = _normalize_asset_key(raw_name)
+    if normalized_name != raw_name:
+        by_name[normalized_name] = asset_id
+
+
+def _build_assets_by_name(assets: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Index fetched assets the way _index_asset_name does, in one pass with the helper calls inlined."""
+    by_name: Dict[str, Any] = {}
+    for asset in assets:
+        name = asset.get("name")
+        if not name:
+            continue
+        raw_name = str(name)
+        asset_id = asset.get("id")
+        by_name[raw_name] = asset_id
+        normalized_name = _normalize_asset_text(raw_name)
+        if normalized_name != raw_name:
+            by_name[normalized_name] = asset_id
+    return by_name
+
+
+def _remember_asset(context: Dict[str, Any], name: Any, asset_id: Any):
+    """Record a resolved asset under its raw and normalized name so later entries skip the API lookup."""
+    _index_asset_name((context.get("assets") or {}).setdefault("by_name", {}), name, asset_id)
+
+
+def _actions_from_parsed(
+    actions: List[Dict[str, Any]],
+    items: List[Dict[str, Any]],
+    context: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    """Yield one planned entry per (item, action), lazily so large imports never hold the full plan."""
+    if not items or not actions:
+        return
+    # Action slots don't depend on the item; resolve them once per step
+    resolved = [
+        (action.get("type"), action.get("map") or _EMPTY, action.get("defaults") or _EMPTY, action.get("asset") or _EMPTY)
+        for action in actions
+    ]
     for item in items:
-        for action in actions:
-            planned.append({
-                "type": action.get("type"),
-                "map": action.get("map") or {},
-                "defaults": action.get("defaults") or {},
-                "asset": action.get("asset") or {},
+        for action_type, mapping, defaults, asset in resolved:
+            yield {
+                "type": action_type,
+                "map": mapping,
+                "defaults": defaults,
+                "asset": asset,
                 "record": item,
                 "context": context,
-            })
-    return planned
+            }
 
 
-def _apply_actions(planned: List[Dict[str, Any]], company_id: int, apply: bool) -> Dict[str, int]:
+def _entry_labels(context: Dict[str, Any]) -> Tuple[str, str]:
+    req_label = (context.get("requirement") or _EMPTY).get("label") or ""
+    act_label = (context.get("activity") or _EMPTY).get("label") or ""
+    return req_label, act_label
+
+
+def _exit_missing_asset_id(context: Dict[str, Any]):
+    req_label, act_label = _entry_labels(context)
+    proj_id = (context.get("project") or _EMPTY).get("id")
+    error(
+        "vulns.create requires assetId (resolved from YAML or assets lookup). "
+        f"Project={proj_id} Requirement='{req_label}' Activity='{act_label}'."
+    )
+    raise typer.Exit(code=1)
+
+
+def _has_required(payload: Dict[str, Any], required: Tuple[str, ...], context: Dict[str, Any]) -> bool:
+    missing = [r for r in required if payload.get(r) in (None, "")]
+    if missing:
+        req_label, act_label = _entry_labels(context)
+        warning(
+            f"Skipping vulnerability (missing fields: {', '.join(missing)}). "
+            f"Requirement='{req_label}' Activity='{act_label}'."
+        )
+        return False
+    return True
+
+
+def _prepare_web_vuln(payload: Dict[str, Any], record: Dict[str, Any], context: Dict[str, Any]) -> bool:
+    # Match bulk defaults for integrations (no template required)
+    _fill_issue_defaults(payload)
+
+    # Work on locals and write the resolved HTTP fields back once
+    method = payload.get("method")
+    if method in (None, ""):
+        method = _extract_http_method(payload.get("request"))
+    url = payload.get("url")
+    scheme = payload.get("scheme")
+    port = payload.get("port")
+    inferred_scheme, inferred_port = _infer_scheme_port(url, scheme, port)
+    if scheme in (None, "") and inferred_scheme:
+        scheme = inferred_scheme
+    if port in (None, "") and inferred_port:
+        port = inferred_port
+    host = payload.get("host")
+    if url in (None, "") and host:
+        if port and str(port) not in {"80", "443"}:
+            url = f"{scheme or 'https'}://{host}:{port}"
+        else:
+            url = f"{scheme or 'https'}://{host}"
+    if url and "://" not in str(url):
+        url = f"{str(scheme or 'https').lower()}://{url}"
+    if url not in (None, ""):
+        payload["url"] = url
+    if payload.get("request") in (None, ""):
+        payload["request"] = "-"
+    if payload.get("response") in (None, ""):
+        payload["response"] = "-"
+    if method in (None, "") or str(method).upper() not in _HTTP_METHODS:
+        method = "GET"
+    payload["method"] = method
+    payload["scheme"] = "HTTPS" if scheme in (None, "") else scheme
+    payload["port"] = 443 if port in (None, "") else port
+    return _has_required(payload, _WEB_REQUIRED, context)
+
+
+def _prepare_network_vuln(payload: Dict[str, Any], record: Dict[str, Any], context: Dict[str, Any]) -> bool:
+    _fill_issue_defaults(payload)
+
+    address = payload.get("address")
+    if address in (None, ""):
+        address = payload.get("host") or payload.get("ip")
+        if not address:
+            for cand in (payload.get("matchedAt"), payload.get("url")):
+                if cand:
+                    address = _normalize_asset_key(cand)
+                    break
+    if address:
+        address = _normalize_asset_key(address)
+    payload["address"] = address
+    protocol = payload.get("protocol")
+    if protocol in (None, ""):
+        # DNS findings (typed as such, or whose raw request is dig output) are UDP; everything else is TCP
+        ftype = (record.get("finding") or _EMPTY).get("type")
+        raw_req = (record.get("raw") or _EMPTY).get("request")
+        if (ftype and str(ftype).lower() == "dns") or (isinstance(raw_req, str) and raw_req.lstrip().startswith(";;")):
+            protocol = "UDP"
+        else:
+            protocol = "TCP"
+        payload["protocol"] = protocol
+    if payload.get("port") in (None, ""):
+        payload["port"] = 53 if protocol == "UDP" else 443
+    if payload.get("attackVector") in (None, ""):
+        payload["attackVector"] = "N/A"
+    return _has_required(payload, _NETWORK_PLAN_REQUIRED, context)
+
+
+# Per-type payload completion for vulns.create; types without an entry are sent as rendered
+_VTYPE_PREPARERS = {
+    "WEB": _prepare_web_vuln,
+    "NETWORK": _prepare_network_vuln,
+}
+
+
+def _handle_assets_create(
+    entry: Dict[str, Any],
+    payload: Dict[str, Any],
+    render_cache: Dict[str, str],
+    company_id: int,
+    apply: bool,
+    counts: Dict[str, int],
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    filtered = _non_empty_fields(payload, _ASSET_CREATE_FIELDS)
+    if "name" not in filtered:
+        raise ValueError("assets.create requires 'name'")
+    _coerce_asset_fields(filtered)
+    created_id = _create_asset(company_id, filtered, apply)
+    if created_id:
+        counts["assets_created"] += 1
+        _remember_asset(entry["context"], filtered["name"], created_id)
+    return None
+
+
+def _handle_assets_update(
+    entry: Dict[str, Any],
+    payload: Dict[str, Any],
+    render_cache: Dict[str, str],
+    company_id: int,
+    apply: bool,
+    counts: Dict[str, int],
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    filtered = _non_empty_fields(payload, _ASSET_UPDATE_FIELDS)
+    asset_id = filtered.get("id") or filtered.get("assetId")
+    if asset_id in (None, ""):
+        raise ValueError("assets.update requires 'id' or 'assetId'")
+    asset_id = _as_int_id(asset_id)
+    filtered["id"] = asset_id
+    filtered.pop("assetId", None)
+    _coerce_asset_fields(filtered)
+    return "asset_updates", filtered
+
+
+def _handle_assets_enrich(
+    entry: Dict[str, Any],
+    payload: Dict[str, Any],
+    render_cache: Dict[str, str],
+    company_id: int,
+    apply: bool,
+    counts: Dict[str, int],
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    context = entry["context"]
+    asset_id = payload.get("id") or payload.get("assetId")
+    asset_name = payload.get("name")
+    if asset_id in (None, ""):
+        resolved = None
+        if asset_name:
+            assets_cache = (context.get("assets") or _EMPTY).get("by_name") or _EMPTY
+            raw_name = str(asset_name)
+            resolved = _cached_asset_id(assets_cache, raw_name)
+            if resolved is _MISSING:
+                resolved = _find_asset_by_name(company_id, raw_name)
+                if resolved:
+                    _remember_asset(context, asset_name, resolved)
+        if not resolved:
+            warning("Skipping assets.enrich: asset not found (use assets.create or provide assetId).")
+            counts["skipped"] += 1
+            return None
+        asset_id = resolved
+    asset_id = _as_int_id(asset_id)
+    payload["id"] = asset_id
+    payload.pop("assetId", None)
+    return "asset_updates", payload
+
+
+def _resolve_vuln_asset(
+    entry: Dict[str, Any],
+    payload: Dict[str, Any],
+    render_cache: Dict[str, str],
+    company_id: int,
+    apply: bool,
+    counts: Dict[str, int],
+):
+    """Fill payload["assetId"] from the context cache, an API lookup or asset.create_if_missing."""
+    asset_cfg = entry.get("asset") or {}
+    record = entry["record"]
+    context = entry["context"]
+    if not asset_cfg.get("create_if_missing"):
+        _exit_missing_asset_id(context)
+    asset_map = asset_cfg.get("map") or {}
+    asset_payload = {}
+    for k, v in asset_map.items():
+        asset_payload[k] = _render_value(v, record, context, render_cache)
+    name = asset_payload.get("name")
+    if not name:
+        req_label, act_label = _entry_labels(context)
+        error(
+            "asset.create_if_missing requires asset.map.name to resolve asset. "
+            f"Requirement='{req_label}' Activity='{act_label}'."
+        )
+        raise typer.Exit(code=1)
+    asset_id = payload.get("assetId")
+    existing_assets = (context.get("assets") or _EMPTY).get("by_name") or _EMPTY
+    raw_name = str(name)
+    cached_id = _cached_asset_id(existing_assets, raw_name)
+    if cached_id is not _MISSING:
+        asset_id = cached_id
+    else:
+        normalized_name = _normalize_asset_key(raw_name)
+        lookup_existing = _find_asset_by_name(company_id, normalized_name)
+        if lookup_existing:
+            asset_id = lookup_existing
+        if not asset_id:
+            filtered = _non_empty_fields(asset_payload, _ASSET_CREATE_FIELDS)
+            _coerce_asset_fields(filtered)
+            if apply:
+                created = _create_asset(company_id, filtered, apply=True)
+                if not created:
+                    lookup = _find_asset_by_name(company_id, normalized_name)
+                    if not lookup:
+                        error(
+                            "Failed to resolve asset for vulns.create (no ID returned). "
+                            f"Asset name='{name}'."
+                        )
+                        raise typer.Exit(code=1)
+                    asset_id = lookup
+                else:
+                    asset_id = created
+                if created:
+                    counts["assets_created"] += 1
+            else:
+                asset_id = "dry-run"
+    payload["assetId"] = asset_id
+    _remember_asset(context, name, asset_id)
+
+
+def _handle_vulns_create(
+    entry: Dict[str, Any],
+    payload: Dict[str, Any],
+    render_cache: Dict[str, str],
+    company_id: int,
+    apply: bool,
+    counts: Dict[str, int],
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Complete a vulns.create payload and queue it for the batch send; None when skipped."""
+    record = entry["record"]
+    context = entry["context"]
+    # Normalize severity values from common scanners
+    severity = payload.get("severity")
+    if isinstance(severity, str):
+        sev = severity.strip().upper()
+        payload["severity"] = _SEVERITY_ALIASES.get(sev, sev)
+
+    if payload.get("assetId") in (None, ""):
+        _resolve_vuln_asset(entry, payload, render_cache, company_id, apply, counts)
+
+    if payload.get("assetId") in (None, ""):
+        _exit_missing_asset_id(context)
+    payload["assetId"] = _as_int_id(payload["assetId"])
+
+    if payload.get("description") in (None, ""):
+        payload["description"] = payload.get("title") or "-"
+
+    vtype = _classify_vuln_type(payload, record)
+    if vtype == "DAST":
+        warning("DAST is reserved for internal scans; using WEB for integrations.")
+        vtype = "WEB"
+    payload["type"] = vtype
+
+    prepare = _VTYPE_PREPARERS.get(vtype)
+    if prepare is not None and not prepare(payload, record, context):
+        counts["skipped"] += 1
+        return None
+    info(f"Creating vulnerability: {payload.get('title')}")
+    payload["companyId"] = company_id
+    counts["created"] += 1
+    return "vulns", payload
+
+
+# Handlers take (entry, rendered payload, render cache, company_id, apply, counts) and return
+# None or (queue, payload) for a mutation nothing later in the plan depends on; queued payloads
+# are sent concurrently once every entry is planned
+_ACTION_HANDLERS = {
+    "assets.create": _handle_assets_create,
+    "assets.update": _handle_assets_update,
+    "assets.enrich": _handle_assets_enrich,
+    "vulns.create": _handle_vulns_create,
+}
+
+
+def _apply_actions(planned: Iterable[Dict[str, Any]], company_id: int, apply: bool) -> Dict[str, int]:
     counts = {"created": 0, "skipped": 0, "assets_created": 0, "assets_updated": 0}
+    # Asset updates and vulnerabilities don't feed later entries, so they are sent together after planning.
+    # Asset creation stays inline: it fills assets.by_name for the entries that follow.
+    pending: Dict[str, List[Dict[str, Any]]] = {"asset_updates": [], "vulns": []}
     for entry in planned:
         action_type = entry["type"]
         mapping = entry["map"]
         defaults = entry["defaults"]
-        asset_cfg = entry.get("asset") or {}
         record = entry["record"]
         context = entry["context"]
 
+        # Placeholders repeat across defaults/map/asset templates; resolve each key once per entry.
+        # Every render for the entry happens before assets.by_name is updated below.
+        render_cache: Dict[str, str] = {}
         payload = {}
         for k, v in defaults.items():
-            payload[k] = _render_value(v, record, context)
+            payload[k] = _render_value(v, record, context, render_cache)
         for k, v in mapping.items():
             if k == "assetId" and payload.get("assetId") not in (None, ""):
                 continue
-            payload[k] = _render_value(v, record, context)
-
-        if action_type == "assets.create":
-            allowed = {"name", "description", "businessImpact", "dataClassification", "assetsTagList", "integrations", "environmentCompromised", "exploitability"}
-            filtered = {k: payload.get(k) for k in allowed if payload.get(k) not in (None, "")}
-            if "name" not in filtered:
-                raise ValueError("assets.create requires 'name'")
-            if isinstance(filtered.get("assetsTagList"), str):
-                filtered["assetsTagList"] = [t.strip() for t in filtered["assetsTagList"].split(",") if t.strip()]
-            if isinstance(filtered.get("integrations"), str):
-                filtered["integrations"] = [t.strip() for t in filtered["integrations"].split(",") if t.strip()]
-            if isinstance(filtered.get("businessImpact"), str):
-                filtered["businessImpact"] = filtered["businessImpact"].upper()
-            if isinstance(filtered.get("exploitability"), str):
-                filtered["exploitability"] = filtered["exploitability"].upper()
-            if isinstance(filtered.get("environmentCompromised"), str):
-                filtered["environmentCompromised"] = filtered["environmentCompromised"].lower() == "true"
-            created_id = _create_asset(company_id, filtered, apply)
-            if created_id:
-                counts["assets_created"] += 1
-        elif action_type == "assets.update":
-            allowed = {"id", "assetId", "name", "description", "businessImpact", "dataClassification", "assetsTagList", "integrations", "environmentCompromised", "exploitability"}
-            filtered = {k: payload.get(k) for k in allowed if payload.get(k) not in (None, "")}
-            asset_id = filtered.get("id") or filtered.get("assetId")
-            if asset_id in (None, ""):
-                raise ValueError("assets.update requires 'id' or 'assetId'")
-            if isinstance(asset_id, str) and asset_id.isdigit():
-                asset_id = int(asset_id)
-            filtered["id"] = asset_id
-            filtered.pop("assetId", None)
-            if isinstance(filtered.get("assetsTagList"), str):
-                filtered["assetsTagList"] = [t.strip() for t in filtered["assetsTagList"].split(",") if t.strip()]
-            if isinstance(filtered.get("integrations"), str):
-                filtered["integrations"] = [t.strip() for t in filtered["integrations"].split(",") if t.strip()]
-            if isinstance(filtered.get("businessImpact"), str):
-                filtered["businessImpact"] = filtered["businessImpact"].upper()
-            if isinstance(filtered.get("exploitability"), str):
-                filtered["exploitability"] = filtered["exploitability"].upper()
-            if isinstance(filtered.get("environmentCompromised"), str):
-                filtered["environmentCompromised"] = filtered["environmentCompromised"].lower() == "true"
-            updated_id = _update_asset(company_id, filtered, apply)
-            if updated_id:
-                counts["assets_updated"] += 1
-        elif action_type == "assets.enrich":
-            asset_id = payload.get("id") or payload.get("assetId")
-            asset_name = payload.get("name")
-            if asset_id in (None, ""):
-                resolved = None
-                if asset_name:
-                    assets_cache = (context.get("assets") or {}).get("by_name") or {}
-                    normalized_name = _normalize_asset_key(str(asset_name))
-                    if str(asset_name) in assets_cache:
-                        resolved = assets_cache.get(str(asset_name))
-                    elif normalized_name in assets_cache:
-                        resolved = assets_cache.get(normalized_name)
-                    else:
-                        resolved = _find_asset_by_name(company_id, str(asset_name))
-                if not resolved:
-                    warning("Skipping assets.enrich: asset not found (use assets.create or provide assetId).")
-                    counts["skipped"] += 1
-                    continue
-                asset_id = resolved
-            if isinstance(asset_id, str) and asset_id.isdigit():
-                asset_id = int(asset_id)
-            payload["id"] = asset_id
-            payload.pop("assetId", None)
-            updated_id = _update_asset(company_id, payload, apply)
-            if updated_id:
-                counts["assets_updated"] += 1
-        elif action_type == "vulns.create":
-            # Normalize severity values from common scanners
-            severity = payload.get("severity")
-            if isinstance(severity, str):
-                sev = severity.strip().upper()
-                if sev in {"INFO", "INFORMATIONAL"}:
-                    payload["severity"] = "NOTIFICATION"
-                else:
-                    payload["severity"] = sev
-
-            asset_id = payload.get("assetId")
-            if asset_id in (None, ""):
-                create_if_missing = bool(asset_cfg.get("create_if_missing"))
-                asset_map = asset_cfg.get("map") or {}
-                if create_if_missing:
-                    asset_payload = {}
-                    for k, v in asset_map.items():
-                        asset_payload[k] = _render_value(v, record, context)
-                    name = asset_payload.get("name")
-                    if not name:
-                        req_label = (context.get("requirement") or {}).get("label") or ""
-                        act_label = (context.get("activity") or {}).get("label") or ""
-                        error(
-                            "asset.create_if_missing requires asset.map.name to resolve asset. "
-                            f"Requirement='{req_label}' Activity='{act_label}'."
-                        )
-                        raise typer.Exit(code=1)
-                    existing_assets = (context.get("assets") or {}).get("by_name") or {}
-                    normalized_name = _normalize_asset_key(str(name))
-                    if str(name) in existing_assets:
-                        asset_id = existing_assets.get(str(name))
-                    elif normalized_name in existing_assets:
-                        asset_id = existing_assets.get(normalized_name)
-                    else:
-                        lookup_existing = _find_asset_by_name(company_id, normalized_name)
-                        if lookup_existing:
-                            asset_id = lookup_existing
-                            payload["assetId"] = asset_id
-                        if not asset_id:
-                            allowed = {"name", "description", "businessImpact", "dataClassification", "assetsTagList", "integrations", "environmentCompromised", "exploitability"}
-                            filtered = {k: asset_payload.get(k) for k in allowed if asset_payload.get(k) not in (None, "")}
-                            if isinstance(filtered.get("exploitability"), str):
-                                filtered["exploitability"] = filtered["exploitability"].upper()
-                            if apply:
-                                created = _create_asset(company_id, filtered, apply=True)
-                                if not created:
-                                    lookup = _find_asset_by_name(company_id, normalized_name)
-                                    if not lookup:
-                                        error(
-                                            "Failed to resolve asset for vulns.create (no ID returned). "
-                                            f"Asset name='{name}'."
-                                        )
-                                        raise typer.Exit(code=1)
-                                    asset_id = lookup
-                                else:
-                                    asset_id = created
-                                if created:
-                                    counts["assets_created"] += 1
-                            else:
-                                asset_id = "dry-run"
-                    payload["assetId"] = asset_id
-                    assets_cache = (context.get("assets") or {}).setdefault("by_name", {})
-                    assets_cache[str(name)] = asset_id
-                    assets_cache[normalized_name] = asset_id
-                else:
-                    req_label = (context.get("requirement") or {}).get("label") or ""
-                    act_label = (context.get("activity") or {}).get("label") or ""
-                    proj_id = (context.get("project") or {}).get("id")
-                    error(
-                        "vulns.create requires assetId (resolved from YAML or assets lookup). "
-                        f"Project={proj_id} Requirement='{req_label}' Activity='{act_label}'."
-                    )
-                    raise typer.Exit(code=1)
+            payload[k] = _render_value(v, record, context, render_cache)
 
-            if payload.get("assetId") in (None, ""):
-                req_label = (context.get("requirement") or {}).get("label") or ""
-                act_label = (context.get("activity") or {}).get("label") or ""
-                proj_id = (context.get("project") or {}).get("id")
-                error(
-                    "vulns.create requires assetId (resolved from YAML or assets lookup). "
-                    f"Project={proj_id} Requirement='{req_label}' Activity='{act_label}'."
-                )
-                raise typer.Exit(code=1)
-            if isinstance(payload.get("assetId"), str):
-                aid = payload.get("assetId")
-                if aid.isdigit():
-                    payload["assetId"] = int(aid)
-
-            if payload.get("description") in (None, ""):
-                payload["description"] = payload.get("title") or "-"
-
-            vtype = _classify_vuln_type(payload, record)
-            if vtype == "DAST":
-                warning("DAST is reserved for internal scans; using WEB for integrations.")
-                vtype = "WEB"
-            payload["type"] = vtype
-
-            if vtype == "WEB":
-                # Match bulk defaults for integrations (no template required)
-                if payload.get("solution") in (None, ""):
-                    payload["solution"] = payload.get("description") or payload.get("title") or "See description"
-                if payload.get("impactLevel") in (None, ""):
-                    payload["impactLevel"] = "LOW"
-                if payload.get("probabilityLevel") in (None, ""):
-                    payload["probabilityLevel"] = "LOW"
-                if payload.get("summary") in (None, ""):
-                    payload["summary"] = payload.get("title") or "-"
-                if payload.get("impactDescription") in (None, ""):
-                    payload["impactDescription"] = payload.get("description") or payload.get("title") or "-"
-                if payload.get("stepsToReproduce") in (None, ""):
-                    payload["stepsToReproduce"] = payload.get("description") or payload.get("title") or "-"
-
-                if payload.get("method") in (None, ""):
-                    payload["method"] = _extract_http_method(payload.get("request"))
-                inferred = _infer_scheme_port(payload.get("url"), payload.get("scheme"), payload.get("port"))
-                if payload.get("scheme") in (None, "") and inferred.get("scheme"):
-                    payload["scheme"] = inferred.get("scheme")
-                if payload.get("port") in (None, "") and inferred.get("port"):
-                    payload["port"] = inferred.get("port")
-                if payload.get("url") in (None, "") and payload.get("host"):
-                    scheme = payload.get("scheme") or "https"
-                    host = payload.get("host")
-                    if payload.get("port") and str(payload.get("port")) not in {"80", "443"}:
-                        payload["url"] = f"{scheme}://{host}:{payload.get('port')}"
-                    else:
-                        payload["url"] = f"{scheme}://{host}"
-                if payload.get("url") and "://" not in str(payload.get("url")):
-                    scheme = str(payload.get("scheme") or "https").lower()
-                    payload["url"] = f"{scheme}://{payload.get('url')}"
-                if payload.get("request") in (None, ""):
-                    payload["request"] = "-"
-                if payload.get("response") in (None, ""):
-                    payload["response"] = "-"
-                if payload.get("method") in (None, ""):
-                    payload["method"] = "GET"
-                allowed_methods = {"GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD", "TRACE", "CONNECT"}
-                if str(payload.get("method")).upper() not in allowed_methods:
-                    payload["method"] = "GET"
-                if payload.get("scheme") in (None, ""):
-                    payload["scheme"] = "HTTPS"
-                if payload.get("port") in (None, ""):
-                    payload["port"] = 443
-
-                required = ["assetId", "title", "description", "severity", "method", "scheme", "url", "port", "request", "response"]
-                missing = [r for r in required if payload.get(r) in (None, "")]
-                if missing:
-                    req_label = (context.get("requirement") or {}).get("label") or ""
-                    act_label = (context.get("activity") or {}).get("label") or ""
-                    warning(
-                        f"Skipping vulnerability (missing fields: {', '.join(missing)}). "
-                        f"Requirement='{req_label}' Activity='{act_label}'."
-                    )
-                    counts["skipped"] += 1
-                    continue
-            elif vtype == "NETWORK":
-                if payload.get("solution") in (None, ""):
-                    payload["solution"] = payload.get("description") or payload.get("title") or "See description"
-                if payload.get("impactLevel") in (None, ""):
-                    payload["impactLevel"] = "LOW"
-                if payload.get("probabilityLevel") in (None, ""):
-                    payload["probabilityLevel"] = "LOW"
-                if payload.get("summary") in (None, ""):
-                    payload["summary"] = payload.get("title") or "-"
-                if payload.get("impactDescription") in (None, ""):
-                    payload["impactDescription"] = payload.get("description") or payload.get("title") or "-"
-                if payload.get("stepsToReproduce") in (None, ""):
-                    payload["stepsToReproduce"] = payload.get("description") or payload.get("title") or "-"
-
-                if payload.get("address") in (None, ""):
-                    fallback = payload.get("host") or payload.get("ip")
-                    if not fallback:
-                        for cand in (payload.get("matchedAt"), payload.get("url")):
-                            if cand:
-                                fallback = _normalize_asset_key(cand)
-                                break
-                    payload["address"] = fallback
-                if payload.get("address"):
-                    payload["address"] = _normalize_asset_key(payload.get("address"))
-                if payload.get("protocol") in (None, ""):
-                    ftype = (record.get("finding") or {}).get("type")
-                    ftype = (str(ftype).lower() if ftype else "")
-                    raw_req = (record.get("raw") or {}).get("request")
-                    if ftype == "dns" or (isinstance(raw_req, str) and raw_req.lstrip().startswith(";;")):
-                        payload["protocol"] = "UDP"
-                    elif ftype in {"ssl", "tcp"}:
-                        payload["protocol"] = "TCP"
-                    else:
-                        payload["protocol"] = "TCP"
-                if payload.get("port") in (None, ""):
-                    payload["port"] = 53 if payload.get("protocol") == "UDP" else 443
-                if payload.get("attackVector") in (None, ""):
-                    payload["attackVector"] = "N/A"
-
-                required = ["assetId", "title", "description", "severity", "address", "protocol", "port", "attackVector"]
-                missing = [r for r in required if payload.get(r) in (None, "")]
-                if missing:
-                    req_label = (context.get("requirement") or {}).get("label") or ""
-                    act_label = (context.get("activity") or {}).get("label") or ""
-                    warning(
-                        f"Skipping vulnerability (missing fields: {', '.join(missing)}). "
-                        f"Requirement='{req_label}' Activity='{act_label}'."
-                    )
-                    counts["skipped"] += 1
-                    continue
-            info(f"Creating vulnerability: {payload.get('title')}")
-            payload["companyId"] = company_id
-            _create_vulnerability(payload, apply)
-            counts["created"] += 1
-        else:
+        handler = _ACTION_HANDLERS.get(action_type)
+        if handler is None:
             raise ValueError(f"Unsupported action type: {action_type}")
+        queued = handler(entry, payload, render_cache, company_id, apply, counts)
+        if queued is not None:
+            pending[queued[0]].append(queued[1])
+    updated_ids = _update_assets_batch(company_id, pending["asset_updates"], apply)
+    counts["assets_updated"] += sum(1 for asset_id in updated_ids if asset_id)
+    _create_vulnerabilities_batch(pending["vulns"], apply)
     return counts
 
 
@@ -1232,15 +1871,8 @@ def create_task(
     if type_id is not None:
         activity["typeId"] = type_id
 
-    mutation = """
-    mutation CreateOrUpdateRequirement($input: RequirementInput!) {
-      createOrUpdateRequirement(input: $input) {
-        requirement { id label }
-      }
-    }
-    """
-
-    activities_payload = [_normalize_activity_for_input(activity)]
+    new_activity = _normalize_activity_for_input(activity)
+    activities_payload = [new_activity]
     input_data: Dict[str, Any] = {
         "companyId": company_id,
         "label": req_label,
@@ -1251,28 +1883,8 @@ def create_task(
     }
 
     if requirement_id:
-        fetch_query = """
-        query Requirement($companyId: ID!, $id: ID!) {
-          requirement(companyId: $companyId, id: $id) {
-            id
-            label
-            description
-            global
-            check {
-              id
-              label
-              description
-              reference
-              item
-              category
-              actionPlan
-              sort
-            }
-          }
-        }
-        """
         try:
-            fetched = graphql_request(fetch_query, {"companyId": company_id, "id": requirement_id}, log_request=False)
+            fetched = graphql_request(_REQUIREMENT_QUERY, {"companyId": company_id, "id": requirement_id}, log_request=False)
             req_data = fetched.get("requirement") or {}
         except Exception as fetch_err:
             error(f"Could not fetch existing requirement: {fetch_err}")
@@ -1291,13 +1903,13 @@ def create_task(
             "companyId": company_id,
             "label": requirement_label or current_label,
             "description": requirement_description if requirement_description is not None else req_data.get("description"),
-            "activities": [*existing_activities, _normalize_activity_for_input(activity)],
+            "activities": [*existing_activities, new_activity],
         }
 
     input_data = {k: v for k, v in input_data.items() if v is not None}
 
     try:
-        data = graphql_request(mutation, {"input": input_data})
+        data = graphql_request(_CREATE_OR_UPDATE_REQUIREMENT_MUTATION, {"input": input_data})
         req = data["createOrUpdateRequirement"]["requirement"]
         req_id = req.get("id")
         success(f"Task created: requirement {req_id} - {req.get('label')}")
@@ -1328,26 +1940,13 @@ def list_tasks(
         raise typer.Exit(code=1)
 
     info(f"Listing tasks for project {project_id} (company {company_id})...")
-    project_query = """
-    query ProjectRequirements($id: ID!) {
-      project(id: $id) {
-        id
-        label
-        projectRequirements {
-          id
-          label
-          activities { id title description }
-        }
-      }
-    }
-    """
-    data = graphql_request(project_query, {"id": project_id})
+    data = graphql_request(_PROJECT_REQUIREMENTS_QUERY, {"id": project_id})
     project = data.get("project") or {}
     project_requirements = project.get("projectRequirements") or []
-    for req in project_requirements:
-        label = (req.get("label") or "").strip()
-        if not _matches_prefix(label, requirement_prefix):
-            continue
+
+    matches = _prefix_matcher(requirement_prefix)
+    matching_reqs = [req for req in project_requirements if matches((req.get("label") or "").strip())]
+    for req in matching_reqs:
         for act in req.get("activities") or []:
             validation = _validate_task_yaml(act.get("description") or "")
             if not validation.get("ok") and not show_invalid:
@@ -1388,6 +1987,7 @@ def run_task(
     requirement_prefix: str = typer.Option(TASK_PREFIX_DEFAULT, "--prefix", help="Requirement label prefix to match."),
     dryrun: bool = typer.Option(True, "--dryrun/--apply", help="Run in dry-run mode (default). Use --apply to apply actions."),
     auto_approve: bool = typer.Option(False, "--auto-approve", help="Approve and persist task commands without confirmation."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-fetch step inputs for every activity instead of reusing them within the run."),
 ):
     """Execute tasks defined as YAML in activity descriptions."""
     _require_yaml()
@@ -1395,22 +1995,11 @@ def run_task(
     info(f"Loading tasks for project {project_id} (company {company_id})...")
     info("Sending GraphQL request to load project data...")
 
-    query = """
-    query ProjectRequirements($id: ID!) {
-      project(id: $id) {
-        id
-        label
-        projectRequirements {
-          id
-          label
-          activities { id title description }
-        }
-      }
-    }
-    """
-    data = graphql_request(query, {"id": project_id}, log_request=False)
+    data = graphql_request(_PROJECT_REQUIREMENTS_QUERY, {"id": project_id}, log_request=False)
     project = data.get("project") or {}
     project_requirements = project.get("projectRequirements") or []
+    # Asset/target lists fetched by earlier steps; dropped whenever a step changes assets
+    inputs_cache: Optional[Dict[Tuple[str, Any], Any]] = None if no_cache else {}
 
     tasks_found = 0
     tasks_executed = 0
@@ -1421,26 +2010,20 @@ def run_task(
         "assets": {"by_name": {}},
     }
 
-    for req in project_requirements:
+    matches = _prefix_matcher(requirement_prefix)
+    matching_reqs = [req for req in project_requirements if matches((req.get("label") or "").strip())]
+    for req in matching_reqs:
         label = (req.get("label") or "").strip()
-        if not _matches_prefix(label, requirement_prefix):
-            continue
         tasks_found += 1
         info(f"Requirement '{label}' matched prefix '{requirement_prefix}'.")
 
         activities = req.get("activities") or []
         for act in activities:
-            desc = _clean_description(act.get("description") or "")
+            desc, task_def, load_error = _parse_task_desc(act.get("description") or "")
             if not desc:
                 continue
-            try:
-                task_def = yaml.safe_load(desc)
-                if not isinstance(task_def, dict) or not isinstance(task_def.get("steps"), list):
-                    normalized = _normalize_yaml_steps(desc)
-                    if normalized != desc:
-                        task_def = yaml.safe_load(normalized)
-            except Exception as exc:
-                warning(f"Skipping activity {act.get('id')} (invalid YAML): {exc}")
+            if load_error and not isinstance(task_def, dict):
+                warning(f"Skipping activity {act.get('id')} (invalid YAML): {load_error}")
                 continue
 
             if not isinstance(task_def, dict) or "steps" not in task_def:
@@ -1473,48 +2056,20 @@ def run_task(
             context["activity"] = {"id": act.get("id"), "label": act.get("title")}
 
             inputs = step.get("inputs") or {}
-            if "assets" in inputs:
+            assets, targets = _fetch_step_inputs(company_id, project_id, inputs, inputs_cache)
+            if assets is not None:
                 assets_cfg = inputs.get("assets") or {}
-                tags = assets_cfg.get("query", {}).get("tags")
-                assets = _fetch_assets(company_id, tags=tags)
-                by_name = {}
-                for a in assets:
-                    name = a.get("name")
-                    if not name:
-                        continue
-                    by_name[str(name)] = a.get("id")
-                    by_name[_normalize_asset_key(name)] = a.get("id")
-                context["assets"] = {"list": assets, "by_name": by_name}
+                context["assets"] = {"list": assets, "by_name": _build_assets_by_name(assets)}
 
                 export_cfg = assets_cfg.get("export") or {}
                 file_path = export_cfg.get("file")
                 field = export_cfg.get("field") or "name"
                 if file_path:
-                    dir_path = os.path.dirname(file_path)
-                    if dir_path:
-                        os.makedirs(dir_path, exist_ok=True)
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        for a in assets:
-                            val = a.get(field)
-                            if val:
-                                f.write(f"{val}\n")
+                    _export_lines(file_path, (val for val in (a.get(field) for a in assets) if val))
                     context["assets"]["file"] = file_path
 
-            if "targets" in inputs:
+            if targets is not None:
                 targets_cfg = inputs.get("targets") or {}
-                source = (targets_cfg.get("source") or "").lower()
-                targets: List[str] = []
-                if source in {"project.assets", "assets"}:
-                    proj_assets = _fetch_project_assets(company_id, project_id)
-                    for a in proj_assets:
-                        name = a.get("name")
-                        if name:
-                            targets.append(str(name))
-                elif source in {"project.target_urls", "project.targets", "target_urls", "targets"}:
-                    targets = _fetch_project_targets(company_id, project_id)
-                else:
-                    warning("inputs.targets.source must be 'project.assets' or 'project.target_urls'.")
-
                 targets = [t for t in targets if t]
                 context["targets"] = {"list": targets}
                 info(f"Resolved targets from project: {', '.join(targets) if targets else '-'}")
@@ -1527,12 +2082,7 @@ def run_task(
                     values = targets
                     if mode == "hosts" or field in {"host", "hostname"}:
                         values = _targets_to_hosts(targets)
-                    dir_path = os.path.dirname(file_path)
-                    if dir_path:
-                        os.makedirs(dir_path, exist_ok=True)
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        for t in values:
-                            f.write(f"{t}\n")
+                    _export_lines(file_path, values)
                     context["targets"]["file"] = file_path
                     context["targets"]["hosts"] = values
 
@@ -1556,25 +2106,24 @@ def run_task(
                         continue
                     _approve_command(cmd)
                     info("Command approved and cached locally.")
-            result = subprocess.run(cmd, shell=True, text=True, capture_output=True)
-            if result.returncode != 0:
-                error(f"Command failed (code {result.returncode}): {result.stderr.strip()}")
-                raise typer.Exit(code=1)
-
             parse_cfg = (run_cfg.get("parse") or {})
             fmt = (parse_cfg.get("format") or "").lower()
+            parser = _PARSERS.get(fmt)
+            # Output on stdout is parsed as the scanner emits it instead of after it exits
+            streamed = parser is not None and _parses_stdout(parse_cfg)
+            returncode, stderr, output = _run_command(cmd, parser if streamed else _read_all)
+            if returncode != 0:
+                error(f"Command failed (code {returncode}): {stderr.strip()}")
+                raise typer.Exit(code=1)
+
             parsed_items: List[Dict[str, Any]] = []
-            if fmt:
-                source_text = _read_parse_source(parse_cfg, result.stdout)
-                if fmt == "nmap-xml":
-                    parsed_items = _parse_nmap_xml(source_text)
-                elif fmt == "nuclei-json-lines":
-                    parsed_items = _parse_nuclei_json_lines(source_text)
-                elif fmt == "scan-json-lines":
-                    parsed_items = _parse_scan_json_lines(source_text)
-                else:
+            if streamed:
+                parsed_items = output
+            elif fmt:
+                if parser is None:
                     error(f"Unsupported parse format: {fmt}")
                     raise typer.Exit(code=1)
+                parsed_items = parser(_iter_parse_lines(parse_cfg, output))
 
             actions = step.get("actions") or []
             if not actions:
@@ -1585,6 +2134,8 @@ def run_task(
 
             do_apply = not dryrun
             counts = _apply_actions(planned, company_id, do_apply)
+            if inputs_cache and (counts["assets_created"] or counts["assets_updated"]):
+                inputs_cache.clear()
             summary(
                 f"Vulnerabilities created={counts['created']} skipped={counts['skipped']} assets_created={counts['assets_created']} assets_updated={counts['assets_updated']}"
             )
@@ -717,14 +717,14 @@ def list_vulnerabilities(
         v = (value or "").strip().lower()
         return v.startswith("http://") or v.startswith("https://")
 
-    def _fetch_snippet_from_url(url: str) -> str:
+    def _fetch_snippet_from_url(url: str, session: requests.Session) -> str:
         if not url:
             return ""
         cached = snippet_content_cache.get(url)
         if cached is not None:
             return cached
         try:
-            resp = requests.get(url, timeout=8)
+            resp = session.get(url, timeout=8)
             resp.raise_for_status()
             text = (resp.text or "")[:300000]
             snippet_content_cache[url] = text
@@ -900,11 +900,16 @@ def list_vulnerabilities(
                                 url_rows.append(row)
                     if url_rows:
                         max_workers = resolve_workers(workers)
-                        contents = parallel_map(
-                            lambda r: _fetch_snippet_from_url(str(r.get("codeSnippet") or "")),
-                            url_rows,
-                            workers=max_workers,
-                        )
+                        # Snippet URLs mostly share a host; one pooled session keeps connections alive across rows
+                        with requests.Session() as snippet_session:
+                            snippet_adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(max_workers, 10))
+                            snippet_session.mount("https://", snippet_adapter)
+                            snippet_session.mount("http://", snippet_adapter)
+                            contents = parallel_map(
+                                lambda r: _fetch_snippet_from_url(str(r.get("codeSnippet") or ""), snippet_session),
+                                url_rows,
+                                workers=max_workers,
+                            )
                         for row, content in zip(url_rows, contents):
                             if not content:
                                 continue
@@ -5,7 +5,7 @@ Shared primitives for parallel execution across commands.
 """
 
 from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Iterable, TypeVar, List, Optional
+from typing import Callable, Iterable, Iterator, TypeVar, List, Optional
 
 T = TypeVar("T")
 R = TypeVar("R")
@@ -40,3 +40,49 @@ def parallel_map(func: Callable[[T], R], items: Iterable[T], workers: Optional[i
         return [func(item) for item in data]
     with ThreadPoolExecutor(max_workers=max_workers) as pool:
         return list(pool.map(func, data))
+
+
+def parallel_imap(func: Callable[[T], R], items: Iterable[T], workers: Optional[int] = None) -> Iterator[R]:
+    """
+    Lazy variant of parallel_map: yields results in input order as soon as each
+    is ready, so callers can start consuming before the slowest item finishes.
+    """
+    data = list(items)
+    if not data:
+        return
+    max_workers = resolve_workers(workers)
+    if max_workers <= 1:
+        for item in data:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        yield from pool.map(func, data)
+
+
+def prefetch_pages(
+    fetch: Callable[[int], R],
+    start: int,
+    is_last: Callable[[R], bool],
+    workers: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Fetch pages start, start + 1, ... when the total page count is unknown.
+    Requests go out in windows of `workers` concurrent calls; results are yielded
+    in page order up to and including the first one for which is_last() is true.
+    """
+    window = resolve_workers(workers)
+    page_num = start
+    if window <= 1:
+        while True:
+            result = fetch(page_num)
+            yield result
+            if is_last(result):
+                return
+            page_num += 1
+    with ThreadPoolExecutor(max_workers=window) as pool:
+        while True:
+            for result in pool.map(fetch, range(page_num, page_num + window)):
+                yield result
+                if is_last(result):
+                    return
+            page_num += window
@@ -0,0 +1,75 @@
+"""
+JSON encode/decode helpers for Conviso CLI.
+ - Use orjson when it is installed, the stdlib json module otherwise
+ - Fall back to the stdlib wherever orjson would lose data or reject valid input:
+   integers wider than 64 bits (orjson decodes them as floats and refuses to encode them)
+   and NaN/Infinity literals
+"""
+
+import json
+import re
+from typing import Any, Union
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional speedup; stdlib json is used otherwise
+    orjson = None
+
+
+# 20+ digit runs: integers orjson would decode as (lossy) floats
+_WIDE_INT_RE = re.compile(r"\d{20}")
+_WIDE_INT_RE_BYTES = re.compile(rb"\d{20}")
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Decode one JSON document from text or any bytes-like object.
+
+    Raises json.JSONDecodeError (a ValueError) on invalid input, whichever decoder ran.
+    """
+    if orjson is not None:
+        pattern = _WIDE_INT_RE if isinstance(data, str) else _WIDE_INT_RE_BYTES
+        if not pattern.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN/Infinity, which the stdlib accepts
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(
+    data: Any,
+    *,
+    indent: bool = False,
+    sort_keys: bool = False,
+    newline: bool = False,
+    ensure_ascii: bool = False,
+) -> bytes:
+    """Encode data as UTF-8 JSON bytes.
+
+    Output is compact unless indent is set (2 spaces); newline appends a trailing "\\n" and
+    ensure_ascii escapes every non-ASCII character, matching json.dumps(ensure_ascii=True).
+    """
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        try:
+            encoded = orjson.dumps(data, option=option)
+        except TypeError:
+            encoded = None  # e.g. integers beyond 64 bits or non-str keys
+        if encoded is not None and (not ensure_ascii or encoded.isascii()):
+            return encoded
+    text = json.dumps(
+        data,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        ensure_ascii=ensure_ascii,
+    )
+    return (text + "\n" if newline else text).encode("utf-8")
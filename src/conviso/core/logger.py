@@ -19,4 +19,5 @@ def log(message: str, style="cyan", force: bool = False, verbose_only: bool = Fa
         return
     if verbose_only and not VERBOSE:
         return
-    console.print(f"[{style}]{message}[/{style}]")
+    # Style applied directly: no markup parse per call, and "[...]" in messages prints literally
+    console.print(message, style=style, markup=False)
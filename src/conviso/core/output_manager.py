@@ -9,31 +9,104 @@ Centralizes all CLI output logic:
  - Consistent CLI-wide formatting
 """
 
+import io
+import itertools
 import json
 import csv
+import os
+import shutil
+import stat
 import sys
-from typing import List, Dict, Any, Optional
+import tempfile
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
+from conviso.core import jsonutil
 from conviso.core.notifier import info, success, error, warning
 from conviso.core.output_prefs import get_repeat_header_every, get_selected_columns
 
 console = Console()
 
+# Large write buffer for exports so big result sets hit disk in few syscalls
+CSV_BUFFER_SIZE = 8 * 1024 * 1024
 
-def export_data(data: List[Dict], schema=None, fmt: str = "table", output: str = None, title: str = None):
-    """Exports data in table, JSON, or CSV formats using unified schema-driven output."""
 
-    # --- Prepare columns for table/CSV ---
+# Process umask, read once: querying it means setting it, which is process-wide
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def _atomic_output_file(output: str, mode: str = "w", **kwargs):
+    """
+    Write output through a temp file next to it that is renamed over it once the block completes.
+    If the producer fails mid-stream (e.g. a page fetch), output keeps its previous contents.
+    Devices, pipes and hard-linked files (e.g. -o /dev/stdout) are written in place instead.
+    """
+    try:
+        st = os.stat(output)
+    except FileNotFoundError:
+        st = None
+    if st is not None and (not stat.S_ISREG(st.st_mode) or st.st_nlink > 1):
+        with open(output, mode, buffering=CSV_BUFFER_SIZE, **kwargs) as out:
+            yield out
+        return
+
+    # Resolve symlinks so the link is written through rather than replaced
+    target = os.path.realpath(output)
+    directory, name = os.path.split(target)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}-")
+    try:
+        with os.fdopen(fd, mode, buffering=CSV_BUFFER_SIZE, **kwargs) as out:
+            # mkstemp creates 0600 files; keep an existing export's mode, else use what open() would
+            if st is not None:
+                shutil.copymode(target, tmp_path)
+            else:
+                os.chmod(tmp_path, 0o666 & ~_UMASK)
+            yield out
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def _output_stream(output: Optional[str] = None, newline: Optional[str] = ""):
+    """Yield a block-buffered text stream for exported rows (file when output is set, else stdout)."""
+    if output:
+        with _atomic_output_file(output, newline=newline, encoding="utf-8") as out:
+            yield out
+        return
+
+    raw = getattr(sys.stdout, "buffer", None)
+    if raw is None:
+        yield sys.stdout
+        return
+    # sys.stdout is line-buffered on a TTY; wrap its binary buffer to avoid a flush per row
+    sys.stdout.flush()
+    stream = io.TextIOWrapper(raw, encoding="utf-8", newline=newline, line_buffering=False)
+    try:
+        yield stream
+    finally:
+        stream.flush()
+        stream.detach()
+
+
+def _resolve_columns(
+    schema=None,
+    sample: Optional[Dict] = None,
+    warn_unknown: bool = True,
+) -> Optional[Tuple[List[str], List[str]]]:
+    """Return (field_keys, column_labels) from the schema or a sample row, honoring --columns."""
     if schema and hasattr(schema, "display_headers"):
         columns = list(schema.display_headers.values())
         field_keys = list(schema.display_headers.keys())
-    elif data:
-        field_keys = list(data[0].keys())
+    elif sample:
+        field_keys = list(sample.keys())
         columns = field_keys
     else:
-        console.print("[yellow]⚠️ No data to export.[/yellow]")
-        return
+        return None
 
     selected = get_selected_columns() or []
     if selected:
@@ -53,37 +126,93 @@ def export_data(data: List[Dict], schema=None, fmt: str = "table", output: str =
         if chosen_keys:
             field_keys = chosen_keys
             columns = [schema.display_headers.get(k, k) if schema and hasattr(schema, "display_headers") else k for k in field_keys]
-        if unknown:
+        if unknown and warn_unknown:
             warning(f"Ignoring unknown column(s): {', '.join(unknown)}")
 
+    return field_keys, columns
+
+
+def output_field_keys(schema) -> List[str]:
+    """Return the schema field keys that will be rendered, honoring the global --columns option."""
+    resolved = _resolve_columns(schema, warn_unknown=False)
+    return resolved[0] if resolved else []
+
+
+def _write_ndjson(rows: Iterable[Dict], output: Optional[str] = None):
+    """Write one JSON object per line, so consumers like jq can process records as they arrive."""
+    lines = (jsonutil.dumps(row, newline=True) for row in rows)
+    if output:
+        with _atomic_output_file(output, "wb") as f:
+            f.writelines(lines)
+        return
+    raw = getattr(sys.stdout, "buffer", None)
+    if raw is None:
+        for line in lines:
+            sys.stdout.write(line.decode("utf-8"))
+        return
+    sys.stdout.flush()
+    for line in lines:
+        raw.write(line)
+    raw.flush()
+
+
+def _json_array_chunks(rows: Iterable[Dict]) -> Iterator[str]:
+    """Yield the same text as json.dumps(list(rows), indent=2) one row at a time."""
+    first = True
+    for row in rows:
+        item = jsonutil.dumps(row, indent=True).decode("utf-8").replace("\n", "\n  ")
+        yield ("[\n  " if first else ",\n  ") + item
+        first = False
+    yield "[]" if first else "\n]"
+
+
+def export_data(data: List[Dict], schema=None, fmt: str = "table", output: str = None, title: str = None):
+    """Exports data in table, JSON, or CSV formats using unified schema-driven output."""
+
+    # --- Prepare columns for table/CSV ---
+    resolved = _resolve_columns(schema, data[0] if data else None)
+    if not resolved:
+        console.print("[yellow]⚠️ No data to export.[/yellow]")
+        return
+    field_keys, columns = resolved
+
     filtered_data = [{k: row.get(k, "") for k in field_keys} for row in data]
 
     # --- JSON output ---
     if fmt == "json":
-        result = json.dumps(filtered_data, indent=2, ensure_ascii=False)
+        result = jsonutil.dumps(filtered_data, indent=True)
 
         # If output file is specified, save to disk
         if output:
-            with open(output, "w", encoding="utf-8") as f:
+            with open(output, "wb") as f:
                 f.write(result)
             console.print(f"[green]File saved to {output}[/green]")
         else:
-            # Print directly to stdout without escaping characters
-            print(result)
+            # Write the encoded bytes straight to stdout without escaping characters
+            raw = getattr(sys.stdout, "buffer", None)
+            if raw is None:
+                print(result.decode("utf-8"))
+            else:
+                sys.stdout.flush()
+                raw.write(result + b"\n")
+                raw.flush()
         return
 
-    # --- CSV output ---
-    elif fmt == "csv":
+    # --- NDJSON output ---
+    elif fmt == "ndjson":
+        _write_ndjson(filtered_data, output)
         if output:
-            with open(output, "w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=field_keys)
-                writer.writeheader()
-                writer.writerows(filtered_data)
             console.print(f"[green]File saved to {output}[/green]")
-        else:
-            writer = csv.DictWriter(sys.stdout, fieldnames=field_keys)
+        return
+
+    # --- CSV output ---
+    elif fmt == "csv":
+        with _output_stream(output) as stream:
+            writer = csv.DictWriter(stream, fieldnames=field_keys)
             writer.writeheader()
             writer.writerows(filtered_data)
+        if output:
+            console.print(f"[green]File saved to {output}[/green]")
         return
 
     # --- TABLE output ---
@@ -131,6 +260,49 @@ def export_data(data: List[Dict], schema=None, fmt: str = "table", output: str =
             console.print(_build_table(filtered_data, title or "Results"))
 
 
+def export_data_stream(rows: Iterable[Dict], schema=None, fmt: str = "table", output: str = None, title: str = None) -> int:
+    """
+    Streaming variant of export_data for paginated producers.
+    JSON, NDJSON and CSV rows are written as they arrive; tables need column widths and are materialized.
+    Returns the number of rows exported.
+    """
+    if fmt not in ("json", "ndjson", "csv"):
+        data = list(rows)
+        export_data(data, schema=schema, fmt=fmt, output=output, title=title)
+        return len(data)
+
+    iterator = iter(rows)
+    first = next(iterator, None)
+    if first is None:
+        export_data([], schema=schema, fmt=fmt, output=output, title=title)
+        return 0
+    field_keys, _ = _resolve_columns(schema, first)
+
+    count = 0
+
+    def _filtered() -> Iterator[Dict]:
+        nonlocal count
+        for row in itertools.chain((first,), iterator):
+            count += 1
+            yield {k: row.get(k, "") for k in field_keys}
+
+    if fmt == "json":
+        with _output_stream(output, newline=None) as stream:
+            stream.writelines(_json_array_chunks(_filtered()))
+            if not output:
+                stream.write("\n")
+    elif fmt == "ndjson":
+        _write_ndjson(_filtered(), output)
+    else:
+        with _output_stream(output) as stream:
+            writer = csv.DictWriter(stream, fieldnames=field_keys)
+            writer.writeheader()
+            writer.writerows(_filtered())
+
+    if output:
+        console.print(f"[green]File saved to {output}[/green]")
+    return count
+
 
 # ---------------------- TABLE RENDERING ---------------------- #
 def render_table(data: List[Dict[str, Any]], schema: Optional[Any] = None, title: Optional[str] = None):
@@ -1,5 +1,5 @@
 # conviso/core/schema_alias.py
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from conviso.core.logger import log
 
 class SchemaField:
@@ -16,14 +16,18 @@ class SchemaAlias:
         self.name = name
         self.fields = {f.alias: f for f in fields}
         self.display_columns = display_columns
+        self._warned: Set[str] = set()
 
     def resolve_field(self, key: str) -> str:
         """Resolve a user-friendly alias (e.g. 'label') into a GraphQL field."""
-        if key in self.fields:
-            gql = self.fields[key].gql_field
-            log(f"Applied alias: '{key}' → '{gql}'", "green")
-            return gql
-        log(f"Warning: Filter '{key}' not found in schema '{self.name}'", "yellow")
+        field = self.fields.get(key)
+        if field is not None:
+            log(f"Applied alias: '{key}' → '{field.gql_field}'", "green", verbose_only=True)
+            return field.gql_field
+        # Warn once per unknown filter rather than on every resolution
+        if key not in self._warned:
+            self._warned.add(key)
+            log(f"Warning: Filter '{key}' not found in schema '{self.name}'", "yellow")
         return key
 
     def available_fields(self) -> List[str]:
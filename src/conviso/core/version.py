@@ -1,14 +1,19 @@
 """
 Version utilities for Conviso CLI.
  - Reads local VERSION file
- - Optionally checks remote version (can be disabled via env)
+ - Optionally checks remote version (can be disabled via env), cached on disk for a day
  - Compares semver-ish strings safely
 """
 
+import json
 import os
+import tempfile
+import time
 from typing import Optional, Tuple
 from pathlib import Path
 
+from conviso.core.auth import get_config_dir
+
 try:
     import requests
 except Exception:  # pragma: no cover - defensive; requests is a dependency
@@ -17,6 +22,9 @@ except Exception:  # pragma: no cover - defensive; requests is a dependency
 
 VERSION_FILE = Path(__file__).parent.parent / "VERSION"
 DEFAULT_REMOTE_URL = "https://raw.githubusercontent.com/convisolabs/conviso-cli/main/src/conviso/VERSION"
+# A fetched remote version is reused for this long (seconds), so most runs skip the network
+REMOTE_VERSION_CACHE_TTL = 24 * 60 * 60
+REMOTE_VERSION_CACHE_FILE = "remote-version.json"
 
 
 def read_local_version() -> str:
@@ -30,11 +38,10 @@ def read_local_version() -> str:
 def _parse_version(ver: str) -> Tuple[int, ...]:
     parts = []
     for piece in str(ver).strip().split("."):
-        try:
-            parts.append(int(piece))
-        except Exception:
-            # Ignore non-numeric segments; keep comparison lenient
+        # Stop at the first non-numeric segment (e.g. "3-rc1"); keep comparison lenient
+        if not piece.isdecimal():
             break
+        parts.append(int(piece))
     return tuple(parts)
 
 
@@ -44,17 +51,56 @@ def is_newer(remote: str, local: str) -> bool:
     return _parse_version(remote) > _parse_version(local)
 
 
-def fetch_remote_version(url: str = DEFAULT_REMOTE_URL, timeout: float = 3.0) -> Optional[str]:
+def _read_cached_remote_version(url: str, ttl: float) -> Optional[str]:
+    """Return the cached remote version for url when it is younger than ttl seconds."""
+    try:
+        with open(get_config_dir() / REMOTE_VERSION_CACHE_FILE, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("url") == url and time.time() - float(cached.get("fetched_at", 0)) < ttl:
+            return cached.get("version") or None
+    except Exception:
+        pass
+    return None
+
+
+def _store_cached_remote_version(url: str, version: str):
+    """Persist a fetched remote version; written to a temp file and renamed so readers never see partial JSON."""
+    try:
+        cache_dir = get_config_dir()
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".remote-version-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"url": url, "version": version, "fetched_at": time.time()}, f)
+            os.replace(tmp_path, cache_dir / REMOTE_VERSION_CACHE_FILE)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception:
+        pass  # The cache is an optimization; a read-only home must not break the check
+
+
+def fetch_remote_version(
+    url: str = DEFAULT_REMOTE_URL,
+    timeout: float = 3.0,
+    cache_ttl: float = REMOTE_VERSION_CACHE_TTL,
+) -> Optional[str]:
     # Allow overriding via env to support offline environments/tests
     env_ver = os.getenv("CONVISO_CLI_REMOTE_VERSION")
     if env_ver:
         return env_ver.strip()
+    if cache_ttl > 0:
+        cached = _read_cached_remote_version(url, cache_ttl)
+        if cached:
+            return cached
     if not requests:
         return None
     try:
         resp = requests.get(url, timeout=timeout)
         if resp.status_code == 200:
-            return resp.text.strip()
+            version = resp.text.strip()
+            if version and cache_ttl > 0:
+                _store_cached_remote_version(url, version)
+            return version
     except Exception:
         return None
     return None
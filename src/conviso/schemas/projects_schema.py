@@ -17,7 +17,10 @@ Columns:
   - Tags
 """
 
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Sentinel for memo misses, since a cast result may legitimately be falsy
+_MISSING = object()
 
 
 class ProjectSchema:
@@ -116,6 +119,27 @@ class ProjectSchema:
         self._id_like = {"scopeIdEq"}
         self._int_list = {"engagementTypes", "engagementStatuses", "teams"}
         self._str_list = {"idIn", "projectStatusLabelIn", "projectTypeLabelIn", "tags"}
+        # One lookup per filter key; _id_like keys and unknown keys stay strings
+        self._casters: Dict[str, Callable[[str], Any]] = {}
+        self._casters.update(dict.fromkeys(self._int_like, self._cast_int))
+        self._casters.update(dict.fromkeys(self._int_list, self._cast_int_list))
+        self._casters.update(dict.fromkeys(self._str_list, self._cast_str_list))
+        # Per-instance memo of cast results keyed on (key, value)
+        self._cast_memo: Dict[Tuple[str, str], Any] = {}
+
+        # GraphQL selections needed to render each display field
+        self.graphql_selections: Dict[str, str] = {
+            "id": "id",
+            "label": "label",
+            "projectType.label": "projectType { label }",
+            "status": "status",
+            "requirements": "requirementsProgress { done total }",
+            "assets": "assets { id name }",
+            "createdAt": "createdAt",
+            "startDate": "startDate",
+            "endDate": "endDate",
+            "tags": "tags { name }",
+        }
 
         # Sortable raw fields accepted by API's sortBy
         self.sortable_fields: List[str] = [
@@ -136,6 +160,11 @@ class ProjectSchema:
         """Return exact ordered list of display fields."""
         return list(self.display_fields)
 
+    def fields_for_columns(self, columns: Optional[List[str]] = None) -> List[str]:
+        """Return the minimal GraphQL selections needed to render the given display fields."""
+        selected = columns or self.display_fields
+        return [self.graphql_selections[c] for c in selected if c in self.graphql_selections]
+
     # -------------- Filters / aliases -------------- #
 
     def resolve_filter_key(self, key: str) -> str:
@@ -159,27 +188,32 @@ class ProjectSchema:
           - lists for idIn, projectStatusLabelIn, ...
           - IDs (kept as str) for scopeIdEq
         """
-        if key in self._int_like:
-            try:
-                return int(value)
-            except Exception:
-                return value  # keep raw; API will validate
-
-        if key in self._id_like:
-            # Scope ID (Company ID) is an opaque ID; keep string
+        memo_key = (key, value)
+        casted = self._cast_memo.get(memo_key, _MISSING)
+        if casted is _MISSING:
+            caster = self._casters.get(key)
+            # default (and Scope ID, an opaque ID): leave as string
+            casted = self._cast_memo[memo_key] = value if caster is None else caster(value)
+        # Lists are memoized as tuples so callers never share a mutable result
+        return list(casted) if isinstance(casted, tuple) else casted
+
+    @staticmethod
+    def _cast_int(value: str) -> Any:
+        try:
+            return int(value)
+        except Exception:
+            return value  # keep raw; API will validate
+
+    @staticmethod
+    def _cast_int_list(value: str) -> Any:
+        try:
+            return tuple(int(x.strip()) for x in value.split(",") if x.strip())
+        except Exception:
             return value
 
-        if key in self._int_list:
-            try:
-                return [int(x.strip()) for x in value.split(",") if x.strip()]
-            except Exception:
-                return value
-
-        if key in self._str_list:
-            return [x.strip() for x in value.split(",") if x.strip()]
-
-        # default: leave as string
-        return value
+    @staticmethod
+    def _cast_str_list(value: str) -> Any:
+        return tuple(x.strip() for x in value.split(",") if x.strip())
 
     # -------------- Sorting -------------- #
 
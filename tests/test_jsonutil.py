@@ -0,0 +1,57 @@
+"""
+Tests for the shared JSON helpers
+"""
+
+import json
+import math
+
+import pytest
+
+import conviso.core.jsonutil as jsonutil
+
+WIDE = 2 ** 70
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        if jsonutil.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(jsonutil, "orjson", None)
+    return request.param
+
+
+class TestLoads:
+    @pytest.mark.parametrize("wrap", [str, str.encode, lambda s: memoryview(s.encode())])
+    def test_wide_integers_stay_exact(self, backend, wrap):
+        value = jsonutil.loads(wrap(json.dumps({"id": WIDE})))
+        assert value == {"id": WIDE}
+        assert isinstance(value["id"], int)
+
+    def test_nan_is_accepted(self, backend):
+        assert math.isnan(jsonutil.loads('{"x": NaN}')["x"])
+
+    def test_invalid_raises_json_error(self, backend):
+        with pytest.raises(json.JSONDecodeError):
+            jsonutil.loads(b"{not json")
+
+
+class TestDumps:
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            ({}, json.dumps({"b": 1, "a": [WIDE]}, separators=(",", ":"))),
+            ({"indent": True}, json.dumps({"b": 1, "a": [WIDE]}, indent=2)),
+            ({"sort_keys": True, "newline": True}, json.dumps({"b": 1, "a": [WIDE]}, sort_keys=True, separators=(",", ":")) + "\n"),
+        ],
+    )
+    def test_wide_integers_fall_back(self, backend, kwargs, expected):
+        assert jsonutil.dumps({"b": 1, "a": [WIDE]}, **kwargs) == expected.encode("utf-8")
+
+    def test_matches_stdlib(self, backend):
+        data = {"name": "café", "n": [1, 2.5, None, True]}
+        assert jsonutil.dumps(data, indent=True) == json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def test_ensure_ascii(self, backend):
+        assert jsonutil.dumps({"name": "café"}, ensure_ascii=True) == b'{"name":"caf\\u00e9"}'
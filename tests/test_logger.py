@@ -0,0 +1,37 @@
+"""
+Tests for the console logger
+"""
+
+import pytest
+
+import conviso.core.logger as logger
+
+
+@pytest.fixture
+def printed(monkeypatch):
+    calls = []
+    monkeypatch.setattr(logger.console, "print", lambda *args, **kwargs: calls.append((args, kwargs)))
+    monkeypatch.setattr(logger, "QUIET", False)
+    monkeypatch.setattr(logger, "VERBOSE", False)
+    return calls
+
+
+class TestLog:
+    """Tests for log() filtering and styling"""
+
+    def test_message_is_printed_without_markup(self, printed):
+        logger.log("filter [label] applied", "green")
+        assert printed == [(("filter [label] applied",), {"style": "green", "markup": False})]
+
+    def test_quiet_suppresses_unless_forced(self, printed, monkeypatch):
+        monkeypatch.setattr(logger, "QUIET", True)
+        logger.log("hidden")
+        logger.log("shown", force=True)
+        assert [args[0] for args, _ in printed] == ["shown"]
+
+    def test_verbose_only(self, printed, monkeypatch):
+        logger.log("detail", verbose_only=True)
+        assert printed == []
+        monkeypatch.setattr(logger, "VERBOSE", True)
+        logger.log("detail", verbose_only=True)
+        assert len(printed) == 1
@@ -0,0 +1,103 @@
+"""
+Tests for output manager exports
+"""
+
+import json
+import os
+import stat
+
+import pytest
+
+from conviso.core.output_manager import export_data, export_data_stream
+
+
+ROWS = [
+    {"id": 1, "label": "Café\nline", "tags": "a, b"},
+    {"id": 2, "label": "Second"},
+]
+
+
+class TestExportDataStream:
+    """Streaming exports must match the materialized export_data output"""
+
+    @pytest.mark.parametrize("fmt", ["json", "csv", "ndjson"])
+    def test_stream_matches_export_data(self, tmp_path, fmt):
+        expected = tmp_path / f"expected.{fmt}"
+        streamed = tmp_path / f"streamed.{fmt}"
+
+        export_data(ROWS, fmt=fmt, output=str(expected))
+        count = export_data_stream(iter(ROWS), fmt=fmt, output=str(streamed))
+
+        assert count == len(ROWS)
+        assert streamed.read_bytes() == expected.read_bytes()
+
+    def test_json_matches_stdlib_layout(self, tmp_path):
+        out = tmp_path / "rows.json"
+        export_data_stream(iter(ROWS), fmt="json", output=str(out))
+
+        filled = [{k: row.get(k, "") for k in ROWS[0]} for row in ROWS]
+        assert out.read_text(encoding="utf-8") == json.dumps(filled, indent=2, ensure_ascii=False)
+
+    def test_empty_stream_json_with_schema(self, tmp_path):
+        class Schema:
+            display_headers = {"id": "ID"}
+
+        out = tmp_path / "empty.json"
+        count = export_data_stream(iter([]), schema=Schema(), fmt="json", output=str(out))
+
+        assert count == 0
+        assert out.read_text(encoding="utf-8") == "[]"
+
+    @pytest.mark.parametrize("fmt", ["json", "csv", "ndjson"])
+    def test_failed_producer_keeps_previous_file(self, tmp_path, fmt):
+        out = tmp_path / f"rows.{fmt}"
+        out.write_text("previous", encoding="utf-8")
+
+        def rows():
+            yield from ROWS
+            raise RuntimeError("page fetch failed")
+
+        with pytest.raises(RuntimeError):
+            export_data_stream(rows(), fmt=fmt, output=str(out))
+
+        assert out.read_text(encoding="utf-8") == "previous"
+        assert [p.name for p in tmp_path.iterdir()] == [out.name]
+
+    @pytest.mark.skipif(os.name != "posix", reason="needs a device node")
+    @pytest.mark.parametrize("fmt", ["json", "csv", "ndjson"])
+    def test_device_target_is_written_in_place(self, fmt):
+        assert export_data_stream(iter(ROWS), fmt=fmt, output=os.devnull) == len(ROWS)
+
+    def test_symlink_target_is_written_through(self, tmp_path):
+        real = tmp_path / "real.csv"
+        real.write_text("previous", encoding="utf-8")
+        link = tmp_path / "link.csv"
+        link.symlink_to(real)
+
+        export_data_stream(iter(ROWS), fmt="csv", output=str(link))
+
+        assert link.is_symlink()
+        assert real.read_text(encoding="utf-8").startswith("id,label,tags")
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+    def test_existing_mode_is_kept(self, tmp_path):
+        out = tmp_path / "rows.json"
+        out.write_text("previous", encoding="utf-8")
+        out.chmod(0o600)
+
+        export_data_stream(iter(ROWS), fmt="json", output=str(out))
+
+        assert stat.S_IMODE(out.stat().st_mode) == 0o600
+        assert json.loads(out.read_text(encoding="utf-8"))[0]["id"] == 1
+
+
+class TestNdjson:
+    """Tests for newline-delimited JSON output"""
+
+    def test_one_object_per_line(self, tmp_path):
+        out = tmp_path / "rows.ndjson"
+        export_data(ROWS, fmt="ndjson", output=str(out))
+
+        lines = out.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2]
+        assert json.loads(lines[0])["label"] == "Café\nline"
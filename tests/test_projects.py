@@ -0,0 +1,81 @@
+"""
+Tests for projects command helpers
+"""
+
+from conviso.commands.projects import (
+    _cast_ids,
+    _csv_ints,
+    _csv_strs,
+    _parse_project_filters,
+)
+from conviso.schemas.projects_schema import ProjectSchema, schema
+
+
+class TestCsvHelpers:
+    """Tests for the shared comma-separated option parsers"""
+
+    def test_csv_strs_trims_and_drops_blanks(self):
+        assert _csv_strs(" a, b ,,c ") == ["a", "b", "c"]
+
+    def test_csv_strs_none_when_not_given(self):
+        assert _csv_strs(None) is None
+
+    def test_csv_strs_empty_string_means_empty_list(self):
+        assert _csv_strs("") == []
+
+    def test_csv_ints_skips_invalid(self):
+        assert _csv_ints("1, x, 3", "asset") == [1, 3]
+
+    def test_csv_ints_none_when_not_given(self):
+        assert _csv_ints(None) is None
+
+
+class TestCastIds:
+    """Tests for casting API IDs to ints"""
+
+    def test_all_numeric(self):
+        assert _cast_ids(["1", 2, None], "Asset") == [1, 2]
+
+    def test_skips_non_numeric(self):
+        assert _cast_ids(["1", "abc", "3"], "Asset") == [1, 3]
+
+
+class TestParseProjectFilters:
+    """Tests for the --filter Typer callback"""
+
+    def test_resolves_aliases_and_casts(self):
+        params = dict(_parse_project_filters(["id=12", "status=DONE"]))
+        assert params == {"idEq": 12, "projectStatusLabelEq": "DONE"}
+
+    def test_assignee_kept_for_client_side_filter(self):
+        params = dict(_parse_project_filters(["assignee=User@Company.com"]))
+        assert params == {"assignee": "user@company.com"}
+
+    def test_invalid_syntax_ignored(self):
+        assert _parse_project_filters(["oops"]) == []
+
+    def test_no_filters(self):
+        assert _parse_project_filters(None) == []
+
+
+class TestCastFilterValue:
+    """Tests for ProjectSchema filter value casting"""
+
+    def test_casts_by_key(self):
+        assert schema.cast_filter_value("idEq", "12") == 12
+        assert schema.cast_filter_value("idEq", "x") == "x"
+        assert schema.cast_filter_value("teams", "1, 2") == [1, 2]
+        assert schema.cast_filter_value("tags", "a, ,b") == ["a", "b"]
+        assert schema.cast_filter_value("scopeIdEq", "7") == "7"
+        assert schema.cast_filter_value("labelCont", "7") == "7"
+
+    def test_cached_lists_are_not_shared(self):
+        first = schema.cast_filter_value("tags", "a,b")
+        first.append("c")
+        assert schema.cast_filter_value("tags", "a,b") == ["a", "b"]
+
+    def test_memo_is_per_instance(self):
+        other = ProjectSchema()
+        assert other.cast_filter_value("idEq", "3") == 3
+        assert ("idEq", "3") in other._cast_memo
+        assert ("idEq", "3") not in ProjectSchema()._cast_memo
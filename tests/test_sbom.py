@@ -0,0 +1,94 @@
+"""
+Tests for SBOM command helpers
+"""
+
+import json
+import uuid
+
+import pytest
+
+from conviso.commands.sbom import (
+    _cyclonedx_component,
+    _format_issues_by_severity,
+    _iter_cyclonedx_chunks,
+    _map_ecosystem,
+    _new_serial_number,
+    _sbom_row,
+)
+
+
+class TestFormatIssuesBySeverity:
+    """Tests for the compact severity summary shown per component"""
+
+    def test_orders_and_hides_zero_counts(self):
+        issues = {"low": 2, "critical": {"count": 1}, "high": 0}
+        assert _format_issues_by_severity(issues) == "CRITICAL:1, LOW:2"
+
+    def test_all_zero_shows_explicit_zeros(self):
+        assert _format_issues_by_severity({"HIGH": 0, "LOW": 0}) == "HIGH:0, LOW:0"
+
+    def test_json_string_and_unknown_keys(self):
+        assert _format_issues_by_severity('{"medium": 3, "info": 4}') == "MEDIUM:3, INFO:4"
+
+    def test_empty(self):
+        assert _format_issues_by_severity({}) == "-"
+
+
+class TestMapEcosystem:
+    """Tests for mapping package managers and purls to OSV ecosystems"""
+
+    def test_purl_wins(self):
+        assert _map_ecosystem("pip", "pkg:npm/left-pad@1.0") == "npm"
+
+    def test_package_manager_alias(self):
+        assert _map_ecosystem("Gradle", None) == "Maven"
+
+    def test_unknown(self):
+        assert _map_ecosystem(None, None) == "UNKNOWN"
+
+
+class TestSbomRow:
+    """Tests for flattening API components into list rows"""
+
+    def test_full_component(self):
+        comp = {
+            "id": "1", "name": "lodash", "version": "4.17.0", "technology": "js",
+            "license": "MIT", "packageManager": "npm", "issuesBySeverity": {"high": 2},
+            "asset": {"id": 9, "name": "web"},
+        }
+        row = _sbom_row(comp)
+        assert row["issuesBySeverity"] == "HIGH:2"
+        assert (row["asset"], row["assetId"]) == ("web", 9)
+
+    def test_missing_fields_default_to_none(self):
+        row = _sbom_row({"name": "x"})
+        assert row["name"] == "x"
+        assert row["license"] is None
+        assert row["issuesBySeverity"] == "-"
+        assert row["asset"] is None
+
+
+class TestSerialNumber:
+    """Tests for CycloneDX serial numbers"""
+
+    def test_is_random_v4_uuid_urn(self):
+        serial = _new_serial_number()
+        assert serial.startswith("urn:uuid:")
+        parsed = uuid.UUID(serial[len("urn:uuid:"):])
+        assert parsed.version == 4
+        assert serial != _new_serial_number()
+
+
+class TestCycloneDxChunks:
+    """Streamed CycloneDX output must match encoding the whole document at once"""
+
+    @pytest.mark.parametrize("count", [0, 1, 3])
+    def test_matches_json_dumps(self, count):
+        header = {"bomFormat": "CycloneDX", "specVersion": "1.5", "version": 1}
+        rows = [{"name": f"pkg{i}", "version": "1.0", "license": "MIT", "assetId": i} for i in range(count)]
+        comps = [_cyclonedx_component(r) for r in rows]
+
+        streamed = b"".join(_iter_cyclonedx_chunks(header, iter(comps)))
+
+        assert json.loads(streamed) == {**header, "components": comps}
+        assert streamed.decode("utf-8") == json.dumps({**header, "components": comps}, indent=2)
@@ -0,0 +1,30 @@
+"""
+Tests for schema alias resolution
+"""
+
+import pytest
+
+import conviso.core.schema_alias as schema_alias
+from conviso.core.schema_alias import SchemaAlias, SchemaField
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    calls = []
+    monkeypatch.setattr(schema_alias, "log", lambda message, *args, **kwargs: calls.append((message, kwargs)))
+    return calls
+
+
+class TestResolveField:
+    """Tests for SchemaAlias.resolve_field"""
+
+    def test_alias_logs_only_in_verbose_mode(self, logged):
+        schema = SchemaAlias("projects", [SchemaField("label", "label_cont", "Label")], {})
+        assert schema.resolve_field("label") == "label_cont"
+        assert logged == [("Applied alias: 'label' → 'label_cont'", {"verbose_only": True})]
+
+    def test_unknown_filter_warns_once(self, logged):
+        schema = SchemaAlias("projects", [], {})
+        assert schema.resolve_field("nope") == "nope"
+        assert schema.resolve_field("nope") == "nope"
+        assert len(logged) == 1
@@ -0,0 +1,795 @@
+"""
+Tests for task command helpers
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+import pytest
+from typer.testing import CliRunner
+
+import conviso.commands.tasks as tasks
+from conviso.commands.tasks import (
+    _build_requirement_label,
+    _clean_description,
+    _matches_prefix,
+    _normalize_asset_key,
+    _normalize_yaml_steps,
+    _parse_nmap_xml,
+    _parse_nuclei_json_lines,
+    _parse_scan_json_lines,
+    _render_value,
+)
+
+
+class TestCleanDescription:
+    """Tests for turning activity HTML into YAML text"""
+
+    def test_block_tags_and_breaks_become_newlines(self):
+        desc = '<p class="x">name: scan</p><div>steps:<br/>- run: echo</div>'
+        assert _clean_description(desc) == "name: scan\nsteps:\n- run: echo"
+
+    def test_unescapes_entities_and_nbsp(self):
+        assert _clean_description("<p>a&nbsp;&amp;&lt;b&gt;</p>") == "a &<b>"
+
+    def test_empty(self):
+        assert _clean_description("") == ""
+
+
+class TestNormalizeYamlSteps:
+    """Tests for indenting unindented step lists"""
+
+    def test_indents_step_items(self):
+        text = "name: x\nsteps:\n- run: a\nother: 1"
+        assert _normalize_yaml_steps(text) == "name: x\nsteps:\n  - run: a\nother: 1"
+
+    def test_without_steps_header_is_unchanged(self):
+        assert _normalize_yaml_steps("name: x\n- run: a") == "name: x\n- run: a"
+        text = "name: x\r\n- run: a"
+        assert _normalize_yaml_steps(text) is text
+
+    def test_spaced_header_is_recognized(self):
+        assert _normalize_yaml_steps("  steps :\n- run: a") == "  steps :\n  - run: a"
+
+
+class TestValidateTaskYaml:
+    """Tests for the activity YAML validator"""
+
+    def test_valid_single_step(self):
+        result = tasks._validate_task_yaml("<p>name: Scan</p><p>steps:</p><p>- id: nmap</p>")
+        assert result == {"ok": True, "reason": "", "name": "Scan", "steps": 1}
+
+    def test_parses_once_when_normalization_changes_nothing(self, monkeypatch):
+        loads = []
+        original = tasks._yaml_load
+
+        def _tracking(text):
+            loads.append(text)
+            return original(text)
+
+        monkeypatch.setattr(tasks, "_yaml_load", _tracking)
+        tasks._parse_task_desc.cache_clear()
+        assert tasks._validate_task_yaml("name: Scan\nsteps:")["reason"] == "missing_steps"
+        assert len(loads) == 1
+
+    def test_repeated_description_is_parsed_once(self, monkeypatch):
+        loads = []
+        original = tasks._yaml_load
+
+        def _tracking(text):
+            loads.append(text)
+            return original(text)
+
+        monkeypatch.setattr(tasks, "_yaml_load", _tracking)
+        tasks._parse_task_desc.cache_clear()
+        first = tasks._validate_task_yaml("name: Scan\nsteps:\n- id: nmap")
+        first["ok"] = False
+        assert tasks._validate_task_yaml("name: Scan\nsteps:\n- id: nmap")["ok"] is True
+        assert len(loads) == 1
+
+    def test_parse_task_desc_reports_load_error(self):
+        cleaned, data, load_error = tasks._parse_task_desc("<p>a: [</p>")
+        assert cleaned == "a: ["
+        assert data is None
+        assert load_error
+
+    def test_failures(self):
+        assert tasks._validate_task_yaml("")["reason"] == "empty_description"
+        assert tasks._validate_task_yaml("a: [")["reason"] == "invalid_yaml"
+        assert tasks._validate_task_yaml("name: x")["reason"] == "missing_steps"
+        assert tasks._validate_task_yaml("steps:\n- id: a\n- id: b")["reason"] == "steps=2"
+
+
+class TestRequirementPrefix:
+    """Tests for TASK prefix matching on requirement labels"""
+
+    def test_matches_case_insensitively(self):
+        assert _matches_prefix("task - Nmap scan", "TASK")
+        assert _matches_prefix("TASK: scan", "TASK:")
+
+    def test_separator_is_optional(self):
+        assert _matches_prefix("TASKS backlog", "TASK")
+
+    def test_no_match(self):
+        assert not _matches_prefix("Scan", "TASK")
+        assert not _matches_prefix("", "TASK")
+        assert not _matches_prefix("TASK", " - ")
+
+    def test_prefix_matcher_is_reusable(self):
+        matches = tasks._prefix_matcher(" Task: ")
+        assert [matches(label) for label in ("TASK - a", " task b", "Other", "")] == [True, True, False, False]
+
+    def test_build_label_adds_prefix_once(self):
+        assert _build_requirement_label("TASK", "Scan") == "TASK - Scan"
+        assert _build_requirement_label("TASK", "TASK - Scan") == "TASK - Scan"
+
+
+class TestNormalizeAssetKey:
+    """Tests for reducing URLs to asset host keys"""
+
+    def test_strips_scheme_and_path(self):
+        assert _normalize_asset_key(" HTTPS://example.com:8443/path ") == "example.com:8443"
+
+    def test_none(self):
+        assert _normalize_asset_key(None) == ""
+
+    def test_index_keeps_raw_names_that_share_a_host(self):
+        by_name = {}
+        tasks._index_asset_name(by_name, "https://a.com/app1", 1)
+        tasks._index_asset_name(by_name, "https://a.com/app2", 2)
+        tasks._index_asset_name(by_name, "b.com", 3)
+        assert by_name == {"https://a.com/app1": 1, "a.com": 2, "https://a.com/app2": 2, "b.com": 3}
+
+    def test_build_matches_index(self):
+        assets = [
+            {"name": "https://a.com/app1", "id": 1},
+            {"name": None, "id": 9},
+            {"name": "a.com", "id": 2},
+            {"name": "http://a.com/", "id": 3},
+            {"id": 4},
+        ]
+        expected = {}
+        for asset in assets:
+            if asset.get("name"):
+                tasks._index_asset_name(expected, asset["name"], asset["id"])
+        assert tasks._build_assets_by_name(assets) == expected
+
+    def test_cached_asset_id_prefers_raw_then_normalized(self):
+        cache = {"https://a.com/x": 1, "b.com": 0}
+        assert tasks._cached_asset_id(cache, "https://a.com/x") == 1
+        assert tasks._cached_asset_id(cache, "http://b.com/") == 0
+        assert tasks._cached_asset_id(cache, "c.com") is tasks._MISSING
+
+
+NMAP_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE nmaprun>
+<nmaprun scanner="nmap">
+<host><status state="up"/><address addr="aa:bb" addrtype="mac"/><address addr="10.0.0.1" addrtype="ipv4"/>
+<hostnames><hostname name="a.local"/></hostnames></host>
+<host><status state="down"/><address addr="10.0.0.2" addrtype="ipv4"/></host>
+<host><status state="up"/><address addr="aa:cc" addrtype="mac"/></host>
+<runstats><finished/></runstats>
+</nmaprun>
+"""
+
+
+class TestUrlHelpers:
+    """Tests for host/scheme/port extraction from scanner URLs"""
+
+    def test_targets_to_hosts(self):
+        targets = ["https://a.com:8443/x;p?q=1", "b.com", "", "  ", "http://[::1]:80/"]
+        assert tasks._targets_to_hosts(targets) == ["a.com", "b.com", "::1"]
+
+    @pytest.mark.parametrize(
+        "target",
+        [
+            "HTTPS://Example.COM:8443/a",
+            "host_1.local:22",
+            "http://user:pw@a.com/",
+            "ftp://f.com/x",
+            "a.com/redirect?u=http://b.com",
+            "a.com/x://y",
+            "https://[",
+            "http://a.com:80://x",
+        ],
+    )
+    def test_target_host_matches_urlsplit(self, target):
+        candidate = target if "://" in target else f"http://{target}"
+        try:
+            expected = urlsplit(candidate).hostname or tasks._normalize_asset_key(candidate)
+        except ValueError:
+            expected = tasks._normalize_asset_key(candidate)
+        assert tasks._target_host(target) == expected
+
+    def test_infer_scheme_port(self):
+        assert tasks._infer_scheme_port("https://a.com/x", None, None) == ("https", 443)
+        assert tasks._infer_scheme_port("a.com:8080", None, None) == (None, 8080)
+
+
+class TestFetchStepInputs:
+    """Tests for resolving a step's asset and target inputs"""
+
+    def test_resolves_both_inputs(self, monkeypatch):
+        monkeypatch.setattr(tasks, "_fetch_assets", lambda company_id, tags=None: [{"name": "a", "tags": tags}])
+        monkeypatch.setattr(tasks, "_fetch_project_assets", lambda company_id, project_id: [{"name": "p1"}, {"name": None}])
+        inputs = {"assets": {"query": {"tags": "web"}}, "targets": {"source": "project.assets"}}
+        assets, targets = tasks._fetch_step_inputs(1, 2, inputs)
+        assert assets == [{"name": "a", "tags": "web"}]
+        assert targets == ["p1"]
+
+    def test_missing_inputs_are_none(self):
+        assert tasks._fetch_step_inputs(1, 2, {}) == (None, None)
+
+    def test_cache_reuses_matching_fetches(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(tasks, "_fetch_assets", lambda company_id, tags=None: calls.append(tags) or [{"name": tags}])
+        cache = {}
+        for tags in ("web", "web", "api"):
+            assets, _ = tasks._fetch_step_inputs(1, 2, {"assets": {"query": {"tags": tags}}}, cache)
+            assert assets == [{"name": tags}]
+        assert calls == ["web", "api"]
+
+
+class TestExportLines:
+    """Tests for the asset/target export files"""
+
+    def test_writes_one_value_per_line(self, tmp_path):
+        path = tmp_path / "out" / "hosts.txt"
+        tasks._export_lines(str(path), iter(["a.com", 10, "é"]))
+        assert path.read_text(encoding="utf-8") == "a.com\n10\né\n"
+
+    def test_existing_directory_skips_makedirs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tasks.os, "makedirs", lambda *a, **k: pytest.fail("makedirs called"))
+        tasks._export_lines(str(tmp_path / "hosts.txt"), ["a"])
+        assert (tmp_path / "hosts.txt").read_text() == "a\n"
+
+    def test_empty_values_truncate_file(self, tmp_path):
+        path = tmp_path / "hosts.txt"
+        path.write_text("old\n")
+        tasks._export_lines(str(path), [])
+        assert path.read_text() == ""
+
+
+class TestParseNmapXml:
+    """Tests for extracting live hosts from nmap XML"""
+
+    @pytest.mark.parametrize("use_lxml", [True, False])
+    def test_live_hosts(self, monkeypatch, use_lxml):
+        if not use_lxml:
+            monkeypatch.setattr(tasks, "lxml_etree", None)
+            monkeypatch.setattr(tasks, "NMAP_XML_CHUNK_SIZE", 16)
+        elif tasks.lxml_etree is None:
+            pytest.skip("lxml not installed")
+
+        assert _parse_nmap_xml(NMAP_XML) == [
+            {"host": {"address": "10.0.0.1", "hostname": "a.local"}},
+            {"host": {"address": "aa:cc", "hostname": None}},
+        ]
+
+    def test_stream_source(self, monkeypatch):
+        monkeypatch.setattr(tasks, "lxml_etree", None)
+        monkeypatch.setattr(tasks, "NMAP_XML_CHUNK_SIZE", 16)
+
+        assert _parse_nmap_xml(io.StringIO(NMAP_XML)) == _parse_nmap_xml(NMAP_XML)
+        assert _parse_nmap_xml(iter(NMAP_XML.splitlines(keepends=True))) == _parse_nmap_xml(NMAP_XML)
+
+    def test_streamed_from_command_stdout(self, tmp_path):
+        xml_file = tmp_path / "scan.xml"
+        xml_file.write_text(NMAP_XML)
+        cmd = f"{sys.executable} -c 'print(open(\"{xml_file}\").read())'"
+
+        code, _, output = tasks._run_command(cmd, tasks._PARSERS["nmap-xml"])
+        assert code == 0
+        assert [item["host"]["address"] for item in output] == ["10.0.0.1", "aa:cc"]
+
+    def test_failed_command_reports_return_code(self):
+        cmd = f"{sys.executable} -c 'import sys; print(\"<nmaprun><host>\"); sys.stderr.write(\"boom\"); sys.exit(3)'"
+
+        code, stderr, output = tasks._run_command(cmd, _parse_nmap_xml)
+        assert (code, stderr, output) == (3, "boom", None)
+
+    def test_truncated_xml_from_successful_command_raises(self):
+        cmd = f"{sys.executable} -c 'print(\"<nmaprun><host>\")'"
+
+        # ElementTree.ParseError and lxml's XMLSyntaxError are both SyntaxErrors
+        with pytest.raises(SyntaxError):
+            tasks._run_command(cmd, _parse_nmap_xml)
+
+    def test_file_source_is_fed_line_by_line(self, tmp_path, monkeypatch):
+        path = tmp_path / "scan.xml"
+        path.write_text(NMAP_XML, encoding="utf-8")
+        expected = _parse_nmap_xml(NMAP_XML)
+        fed = []
+        monkeypatch.setattr(tasks, "_xml_chunks", lambda source: (fed.append(chunk) or chunk for chunk in source))
+
+        lines = tasks._iter_parse_lines({"source": "file", "file": str(path)}, "")
+        assert tasks._PARSERS["nmap-xml"](lines) == expected
+        assert fed == NMAP_XML.splitlines(keepends=True)
+
+
+class TestJsonLinesParsers:
+    """Tests for nuclei and generic scanner JSON-lines parsing"""
+
+    def test_wide_integers_keep_precision(self):
+        items = _parse_scan_json_lines('{"title": "t", "id": 123456789012345678901234567890}')
+        assert items[0]["raw"]["id"] == 123456789012345678901234567890
+
+    def test_nuclei_finding_fields(self):
+        line = (
+            '{"template-id": "tls-old", "info": {"name": "Old TLS", "severity": "medium", "reference": ["https://ref"]},'
+            ' "host": "example.com", "matched-at": "example.com:8443", "scheme": "https", "request": "GET / HTTP/1.1"}'
+        )
+        [item] = _parse_nuclei_json_lines(f"\n{line}\nnot json\n")
+        finding = item["finding"]
+        assert finding["name"] == "Old TLS"
+        assert finding["url"] == "https://example.com:8443"
+        assert (finding["scheme"], finding["port"], finding["method"]) == ("https", 8443, "GET")
+        assert finding["solution"] == "https://ref"
+
+    def test_scan_lines_normalize_aliases(self):
+        text = '{"title": "T", "asset": "a.com", "matchedAt": "https://a.com"}\n[1, 2]\n{"finding": {"name": "N"}}'
+        findings = [item["finding"] for item in _parse_scan_json_lines(text)]
+        assert findings[0] == {"title": "T", "asset": "a.com", "matchedAt": "https://a.com", "name": "T", "host": "a.com", "url": "https://a.com"}
+        assert findings[1] == {"name": "N"}
+
+
+    def test_text_lines_is_lazy_and_newline_only(self):
+        assert list(tasks._text_lines("a\r\nb\n\nc")) == ["a\r", "b", "", "c"]
+        assert list(tasks._text_lines("x\n")) == ["x"]
+        assert list(tasks._text_lines("")) == []
+
+    def test_line_separator_inside_json_string(self):
+        text = '{"name": "A\u2028B"}\n{"name": "C"}'
+        names = [item["finding"]["name"] for item in _parse_scan_json_lines(text)]
+        assert names == ["A\u2028B", "C"]
+
+    def test_scan_lines_streamed_from_file(self, tmp_path):
+        path = tmp_path / "scan.jsonl"
+        path.write_text('{"name": "A"}\r\n\n{"name": "B"}\n', encoding="utf-8")
+        lines = tasks._iter_parse_lines({"source": "file", "file": str(path)}, "")
+        assert [item["finding"]["name"] for item in _parse_scan_json_lines(lines)] == ["A", "B"]
+
+    def test_parse_source_requires_file(self):
+        with pytest.raises(ValueError):
+            list(tasks._iter_parse_lines({"source": "file"}, ""))
+
+
+class TestRenderValue:
+    """Tests for ${path} template rendering"""
+
+    def test_record_then_context_lookup(self):
+        record = {"finding": {"name": "XSS"}}
+        context = {"company": {"id": 7}}
+        rendered = _render_value({"t": "${finding.name} @ ${ company.id }", "l": ["${missing}"]}, record, context)
+        assert rendered == {"t": "XSS @ 7", "l": [""]}
+
+    def test_literal_text_is_kept(self):
+        template = "no placeholders"
+        assert _render_value(template, {}, {}) is template
+        assert _render_value("a${x}b${ y }${}c", {"x": 1, "y": "Y"}, {}) == "a1bY${}c"
+
+    def test_template_is_split_once(self):
+        tasks._compile_template.cache_clear()
+        for host in ("a", "b", "c"):
+            assert _render_value("https://${host}/x", {"host": host}, {}) == f"https://{host}/x"
+        assert tasks._compile_template("https://${host}/x") == ((("https://", "host", None),), "/x")
+        assert tasks._compile_template.cache_info().misses == 1
+
+    def test_by_name_field_is_split_at_compile_time(self):
+        assert tasks._compile_template("${ assets.by_name:finding.host }") == (
+            (("", "assets.by_name:finding.host", "finding.host"),),
+            "",
+        )
+
+    def test_assets_by_name_uses_normalized_key(self):
+        context = {"assets": {"by_name": {"example.com": 5}}}
+        assert _render_value("${assets.by_name:host}", {"host": "https://example.com/login"}, context) == "5"
+
+    def test_assets_by_name_prefers_raw_key(self):
+        context = {"assets": {"by_name": {"https://example.com/a": 1, "example.com": 2}}}
+        assert _render_value("${assets.by_name:url}", {"url": "https://example.com/a"}, context) == "1"
+        assert _render_value("${assets.by_name:url}", {"url": "https://example.com/b"}, context) == "2"
+
+    def test_cache_resolves_each_key_once(self, monkeypatch):
+        calls = []
+        original = tasks._get_path_value
+
+        def _tracking(path, record, context):
+            calls.append(path)
+            return original(path, record, context)
+
+        monkeypatch.setattr(tasks, "_get_path_value", _tracking)
+        cache = {}
+        template = {"a": "${host}", "b": ["${host}:${port}"]}
+        rendered = _render_value(template, {"host": "h", "port": 80}, {}, cache)
+        assert rendered == {"a": "h", "b": ["h:80"]}
+        assert calls == ["host", "port"]
+
+
+class TestFindAssetByName:
+    """Tests for resolving an asset ID by exact name across pages"""
+
+    @staticmethod
+    def _fake(pages, calls):
+        def _graphql_request(query, variables, log_request=True):
+            calls.append(variables["page"])
+            return {"assets": {"collection": pages[variables["page"] - 1], "metadata": {"totalPages": len(pages)}}}
+        return _graphql_request
+
+    def test_match_on_later_page(self, monkeypatch):
+        calls = []
+        pages = [[{"id": "1", "name": "web-1"}], [{"id": "2", "name": "web"}], [{"id": "3", "name": "web"}]]
+        monkeypatch.setattr(tasks, "graphql_request", self._fake(pages, calls))
+        assert tasks._find_asset_by_name(1, "web") == 2
+
+    def test_first_page_match_skips_remaining_pages(self, monkeypatch):
+        calls = []
+        pages = [[{"id": "7", "name": "web"}], [], []]
+        monkeypatch.setattr(tasks, "graphql_request", self._fake(pages, calls))
+        assert tasks._find_asset_by_name(1, "web") == 7
+        assert calls == [1]
+
+    def test_no_match(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(tasks, "graphql_request", self._fake([[], [{"id": "1", "name": "other"}]], calls))
+        assert tasks._find_asset_by_name(1, "web") is None
+        assert sorted(calls) == [1, 2]
+
+
+class TestCreateVulnerability:
+    """Tests for the per-type vulns.create GraphQL inputs"""
+
+    BASE = {
+        "assetId": 1, "title": "T", "description": "D", "solution": "S", "impactLevel": "LOW",
+        "probabilityLevel": "LOW", "severity": "LOW", "status": "IDENTIFIED", "companyId": 9, "category": "",
+    }
+
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(tasks, "graphql_request", lambda query, variables: calls.append(variables["input"]) or {})
+        return calls
+
+    def test_dast_drops_unsupported_keys(self, sent):
+        payload = dict(self.BASE, type="dast", method="get", scheme="https", url="https://a", port="443",
+                       request="GET /", response="200")
+        tasks._create_vulnerability(payload, apply=True)
+        [sent_input] = sent
+        assert "status" not in sent_input and "companyId" not in sent_input and "category" not in sent_input
+        assert (sent_input["method"], sent_input["scheme"], sent_input["port"]) == ("GET", "HTTPS", 443)
+
+    def test_network_keeps_status(self, sent):
+        payload = dict(self.BASE, type="NETWORK", address="10.0.0.1", protocol="tcp", port=22, attackVector="NETWORK")
+        tasks._create_vulnerability(payload, apply=True)
+        [sent_input] = sent
+        assert sent_input["status"] == "IDENTIFIED"
+        assert "companyId" not in sent_input
+
+    def test_missing_required_field(self, sent):
+        with pytest.raises(ValueError, match="WEB requires method"):
+            tasks._create_vulnerability(dict(self.BASE, type="WEB"), apply=True)
+        assert sent == []
+
+
+    def test_batch_sends_every_payload(self, sent):
+        payloads = [
+            dict(self.BASE, type="NETWORK", title=f"T{i}", address="10.0.0.1", protocol="tcp", port=22, attackVector="N")
+            for i in range(5)
+        ]
+        tasks._create_vulnerabilities_batch(payloads, apply=True, workers=3)
+        assert sorted(item["title"] for item in sent) == [f"T{i}" for i in range(5)]
+
+    def test_batch_dry_run_and_errors(self, sent):
+        tasks._create_vulnerabilities_batch([dict(self.BASE, type="WEB")], apply=False)
+        assert sent == []
+        with pytest.raises(ValueError):
+            tasks._create_vulnerabilities_batch([dict(self.BASE, type="WEB")], apply=True)
+
+    def test_batch_stops_sending_after_a_failure(self, monkeypatch):
+        sent = []
+
+        def _create(payload, apply):
+            if payload["title"] == "T0":
+                raise RuntimeError("rejected")
+            time.sleep(0.01)
+            sent.append(payload["title"])
+
+        monkeypatch.setattr(tasks, "_create_vulnerability", _create)
+        payloads = [dict(self.BASE, title=f"T{i}") for i in range(20)]
+
+        with pytest.raises(RuntimeError, match="rejected"):
+            tasks._create_vulnerabilities_batch(payloads, apply=True, workers=2)
+        assert len(sent) < 19
+
+
+class TestApplyActions:
+    """Tests for planning and applying YAML actions"""
+
+    def test_dry_run_leaves_shared_empty_fallback_untouched(self):
+        actions = [{"type": "vulns.create", "map": {"title": "${finding.name}", "assetId": "1", "description": "d", "severity": "LOW"}}]
+        records = [{"finding": {"name": "X", "type": "dns"}}, {"finding": {"name": "Y", "url": "https://a"}}]
+        planned = list(tasks._actions_from_parsed(actions, records, {"company": {"id": 1}}))
+        assert planned[0]["defaults"] is tasks._EMPTY
+
+        counts = tasks._apply_actions(planned, 1, apply=False)
+
+        assert counts["skipped"] == 2
+        assert tasks._EMPTY == {}
+
+
+    def test_plan_is_lazy_and_item_major(self):
+        actions = [{"type": "assets.create"}, {"type": "vulns.create"}]
+        planned = tasks._actions_from_parsed(actions, [{"n": 1}, {"n": 2}], {})
+        assert not isinstance(planned, list)
+        assert [(e["record"]["n"], e["type"]) for e in planned] == [
+            (1, "assets.create"), (1, "vulns.create"), (2, "assets.create"), (2, "vulns.create"),
+        ]
+
+    def test_enrich_resolves_each_asset_name_once(self, monkeypatch):
+        lookups = []
+        monkeypatch.setattr(tasks, "_find_asset_by_name", lambda company_id, name: lookups.append(name) or 42)
+        actions = [{"type": "assets.enrich", "map": {"name": "${host}", "description": "seen"}}]
+        records = [{"host": "a.com"}, {"host": "a.com"}, {"host": "https://a.com/x"}]
+        context = {"assets": {"by_name": {}}}
+
+        counts = tasks._apply_actions(tasks._actions_from_parsed(actions, records, context), 1, apply=False)
+
+        assert counts["skipped"] == 0
+        assert lookups == ["a.com"]
+        assert context["assets"]["by_name"] == {"a.com": 42}
+
+    def test_asset_updates_are_sent_after_planning(self, monkeypatch):
+        sent = []
+        monkeypatch.setattr(tasks, "_update_asset", lambda company_id, payload, apply: sent.append(payload["id"]) or payload["id"])
+        actions = [{"type": "assets.update", "map": {"id": "${id}", "businessImpact": "high"}}]
+        planned = tasks._actions_from_parsed(actions, [{"id": "1"}, {"id": "2"}, {"id": "3"}], {})
+
+        counts = tasks._apply_actions(planned, 1, apply=True)
+
+        assert counts["assets_updated"] == 3
+        assert sorted(sent) == [1, 2, 3]
+
+    def test_updates_to_one_asset_keep_plan_order(self, monkeypatch):
+        sent = []
+
+        def _update(company_id, payload, apply):
+            if payload["businessImpact"] == "low":
+                time.sleep(0.05)  # the first update is slow; the second must still wait for it
+            sent.append((payload["id"], payload["businessImpact"]))
+            return payload["id"]
+
+        monkeypatch.setattr(tasks, "_update_asset", _update)
+        payloads = [{"id": 1, "businessImpact": "low"}, {"id": 2, "businessImpact": "x"}, {"id": 1, "businessImpact": "high"}]
+
+        assert tasks._update_assets_batch(1, payloads, apply=True, workers=4) == [1, 2, 1]
+        assert [impact for asset_id, impact in sent if asset_id == 1] == ["low", "high"]
+
+    @pytest.mark.parametrize(
+        "record,protocol",
+        [
+            ({"finding": {"type": "DNS"}}, "UDP"),
+            ({"finding": {"type": "ssl"}, "raw": {"request": "  ;; QUESTION SECTION"}}, "UDP"),
+            ({"finding": {"type": "ssl"}}, "TCP"),
+            ({}, "TCP"),
+        ],
+    )
+    def test_network_protocol_inference(self, record, protocol):
+        payload = {"assetId": 1, "title": "T", "description": "d", "severity": "LOW", "host": "a.com"}
+        assert tasks._prepare_network_vuln(payload, record, {})
+        assert payload["protocol"] == protocol
+        assert payload["port"] == (53 if protocol == "UDP" else 443)
+
+    def test_unsupported_action_type(self):
+        planned = tasks._actions_from_parsed([{"type": "assets.delete"}], [{}], {})
+        with pytest.raises(ValueError, match="Unsupported action type: assets.delete"):
+            tasks._apply_actions(planned, 1, apply=False)
+
+
+class TestNonEmptyFields:
+    """Tests for picking populated payload fields"""
+
+    def test_drops_none_and_empty_strings_only(self):
+        source = {"a": 0, "b": "", "c": None, "d": [], "e": "x"}
+        assert tasks._non_empty_fields(source, ("a", "b", "c", "d", "e", "missing")) == {"a": 0, "d": [], "e": "x"}
+
+
+class TestAsIntId:
+    """Tests for casting rendered asset IDs"""
+
+    @pytest.mark.parametrize("value,expected", [("12", 12), (7, 7), (" 12", " 12"), ("+1", "+1"), ("²", "²"), ("dry-run", "dry-run")])
+    def test_only_plain_digit_strings_become_ints(self, value, expected):
+        assert tasks._as_int_id(value) == expected
+
+
+class TestFillIssueDefaults:
+    """Tests for the WEB/NETWORK narrative defaults"""
+
+    def test_fills_only_missing_fields(self):
+        payload = {"title": "T", "description": "D", "impactLevel": "HIGH", "summary": ""}
+        tasks._fill_issue_defaults(payload)
+        assert payload == {
+            "title": "T", "description": "D", "impactLevel": "HIGH", "summary": "T",
+            "solution": "D", "probabilityLevel": "LOW", "impactDescription": "D", "stepsToReproduce": "D",
+        }
+
+
+class TestCoerceAssetFields:
+    """Tests for normalizing asset payload values before createAsset/updateAsset"""
+
+    def test_coerces_lists_enums_and_booleans(self):
+        fields = {
+            "name": "app", "assetsTagList": "a, b,,c", "integrations": "jira",
+            "businessImpact": "high", "exploitability": "low", "environmentCompromised": "True",
+        }
+        tasks._coerce_asset_fields(fields)
+        assert fields == {
+            "name": "app", "assetsTagList": ["a", "b", "c"], "integrations": ["jira"],
+            "businessImpact": "HIGH", "exploitability": "LOW", "environmentCompromised": True,
+        }
+
+    def test_leaves_non_string_values(self):
+        fields = {"assetsTagList": ["x"], "environmentCompromised": False}
+        tasks._coerce_asset_fields(fields)
+        assert fields == {"assetsTagList": ["x"], "environmentCompromised": False}
+
+
+class TestCommandArgv:
+    """Tests for deciding when a task command can skip /bin/sh"""
+
+    def test_plain_command_is_tokenized(self):
+        assert tasks._command_argv("ls -la 'my dir'") == ["ls", "-la", "my dir"]
+
+    @pytest.mark.parametrize(
+        "cmd",
+        [
+            "nmap -oX - host | tee out.xml",
+            "echo $HOME",
+            "ls *.xml",
+            "cd /tmp",
+            "FOO=1 ls",
+            "ls 'unterminated",
+            "ls # comment",
+        ],
+    )
+    def test_shell_features_fall_back(self, cmd):
+        assert tasks._command_argv(cmd) is None
+
+    def test_env_forces_shell(self, monkeypatch):
+        monkeypatch.setenv(tasks.TASK_SHELL_ENV, "1")
+        assert tasks._command_argv("ls") is None
+
+
+class TestRunCommand:
+    """Tests for running step commands with streamed stdout"""
+
+    def test_stdout_is_consumed_while_running(self):
+        cmd = f"{sys.executable} -c 'print(1); print(2)'"
+        code, stderr, output = tasks._run_command(cmd, lambda out: [line.strip() for line in out])
+        assert (code, stderr, output) == (0, "", ["1", "2"])
+
+    def test_large_stderr_does_not_stall(self):
+        cmd = f"{sys.executable} -c 'import sys; sys.stderr.write(\"x\" * 1000000); print(\"{{}}\")'"
+        code, stderr, output = tasks._run_command(cmd, tasks._parse_scan_json_lines)
+        assert code == 0
+        assert len(stderr) == 1000000
+        assert output == [{"finding": {}, "raw": {}}]
+
+    def test_unread_stdout_is_drained(self):
+        cmd = f"{sys.executable} -c 'print(\"x\" * 1000000); exit(3)'"
+        code, _, output = tasks._run_command(cmd, lambda out: None)
+        assert (code, output) == (3, None)
+
+
+class TestApprovals:
+    """Tests for the locally stored command approvals"""
+
+    @pytest.fixture(autouse=True)
+    def approvals_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "approved_tasks.json"
+        monkeypatch.setattr(tasks, "APPROVALS_DIR", str(tmp_path))
+        monkeypatch.setattr(tasks, "APPROVALS_FILE", str(path))
+        monkeypatch.setattr(tasks, "_APPROVALS_CACHE", None)
+        return path
+
+    def test_approve_and_check(self):
+        assert not tasks._is_command_approved("nmap -sV host")
+        tasks._approve_command("nmap -sV host")
+        assert tasks._is_command_approved("nmap -sV host")
+        assert not tasks._is_command_approved("nmap host")
+
+    def test_saved_file_is_sorted_json(self, approvals_file):
+        tasks._save_approved_commands({"b": {"cmd": "echo é", "approved_at": 1}, "a": {"cmd": "ls", "approved_at": 2}})
+        text = approvals_file.read_text(encoding="utf-8")
+        assert list(json.loads(text)) == ["a", "b"]
+        assert json.loads(text)["b"]["cmd"] == "echo é"
+        assert text.startswith('{\n  "a": {\n    "approved_at": 2,')
+
+    def test_external_change_is_picked_up(self, approvals_file):
+        tasks._approve_command("ls")
+        assert tasks._is_command_approved("ls")
+        approvals_file.write_text(json.dumps({}), encoding="utf-8")
+        os.utime(approvals_file, ns=(1, 1))
+        assert not tasks._is_command_approved("ls")
+
+    def test_loaded_copy_does_not_leak_into_cache(self):
+        tasks._approve_command("ls")
+        tasks._load_approved_commands().clear()
+        assert tasks._is_command_approved("ls")
+
+    def test_save_replaces_file_atomically(self, approvals_file, tmp_path):
+        tasks._approve_command("ls")
+        tasks._approve_command("id")
+        assert set(json.loads(approvals_file.read_text())) == {tasks._command_key("ls"), tasks._command_key("id")}
+        assert [p.name for p in tmp_path.iterdir()] == [approvals_file.name]
+
+    def test_check_reuses_cached_approvals(self, monkeypatch):
+        tasks._approve_command("ls")
+        cached = tasks._cached_approvals()
+        monkeypatch.setattr(tasks.json, "load", lambda f: pytest.fail("approvals file re-read"))
+        assert tasks._is_command_approved("ls")
+        assert tasks._cached_approvals() is cached
+
+    def test_command_key_is_stable_sha256(self):
+        key = tasks._command_key("nmap -sV host")
+        assert key == tasks.hashlib.sha256(b"nmap -sV host").hexdigest()
+        assert tasks._command_key("nmap -sV host") is key
+
+
+TASK_YAML = """name: Scan
+steps:
+  - id: scan
+    inputs:
+      assets: {}
+    run:
+      cmd: "true"
+    actions:
+      - type: vulns.create
+        map: {}
+"""
+
+
+class TestTaskCommands:
+    """CLI tests for `tasks list` and `tasks run`"""
+
+    @pytest.fixture
+    def project(self, monkeypatch, tmp_path):
+        requirement = {
+            "id": 1,
+            "label": "TASK scans",
+            "activities": [
+                {"id": 10, "title": "first", "description": TASK_YAML},
+                {"id": 11, "title": "second", "description": TASK_YAML},
+            ],
+        }
+        monkeypatch.setattr(
+            tasks,
+            "graphql_request",
+            lambda query, variables=None, **kwargs: {"project": {"label": "P", "projectRequirements": [requirement]}},
+        )
+        monkeypatch.setattr(tasks, "APPROVALS_DIR", str(tmp_path))
+        monkeypatch.setattr(tasks, "APPROVALS_FILE", str(tmp_path / "approved_tasks.json"))
+        monkeypatch.setattr(tasks, "_APPROVALS_CACHE", None)
+        fetches = []
+        monkeypatch.setattr(tasks, "_fetch_assets", lambda company_id, tags=None: fetches.append(tags) or [{"id": 5, "name": "a.com"}])
+        return fetches
+
+    def test_list(self, project):
+        result = CliRunner().invoke(tasks.app, ["list", "-c", "1", "-P", "2", "-f", "json"])
+        assert result.exit_code == 0, result.output
+        rows, _ = json.JSONDecoder().raw_decode(result.output[result.output.index("["):])
+        assert [row["activityId"] for row in rows] == [10, 11]
+
+    def test_run_shares_one_assets_fetch(self, project):
+        result = CliRunner().invoke(tasks.app, ["run", "-c", "1", "-p", "2", "--auto-approve"])
+        assert result.exit_code == 0, result.output
+        assert "Steps executed: 2" in result.output
+        assert len(project) == 1
+
+    def test_run_no_cache_fetches_per_activity(self, project):
+        result = CliRunner().invoke(tasks.app, ["run", "-c", "1", "-p", "2", "--auto-approve", "--no-cache"])
+        assert result.exit_code == 0, result.output
+        assert len(project) == 2
@@ -0,0 +1,77 @@
+"""
+Tests for version utilities
+"""
+
+import json
+
+import pytest
+
+import conviso.core.version as version
+
+
+class _Response:
+    status_code = 200
+    text = "9.9.9\n"
+
+
+@pytest.fixture
+def remote(monkeypatch, tmp_path):
+    calls = []
+
+    class _Requests:
+        @staticmethod
+        def get(url, timeout):
+            calls.append(url)
+            return _Response()
+
+    monkeypatch.delenv("CONVISO_CLI_REMOTE_VERSION", raising=False)
+    monkeypatch.setattr(version, "get_config_dir", lambda: tmp_path)
+    monkeypatch.setattr(version, "requests", _Requests)
+    return calls
+
+
+class TestFetchRemoteVersion:
+    """Tests for the on-disk remote version cache"""
+
+    def test_second_fetch_uses_cache(self, remote):
+        assert version.fetch_remote_version() == "9.9.9"
+        assert version.fetch_remote_version() == "9.9.9"
+        assert len(remote) == 1
+
+    def test_expired_cache_refetches(self, remote, tmp_path):
+        cache = tmp_path / version.REMOTE_VERSION_CACHE_FILE
+        cache.write_text(json.dumps({"url": version.DEFAULT_REMOTE_URL, "version": "1.0.0", "fetched_at": 0}))
+        assert version.fetch_remote_version() == "9.9.9"
+        assert len(remote) == 1
+        assert json.loads(cache.read_text())["version"] == "9.9.9"
+
+    def test_env_override_wins_over_cache(self, remote, monkeypatch):
+        version.fetch_remote_version()
+        monkeypatch.setenv("CONVISO_CLI_REMOTE_VERSION", "2.0.0")
+        assert version.fetch_remote_version() == "2.0.0"
+
+    def test_zero_ttl_disables_cache(self, remote):
+        version.fetch_remote_version(cache_ttl=0)
+        version.fetch_remote_version(cache_ttl=0)
+        assert len(remote) == 2
+
+
+class TestIsNewer:
+    """Tests for comparing semver-ish version strings"""
+
+    @pytest.mark.parametrize(
+        "remote, local, expected",
+        [
+            ("1.10.0", "1.9.3", True),
+            ("1.2", "1.2.0", False),
+            ("1.3.0-rc1", "1.3.0", False),
+            ("2.0.0", "", False),
+            ("v2.0.0", "1.0.0", False),
+        ],
+    )
+    def test_is_newer(self, remote, local, expected):
+        assert version.is_newer(remote, local) is expected
+
+    def test_parse_stops_at_first_non_numeric_part(self):
+        assert version._parse_version(" 1.2.3-rc1.4 ") == (1, 2)
+        assert version._parse_version("1.²") == (1,)
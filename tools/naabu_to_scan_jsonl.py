@@ -12,6 +12,11 @@ from __future__ import annotations
 import json
 import sys
 
+try:
+    from conviso.core import jsonutil
+except ImportError:  # pragma: no cover - script run without the CLI installed; stdlib json is used
+    jsonutil = None
+
 
 def _pick(d: dict, *keys):
     for k in keys:
@@ -27,54 +32,72 @@ def _as_int(val):
         return None
 
 
-def main() -> int:
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            raw = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-
-        if not isinstance(raw, dict):
-            continue
-
-        ip = _pick(raw, "ip", "host", "address", "target")
-        port = _as_int(_pick(raw, "port", "p"))
-        proto = str(_pick(raw, "proto", "protocol") or "tcp").upper()
-        service = _pick(raw, "service", "name")
-        tls = _pick(raw, "tls", "ssl")
-
-        if not ip or not port:
-            # Cannot produce a meaningful NETWORK finding
-            continue
-
-        title = f"Open port {port}/{proto}"
-        if service:
-            title = f"{service} on {port}/{proto}"
-        description = f"Discovered open port {port}/{proto} on {ip}."
-        if service:
-            description = f"Discovered {service} on port {port}/{proto} at {ip}."
-        if tls:
-            description += " TLS detected."
-
-        finding = {
-            "type": "NETWORK",
-            "title": title,
-            "description": description,
-            "severity": "info",
-            "asset": ip,
-            "address": ip,
-            "protocol": proto,
-            "port": port,
-            "attackVector": "N/A",
-            "reference": raw.get("reference"),
-        }
-
-        out = {"finding": finding, "raw": raw}
-        sys.stdout.write(json.dumps(out, ensure_ascii=True) + "\n")
+def _loads(line: bytes):
+    if jsonutil is not None:
+        return jsonutil.loads(line)
+    return json.loads(line)
+
+
+def _dumps_line(out: dict) -> bytes:
+    # Output stays ASCII so any locale can decode it downstream
+    if jsonutil is not None:
+        return jsonutil.dumps(out, newline=True, ensure_ascii=True)
+    return (json.dumps(out, separators=(",", ":")) + "\n").encode("ascii")
+
+
+def _convert(line: bytes):
+    """Return the scan-json-lines record for one naabu line, or None when it is skipped."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        raw = _loads(line)
+    except ValueError:
+        return None
 
+    if not isinstance(raw, dict):
+        return None
+
+    ip = _pick(raw, "ip", "host", "address", "target")
+    port = _as_int(_pick(raw, "port", "p"))
+    proto = str(_pick(raw, "proto", "protocol") or "tcp").upper()
+    service = _pick(raw, "service", "name")
+    tls = _pick(raw, "tls", "ssl")
+
+    if not ip or not port:
+        # Cannot produce a meaningful NETWORK finding
+        return None
+
+    title = f"Open port {port}/{proto}"
+    if service:
+        title = f"{service} on {port}/{proto}"
+    description = f"Discovered open port {port}/{proto} on {ip}."
+    if service:
+        description = f"Discovered {service} on port {port}/{proto} at {ip}."
+    if tls:
+        description += " TLS detected."
+
+    finding = {
+        "type": "NETWORK",
+        "title": title,
+        "description": description,
+        "severity": "info",
+        "asset": ip,
+        "address": ip,
+        "protocol": proto,
+        "port": port,
+        "attackVector": "N/A",
+        "reference": raw.get("reference"),
+    }
+
+    return {"finding": finding, "raw": raw}
+
+
+def main() -> int:
+    # Raw bytes in, encoded bytes out through the buffered binary streams; no per-line text codec
+    records = (_convert(line) for line in sys.stdin.buffer)
+    sys.stdout.buffer.writelines(_dumps_line(out) for out in records if out is not None)
+    sys.stdout.buffer.flush()
     return 0
 
 